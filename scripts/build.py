@@ -1,10 +1,61 @@
+import py_compile
 import re
+import sys
+import tempfile
 import zipfile
 from pathlib import Path
 
 from rich import print
 from rich.progress import BarColumn, Progress, TextColumn, TimeRemainingColumn
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from slingshot_autoloader_config import (  # noqa: E402
+    OCIO_CACHE_SUFFIX,
+    OCIO_CONFIG_NAME,
+    write_ocio_cache,
+)
+
+# the Python RV 2024 runs, the bytecode is only shipped when built with the same one
+RV_PYTHON_VERSION = (3, 11)
+
+
+def compile_modules(modules: list[Path], build_dir: Path) -> dict[Path, str]:
+    """Compiles the modules to {pyc path: arcname}.
+
+    The pycs are "unchecked hash" pycs: Python uses them without checking them
+    against the source, so RV doesn't compile the modules on each artist's first
+    launch, or every launch when the install is read only."""
+    if sys.version_info[:2] != RV_PYTHON_VERSION:
+        print(
+            f"[bold yellow]Not including bytecode, building with Python "
+            f"{sys.version_info[0]}.{sys.version_info[1]} instead of "
+            f"{RV_PYTHON_VERSION[0]}.{RV_PYTHON_VERSION[1]}[/bold yellow]"
+        )
+        return {}
+
+    pycs = {}
+    for module in modules:
+        arcname = f"__pycache__/{module.stem}.{sys.implementation.cache_tag}.pyc"
+        pyc = build_dir / arcname
+        py_compile.compile(
+            str(module),
+            cfile=str(pyc),
+            dfile=module.name,
+            doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+        pycs[pyc] = arcname
+    return pycs
+
+
+def package_file(package: str, extra_files: dict[str, str]) -> str:
+    """Adds {arcname: install location} entries to the PACKAGE files list."""
+    entries = "".join(
+        f"  - file: {arcname}\n    location: {location}\n"
+        for arcname, location in extra_files.items()
+    )
+    return package.replace("files:\n", f"files:\n{entries}", 1)
+
 
 def make_rv_package():
     # Define source and destination paths
@@ -29,27 +80,72 @@ def make_rv_package():
     # List of files to include in the zip
     files_to_zip = [
         SRC_DIR / "slingshot_autoloader.py",
+        SRC_DIR / "slingshot_autoloader_assetdb.py",
+        SRC_DIR / "slingshot_autoloader_bake.py",
+        SRC_DIR / "slingshot_autoloader_cdl.py",
         SRC_DIR / "slingshot_autoloader_config.py",
+        SRC_DIR / "slingshot_autoloader_frames.py",
+        SRC_DIR / "slingshot_autoloader_index.py",
+        SRC_DIR / "slingshot_autoloader_looks.py",
+        SRC_DIR / "slingshot_autoloader_priority.py",
+        SRC_DIR / "slingshot_autoloader_readahead.py",
+        SRC_DIR / "slingshot_autoloader_recorder.py",
+        SRC_DIR / "slingshot_autoloader_registry.py",
+        SRC_DIR / "slingshot_autoloader_resolver.py",
+        SRC_DIR / "slingshot_autoloader_rules.py",
+        SRC_DIR / "slingshot_autoloader_session.py",
+        SRC_DIR / "slingshot_autoloader_stats.py",
+        SRC_DIR / "slingshot_autoloader_trace.py",
         SRC_DIR / "rv_menu_schema.py",
         SRC_DIR / "PACKAGE",
         SRC_DIR / "ocio" / "studio-config-v2.1.0_aces-v1.3_ocio-v2.2.ocio",
     ]
 
-    # Create the zip package with progress bar
-    with (
-        zipfile.ZipFile(zip_filename, "w", zipfile.ZIP_DEFLATED) as zipf,
-        Progress(
-            TextColumn("[bold blue]Zipping:"),
-            BarColumn(),
-            TimeRemainingColumn(),
-        ) as progress,
-    ):
-        task = progress.add_task("Compressing files...", total=len(files_to_zip))
-
-        for file_path in files_to_zip:
-            arcname = file_path.relative_to(SRC_DIR)
-            zipf.write(file_path, arcname)
-            progress.update(task, advance=1)
+    with tempfile.TemporaryDirectory() as staging_dir:
+        staging = Path(staging_dir)
+
+        # installed next to the modules and the config, see PACKAGE
+        pycs = compile_modules(
+            [path for path in files_to_zip if path.suffix == ".py"], staging
+        )
+        # the colorspace names of the bundled config, which $OCIO points at (see prepare_ocio)
+        ocio_config = SRC_DIR / "ocio" / OCIO_CONFIG_NAME
+        ocio_cache = staging / (OCIO_CONFIG_NAME + OCIO_CACHE_SUFFIX)
+        write_ocio_cache(ocio_config, ocio_cache)
+        built_files = {**pycs, ocio_cache: f"ocio/{ocio_cache.name}"}
+
+        package = package_file(
+            PACKAGE_FILE.read_text(),
+            {
+                **{arcname: "Python/__pycache__" for arcname in pycs.values()},
+                f"ocio/{ocio_cache.name}": "SupportFiles/$PACKAGE/ocio",
+            },
+        )
+
+        # Create the zip package with progress bar
+        with (
+            zipfile.ZipFile(zip_filename, "w", zipfile.ZIP_DEFLATED) as zipf,
+            Progress(
+                TextColumn("[bold blue]Zipping:"),
+                BarColumn(),
+                TimeRemainingColumn(),
+            ) as progress,
+        ):
+            task = progress.add_task(
+                "Compressing files...", total=len(files_to_zip) + len(built_files)
+            )
+
+            for file_path in files_to_zip:
+                arcname = file_path.relative_to(SRC_DIR)
+                if file_path == PACKAGE_FILE:
+                    zipf.writestr(str(arcname), package)
+                else:
+                    zipf.write(file_path, arcname)
+                progress.update(task, advance=1)
+
+            for file_path, arcname in built_files.items():
+                zipf.write(file_path, arcname)
+                progress.update(task, advance=1)
 
     print(f"[bold green]Packaged files into {zip_filename}[/bold green]")
 
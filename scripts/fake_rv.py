@@ -0,0 +1,347 @@
+"""A stateful fake of the parts of rv.commands and rv.extra_commands the plugin uses.
+
+It keeps a small node graph (source groups, media rep switches, pipeline groups)
+and a property store, records every call, and can sleep on each call to stand in
+for the cost of going through RV's Python bridge:
+
+    def test_something(fake_rv: FakeRV):
+        group = fake_rv.add_source("/shots/sh010_comp_v003.1001.exr")
+        ...
+        assert fake_rv.call_counts()["setStringProperty"] <= 6
+"""
+
+import itertools
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Callable
+
+
+@dataclass
+class FakeNode:
+    name: str
+    type: str
+    group: str | None = None
+    members: list[str] = field(default_factory=list)
+
+
+# the nodes RV puts in a new source group, by type: (name suffix, members)
+SOURCE_GROUP_MEMBERS = {
+    "RVFileSource": "_source",
+    "RVLinearizePipelineGroup": "_tolinPipeline",
+    "RVLookPipelineGroup": "_lookPipeline",
+}
+DEFAULT_PIPELINES = {
+    "RVLinearizePipelineGroup": ["RVLinearize"],
+    "RVLookPipelineGroup": ["RVLookLUT"],
+}
+_OCIO_DEFAULTS = {
+    "ocio.function": ["color"],
+    "ocio.inColorSpace": [""],
+    "ocio_color.outColorSpace": [""],
+    "ocio_look.look": [""],
+}
+NODE_DEFAULTS = {"OCIOFile": _OCIO_DEFAULTS, "OCIOLook": _OCIO_DEFAULTS}
+
+
+class FakeRV:
+    StringType = 8
+    IntType = 1
+    FloatType = 2
+    CheckedMenuState = 1
+    UncheckedMenuState = 0
+    DisabledMenuState = -1
+    NeutralMenuState = 2
+    ErrorAlert = 2
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.graph: dict[str, FakeNode] = {}
+        self.properties: dict[str, list] = {}
+        self.settings: dict[tuple[str, str], Any] = {}
+        # switch node -> {media rep name: source node}
+        self.switches: dict[str, dict[str, str]] = {}
+        self.rep_switch: dict[str, str] = {}
+        self.calls: list[tuple[str, tuple]] = []
+        # the inputs of the view node, one frame each
+        self.sequence: list[str] = []
+        self.current_frame = 1
+        self._ids = {"sourceGroup": itertools.count(), "switchGroup": itertools.count()}
+
+        self.commands = self._namespace(
+            [
+                "addSourceBegin",
+                "addSourceEnd",
+                "addSourceMediaRep",
+                "addSourceVerbose",
+                "alertPanel",
+                "defineModeMenu",
+                "deleteNode",
+                "frame",
+                "getIntProperty",
+                "getStringProperty",
+                "newProperty",
+                "nodeConnections",
+                "nodeGroup",
+                "nodeType",
+                "nodes",
+                "nodesInGroup",
+                "openFileDialog",
+                "propertyExists",
+                "readSettings",
+                "saveFileDialog",
+                "setActiveSourceMediaRep",
+                "setFloatProperty",
+                "setIntProperty",
+                "setStringProperty",
+                "sourceMediaRepSwitchNode",
+                "sourceMediaReps",
+                "sourcesAtFrame",
+                "viewNode",
+                "writeSettings",
+            ]
+        )
+        self.extra_commands = self._namespace(["nodesInGroupOfType", "setUIName"])
+
+    def _namespace(self, names: list[str]) -> SimpleNamespace:
+        namespace = SimpleNamespace(
+            **{name: self._recorded(name, getattr(self, name)) for name in names}
+        )
+        for constant in [
+            "StringType",
+            "IntType",
+            "FloatType",
+            "CheckedMenuState",
+            "UncheckedMenuState",
+            "DisabledMenuState",
+            "NeutralMenuState",
+            "ErrorAlert",
+        ]:
+            setattr(namespace, constant, getattr(self, constant))
+        return namespace
+
+    def _recorded(self, name: str, func: Callable) -> Callable:
+        def _call(*args):
+            self.calls.append((name, args))
+            if self.latency:
+                time.sleep(self.latency)
+            return func(*args)
+
+        return _call
+
+    def call_counts(self) -> Counter[str]:
+        return Counter(name for name, _ in self.calls)
+
+    def reset_calls(self):
+        self.calls = []
+
+    # setting up the graph, not recorded
+
+    def add_source(
+        self, path: str, in_sequence: bool = True, group: str | None = None
+    ) -> str:
+        """Adds a source group like RV does when media is loaded, returns the group.
+
+        group names it, e.g. after a recorded session; later groups are numbered on
+        from it, like RV does."""
+        if group is None:
+            group = f"sourceGroup{next(self._ids['sourceGroup']):06d}"
+        elif match := re.fullmatch(r"sourceGroup(\d+)", group):
+            self._ids["sourceGroup"] = itertools.count(int(match[1]) + 1)
+        if in_sequence:
+            self.sequence.append(group)
+        self.graph[group] = FakeNode(group, "RVSourceGroup")
+        for node_type, suffix in SOURCE_GROUP_MEMBERS.items():
+            self._add_node(f"{group}{suffix}", node_type, group)
+        for pipe_type, pipeline in DEFAULT_PIPELINES.items():
+            pipe = f"{group}{SOURCE_GROUP_MEMBERS[pipe_type]}"
+            self.setStringProperty(f"{pipe}.pipeline.nodes", pipeline, True)
+        self.properties[f"{group}_source.media.movie"] = [path]
+        return group
+
+    def add_media_reps(self, source_node: str, names: list[str]):
+        """Gives a source media reps, like a session saved with them.
+
+        The reps are new sources of the same media, in groups named after the source
+        group, so the groups added later are numbered like they were in RV."""
+        path = self.properties[f"{source_node}.media.movie"][0]
+        source_group = self.graph[source_node].group
+        for name in names:
+            switch_node = self._switch_node(source_node)
+            if name not in self.switches[switch_node]:
+                rep_group = f"{source_group}_{name}"
+                self.add_source(path, in_sequence=False, group=rep_group)
+                self._add_rep(switch_node, name, f"{rep_group}_source")
+
+    def _add_node(self, name: str, node_type: str, group: str | None):
+        self.graph[name] = FakeNode(name, node_type, group)
+        if group:
+            self.graph[group].members.append(name)
+        for prop, value in NODE_DEFAULTS.get(node_type, {}).items():
+            self.properties[f"{name}.{prop}"] = list(value)
+
+    def _delete(self, name: str):
+        node = self.graph.pop(name)
+        if name in self.sequence:
+            self.sequence.remove(name)
+        for member in node.members:
+            self._delete(member)
+        self.properties = {
+            prop: value
+            for prop, value in self.properties.items()
+            if not prop.startswith(f"{name}.")
+        }
+
+    # rv.commands
+
+    def addSourceBegin(self):
+        pass
+
+    def addSourceEnd(self):
+        pass
+
+    def addSourceVerbose(self, paths: list[str], tag: str | None = None) -> str:
+        return f"{self.add_source(paths[0])}_source"
+
+    def _add_rep_source(self, path: str) -> str:
+        return f"{self.add_source(path, in_sequence=False)}_source"
+
+    def _switch_node(self, source_node: str) -> str:
+        """The source's media rep switch, added if it doesn't have one yet."""
+        if not (switch_node := self.rep_switch.get(source_node)):
+            switch_group = f"switchGroup{next(self._ids['switchGroup']):06d}"
+            self.graph[switch_group] = FakeNode(switch_group, "RVSwitchGroup")
+            switch_node = f"{switch_group}_switch"
+            self._add_node(switch_node, "RVSwitch", switch_group)
+            self.switches[switch_node] = {}
+            # the original source joins the switch without a rep name
+            self.rep_switch[source_node] = switch_node
+            # and the switch takes its place in the view
+            source_group = self.graph[source_node].group
+            if source_group in self.sequence:
+                self.sequence[self.sequence.index(source_group)] = switch_group
+        return switch_node
+
+    def _add_rep(self, switch_node: str, name: str, rep_node: str):
+        self.switches[switch_node][name] = rep_node
+        self.rep_switch[rep_node] = switch_node
+
+    def addSourceMediaRep(
+        self, source_node: str, name: str, paths: list[str], tag: str | None = None
+    ) -> str:
+        switch_node = self._switch_node(source_node)
+        if name in self.switches[switch_node]:
+            raise Exception(f"media rep {name} already exists on {switch_node}")
+
+        rep_node = self._add_rep_source(paths[0])
+        self._add_rep(switch_node, name, rep_node)
+        return rep_node
+
+    def alertPanel(self, *args):
+        pass
+
+    def defineModeMenu(self, *args):
+        pass
+
+    def deleteNode(self, node: str):
+        self._delete(node)
+
+    def frame(self) -> int:
+        return self.current_frame
+
+    def getIntProperty(self, name: str, start: int = 0, count: int = 2**31) -> list:
+        return self.properties[name][start : start + count]
+
+    def getStringProperty(self, name: str, start: int = 0, count: int = 2**31) -> list:
+        return self.properties[name][start : start + count]
+
+    def newProperty(self, name: str, property_type: int, width: int):
+        self.properties.setdefault(name, [])
+
+    def nodeConnections(self, node: str, traverse_groups: bool = False):
+        inputs = self.sequence if node == "defaultSequence" else []
+        return list(inputs), []
+
+    def nodeGroup(self, node: str) -> str:
+        return self.graph[node].group or ""
+
+    def nodeType(self, node: str) -> str:
+        return self.graph[node].type
+
+    def nodes(self) -> list[str]:
+        return list(self.graph)
+
+    def nodesInGroup(self, group: str) -> list[str]:
+        return list(self.graph[group].members)
+
+    def openFileDialog(self, *args):
+        return None
+
+    def propertyExists(self, name: str) -> bool:
+        return name in self.properties
+
+    def readSettings(self, group: str, name: str, default: Any) -> Any:
+        return self.settings.get((group, name), default)
+
+    def saveFileDialog(self, *args):
+        return None
+
+    def setActiveSourceMediaRep(self, source_node: str, name: str):
+        self.properties[f"{self.rep_switch[source_node]}.active"] = [name]
+
+    def setFloatProperty(self, name: str, values: list, allow_resize: bool = False):
+        self.properties[name] = list(values)
+
+    def setIntProperty(self, name: str, values: list, allow_resize: bool = False):
+        self.properties[name] = list(values)
+
+    def setStringProperty(self, name: str, values: list, allow_resize: bool = False):
+        self.properties[name] = list(values)
+
+        node, _, prop = name.partition(".")
+        if prop == "pipeline.nodes":
+            # RV replaces the pipeline's members with new nodes of these types
+            for member in list(self.graph[node].members):
+                self._delete(member)
+            self.graph[node].members = []
+            for i, node_type in enumerate(values):
+                self._add_node(f"{node}_{i}", node_type, node)
+
+    def sourceMediaRepSwitchNode(self, source_node: str) -> str:
+        return self.rep_switch.get(source_node, "")
+
+    def sourceMediaReps(self, source_node: str) -> list[str]:
+        if not (switch_node := self.rep_switch.get(source_node)):
+            return [""]
+        return list(self.switches[switch_node])
+
+    def sourcesAtFrame(self, frame: int) -> list[str]:
+        if not 1 <= frame <= len(self.sequence):
+            return []
+        node = self.sequence[frame - 1]
+        if self.graph[node].type != "RVSwitchGroup":
+            return [f"{node}_source"]
+        switch_node = f"{node}_switch"
+        reps = self.switches[switch_node]
+        active = self.properties.get(f"{switch_node}.active", [""])[0]
+        return [reps.get(active) or next(iter(reps.values()))]
+
+    def viewNode(self) -> str:
+        return "defaultSequence"
+
+    def writeSettings(self, group: str, name: str, value: Any):
+        self.settings[(group, name)] = value
+
+    # rv.extra_commands
+
+    def nodesInGroupOfType(self, group: str, node_type: str) -> list[str]:
+        return [
+            member
+            for member in self.graph[group].members
+            if self.graph[member].type == node_type
+        ]
+
+    def setUIName(self, node: str, name: str):
+        self.properties[f"{node}.ui.name"] = [name]
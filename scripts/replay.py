@@ -0,0 +1,283 @@
+"""Replays a recorded session load outside RV, to profile it or compare versions.
+
+Record the load in RV with Slingshot Auto Loader > Record Session Load, save it with
+Save Recording..., then:
+
+    uv run python scripts/replay.py recording.json [--rv-latency 0.0005] [--fs-latency 0.002]
+
+The directories and files the plugin saw are recreated (empty, apart from manifests
+and CDLs) under a temporary directory, with the config's absolute paths moved there
+too. The mode runs against the fake RV from the tests, and gets the recorded events
+in order. The fake starts where RV did, as far as the recorded command answers show:
+on the same frame, with the media reps the loaded sources already had. After that it
+answers for itself, so the plugin does the same work as long as it makes the same
+calls; compare the RV command count with the recording's to check. Asset database
+lookups aren't recorded, so they're turned off, and so is the shot index: the
+listings it gave are in the recording.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import types
+from contextlib import ExitStack
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+ROOT_DIR = Path(__file__).parent.parent
+SRC_DIR = ROOT_DIR / "src"
+sys.path.insert(0, str(SRC_DIR))
+from fake_rv import FakeRV  # noqa: E402
+from slow_fs import SlowFS  # noqa: E402
+
+import slingshot_autoloader_config  # noqa: E402
+from slingshot_autoloader_config import (  # noqa: E402
+    AutoloadColorConfig,
+    AutoloaderConfig,
+    AutoloadMainConfig,
+    AutoloadPlatesConfig,
+)
+from slingshot_autoloader_recorder import recorder  # noqa: E402
+from slingshot_autoloader_stats import CountingCommands, stats  # noqa: E402
+from slingshot_autoloader_trace import tracer  # noqa: E402
+
+
+@dataclass
+class ReplayResult:
+    events: int
+    seconds: float
+    rv_commands: int
+    recorded_rv_commands: int
+
+
+@dataclass
+class RecordedState:
+    """What RV already had when the recorded load started, from the command answers."""
+
+    frame: int | None = None
+    # source node -> the media reps it had before the plugin added any
+    media_reps: dict[str, list[str]] = field(default_factory=dict)
+
+
+def recorded_state(commands: list[list[Any]]) -> RecordedState:
+    state = RecordedState()
+    added_to: set[str] = set()
+    for name, args, result in commands:
+        if name == "frame" and state.frame is None:
+            state.frame = result
+        elif name == "addSourceMediaRep":
+            added_to.add(args[0])
+        elif name == "sourceMediaReps" and args[0] not in added_to:
+            if result != [""]:
+                state.media_reps.setdefault(args[0], result)
+    return state
+
+
+class RecordedEvent:
+    def __init__(self, contents: str):
+        self._contents = contents
+
+    def contents(self) -> str:
+        return self._contents
+
+    def reject(self):
+        pass
+
+
+def mirror_path(root: Path, path: str) -> Path:
+    """Where a recorded absolute path is recreated under root."""
+    path = Path(os.path.normpath(path))
+    return root / path.relative_to(path.anchor)
+
+
+def _mirror_value(root: Path, value: Any) -> Any:
+    """Moves the absolute paths in a config value (one per line) under root."""
+    if not isinstance(value, str):
+        return value
+    return "\n".join(
+        str(mirror_path(root, line.strip())) if os.path.isabs(line.strip()) else line
+        for line in value.splitlines()
+    )
+
+
+def load_config(config: dict[str, Any], root: Path) -> AutoloaderConfig:
+    def section(values: dict[str, Any]) -> dict[str, Any]:
+        return {key: _mirror_value(root, value) for key, value in values.items()}
+
+    return AutoloaderConfig(
+        main=replace(
+            AutoloadMainConfig(**section(config["main"])),
+            asset_db_url=None,
+            index_socket=None,
+        ),
+        plates=AutoloadPlatesConfig(**section(config["plates"])),
+        other=section(config["other"]),
+        color=AutoloadColorConfig(**section(config["color"])),
+    )
+
+
+def build_tree(recording: dict[str, Any], root: Path):
+    """Recreates the directories and files the recorded load saw."""
+
+    def touch(path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not path.exists():
+            path.touch()
+
+    for directory, entries in recording["listings"].items():
+        directory = mirror_path(root, directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, is_dir in entries.items():
+            if is_dir:
+                (directory / name).mkdir(exist_ok=True)
+            else:
+                touch(directory / name)
+    for path, exists in recording["exists"].items():
+        if exists:
+            touch(mirror_path(root, path))
+    for event in recording["events"]:
+        if event["media"]:
+            touch(mirror_path(root, event["media"]))
+    for path, text in recording["files"].items():
+        path = mirror_path(root, path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+
+def install_rv_modules():
+    """The plugin imports rv when it's loaded, replay() swaps in the fake's commands."""
+    rv = types.ModuleType("rv")
+    rv.commands = types.ModuleType("rv.commands")  # type: ignore[attr-defined]
+    rv.extra_commands = types.ModuleType("rv.extra_commands")  # type: ignore[attr-defined]
+    rv.rvtypes = types.ModuleType("rv.rvtypes")  # type: ignore[attr-defined]
+
+    class MinorMode:
+        def init(self, *args, **kwargs):
+            pass
+
+    rv.rvtypes.MinorMode = MinorMode  # type: ignore[attr-defined]
+    sys.modules.update(
+        {
+            "rv": rv,
+            "rv.commands": rv.commands,  # type: ignore[attr-defined]
+            "rv.extra_commands": rv.extra_commands,  # type: ignore[attr-defined]
+            "rv.rvtypes": rv.rvtypes,  # type: ignore[attr-defined]
+        }
+    )
+
+
+def replay(
+    recording: dict[str, Any],
+    root: Path,
+    rv_latency: float = 0.0,
+    fs_latency: float = 0.0,
+    trace: bool = False,
+) -> ReplayResult:
+    """Replays a recording with its files recreated under root."""
+    import slingshot_autoloader
+    from slingshot_autoloader import Settings, SlingshotAutoLoaderMode
+
+    build_tree(recording, root)
+    config = load_config(recording["config"], root)
+    fake = FakeRV()
+    fake.settings = {
+        (Settings.RV_SETTINGS_GROUP, name): value
+        for name, value in recording["settings"].items()
+    }
+    state = recorded_state(recording["commands"])
+    if state.frame is not None:
+        fake.current_frame = state.frame
+
+    with ExitStack() as patches:
+
+        def patch(target: Any, name: str, value: Any):
+            patches.enter_context(mock.patch.object(target, name, value))
+
+        patch(slingshot_autoloader, "commands", CountingCommands(fake.commands))
+        patch(
+            slingshot_autoloader,
+            "extra_commands",
+            CountingCommands(fake.extra_commands),
+        )
+        patch(slingshot_autoloader, "load_or_create_config", lambda: config)
+        patch(slingshot_autoloader_config, "SUPPORT_FILES_PATH", SRC_DIR)
+        patch(recorder, "enabled", False)
+        mode = SlingshotAutoLoaderMode()
+
+        # the recorded load starts here
+        patch(tracer, "enabled", trace)
+        tracer.clear()
+        fake.latency = rv_latency
+        if fs_latency:
+            SlowFS(scandir_delay=fs_latency, stat_delay=fs_latency).install(patch)
+        stats.reset()
+
+        start = time.perf_counter()
+        for event in recording["events"]:
+            if event["name"] == "source-group-complete":
+                group, action = event["contents"].split(";;")
+                if group not in fake.graph:
+                    # loaded by the artist, rather than added by the plugin
+                    fake.add_source(str(mirror_path(root, event["media"])), group=group)
+                    source_node = f"{group}_source"
+                    fake.add_media_reps(
+                        source_node, state.media_reps.get(source_node, [])
+                    )
+                mode.on_source_group_complete(RecordedEvent(f"{group};;{action}"))
+            elif event["name"] == "after-progressive-loading":
+                mode.after_progressive_loading(RecordedEvent(event["contents"]))
+        seconds = time.perf_counter() - start
+
+    return ReplayResult(
+        events=len(recording["events"]),
+        seconds=seconds,
+        rv_commands=stats.counters["rv_commands"],
+        recorded_rv_commands=len(recording["commands"]),
+    )
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded session load against a fake RV"
+    )
+    parser.add_argument("recording", type=Path)
+    parser.add_argument(
+        "--rv-latency", type=float, default=0.0, help="seconds per RV command"
+    )
+    parser.add_argument(
+        "--fs-latency", type=float, default=0.0, help="seconds per listing or stat"
+    )
+    parser.add_argument("--stats", type=Path, help="write the performance stats here")
+    parser.add_argument("--trace", type=Path, help="write a Chrome trace here")
+    args = parser.parse_args(argv)
+
+    recording = json.loads(args.recording.read_text())
+    install_rv_modules()
+    with tempfile.TemporaryDirectory() as root:
+        result = replay(
+            recording,
+            Path(root),
+            rv_latency=args.rv_latency,
+            fs_latency=args.fs_latency,
+            trace=bool(args.trace),
+        )
+
+    print(f"Replayed {result.events} events in {result.seconds * 1000:.0f} ms")
+    print(
+        f"RV commands: {result.rv_commands} (recorded: {result.recorded_rv_commands})"
+    )
+    for line in stats.summary():
+        print(line)
+    if args.stats:
+        stats.write(args.stats)
+    if args.trace:
+        tracer.write(args.trace)
+
+
+if __name__ == "__main__":
+    main()
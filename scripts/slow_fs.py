@@ -0,0 +1,96 @@
+"""Makes the local disk behave like a high latency network share.
+
+Wraps os.scandir, os.stat and Path.glob with a delay per call and counts the calls,
+so resolution changes can be measured against NFS-like latency instead of a fast
+local disk:
+
+    def test_something(slow_fs: SlowFS):
+        slow_fs.scandir_delay = slow_fs.stat_delay = NFS_LATENCY
+        ...
+        assert slow_fs.counts["scandir"] == 1
+
+pathlib's glob, exists and is_file go through os.scandir and os.stat, so they are
+slowed down (and counted) with the rest; glob_delay is an extra delay on top.
+Opening a directory (os.open) is a lookup like a stat, and is delayed by stat_delay;
+directories listed through a handle are recorded by the path they were opened with.
+"""
+
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+
+# roughly a metadata round trip to a busy NFS server
+NFS_LATENCY = 0.002
+
+
+class SlowFS:
+    def __init__(self, scandir_delay=0.0, stat_delay=0.0, glob_delay=0.0):
+        self.scandir_delay = scandir_delay
+        self.stat_delay = stat_delay
+        self.glob_delay = glob_delay
+        self.counts: Counter[str] = Counter()
+        self.paths: dict[str, list[Path]] = {
+            "scandir": [],
+            "stat": [],
+            "glob": [],
+            "open": [],
+        }
+        # open file descriptor -> the path it was opened with
+        self._fd_paths: dict[int, Path] = {}
+        self._lock = threading.Lock()
+
+    def _call(self, name: str, path, delay: float):
+        with self._lock:
+            self.counts[name] += 1
+            self.paths[name].append(Path(path))
+        if delay:
+            time.sleep(delay)
+
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
+            for paths in self.paths.values():
+                paths.clear()
+
+    def install(self, patch: Callable[[Any, str, Any], Any]):
+        """Wraps the calls, e.g. with monkeypatch.setattr to undo it after a test."""
+        scandir, stat, glob, open_, close = (
+            os.scandir,
+            os.stat,
+            Path.glob,
+            os.open,
+            os.close,
+        )
+
+        def _scandir(path="."):
+            self._call("scandir", self._fd_paths.get(path, path), self.scandir_delay)
+            return scandir(path)
+
+        def _open(path, flags, mode=0o777, *, dir_fd=None):
+            if dir_fd is not None:
+                path = self._fd_paths.get(dir_fd, Path()) / path
+            self._call("open", path, self.stat_delay)
+            fd = open_(path, flags, mode)
+            self._fd_paths[fd] = Path(path)
+            return fd
+
+        def _close(fd):
+            self._fd_paths.pop(fd, None)
+            return close(fd)
+
+        def _stat(path, *args, **kwargs):
+            self._call("stat", path, self.stat_delay)
+            return stat(path, *args, **kwargs)
+
+        def _glob(path: Path, pattern: str):
+            self._call("glob", path / pattern, self.glob_delay)
+            return glob(path, pattern)
+
+        patch(os, "scandir", _scandir)
+        patch(os, "stat", _stat)
+        patch(Path, "glob", _glob)
+        patch(os, "open", _open)
+        patch(os, "close", _close)
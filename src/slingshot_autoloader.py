@@ -3,22 +3,44 @@
 
 
 import logging
-import re
-from dataclasses import dataclass
+import os
+import time
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from queue import Queue
-from string import Template
 from typing import TYPE_CHECKING, Callable
 
-import PyOpenColorIO as OCIO
 
-from rv import commands, extra_commands, rvtypes
+from rv import commands as rv_commands
+from rv import extra_commands as rv_extra_commands
+from rv import rvtypes
 from rv_menu_schema import MenuItem
 from slingshot_autoloader_config import (
+    AutoloaderConfig,
     get_ocio_config,
     load_config_from_file,
     load_or_create_config,
+    prepare_ocio,
 )
+from slingshot_autoloader_looks import use_session_config
+from slingshot_autoloader_priority import NEXT_TO_VISIBLE, Priority, view_priority
+from slingshot_autoloader_readahead import READAHEAD_BUDGET_MB, ReadAhead
+from slingshot_autoloader_recorder import recorder
+from slingshot_autoloader_registry import Registry
+from slingshot_autoloader_resolver import NotHandled, Resolver, search_paths
+from slingshot_autoloader_rules import (
+    OCIONodeSetup,
+    PendingMediaRep,
+    color_kind,
+    exr_linearize_setup,
+    find_media_reps,
+    look_setups,
+    mov_linearize_flags,
+    plate_frame_settings,
+    sequence_path,
+)
+from slingshot_autoloader_session import PREBAKED_PROPERTY
+from slingshot_autoloader_stats import counting_commands, stats, timed
+from slingshot_autoloader_trace import traced, tracer
 
 if TYPE_CHECKING:
     from rv.schemas.event import Event
@@ -28,13 +50,12 @@ logging.basicConfig()
 logger = logging.getLogger("SlingshotAutoLoader")
 logger.setLevel(logging.INFO)
 
+# sources with missing files listed in the Autoload Status menu
+STATUS_MENU_SOURCES = 50
 
-@dataclass
-class PendingMediaRep:
-    sourceNode: str
-    mediaRepName: str
-    mediaRepPath: Path
-    tag: str | None = None
+# counted, for the Performance Stats menu
+commands = counting_commands(rv_commands)
+extra_commands = counting_commands(rv_extra_commands)
 
 
 @dataclass
@@ -43,18 +64,56 @@ class Settings:
     load_plates_enabled: bool = True
     load_other_enabled: bool = True
     load_luts_enabled: bool = True
+    batch_source_groups: bool = False
     debug: bool = False
+    trace: bool = False
+    defer_color: bool = False
+    defer_media_reps: bool = False
+
+
+@dataclass
+class PendingGroupWork:
+    """Changes to a source group that wait for after_progressive_loading."""
+
+    # keyed by (source node, media rep name), so a rep is only ever added once
+    media_reps: dict[tuple[str, str], PendingMediaRep] = field(default_factory=dict)
+    delete: bool = False
+
+
+@dataclass
+class DeferredMediaReps:
+    """A source group's media reps, found at load time and added when it's viewed."""
+
+    # the switch group the source is a media rep in, or the source group
+    view_group: str
+    media_reps: list[PendingMediaRep] = field(default_factory=list)
+
+
+@dataclass
+class DeferredColor:
+    """A source group's color pipeline, set up at load time and built when it's viewed."""
+
+    kind: str
+    # the switch group the source is a media rep in, or the source group
+    view_group: str
+    looks: list[OCIONodeSetup | None] = field(default_factory=list)
 
 
 class SlingshotAutoLoaderMode(rvtypes.MinorMode):
     _settings: Settings = Settings()
-    _autoload_queue: Queue[PendingMediaRep] = Queue()
-    _delete_node: str | None = None
 
     def __init__(self):
         super().__init__()
 
+        # $OCIO as RV was started with, before use_session_config replaces it
+        self._base_ocio = os.environ.get("OCIO")
         self.config = load_or_create_config()
+        # source groups added by autoload_sources, which handles them itself
+        self._scripted_groups: set[str] = set()
+        # source groups waiting for after_progressive_loading, in load order
+        self._pending_groups: dict[str, None] = {}
+        # media reps to add and groups to delete, per source group
+        self._pending_work: dict[str, PendingGroupWork] = {}
 
         self._settings.load_plates_enabled = commands.readSettings(
             self._settings.RV_SETTINGS_GROUP,
@@ -71,18 +130,37 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
             "load_luts_enabled",
             self._settings.load_luts_enabled,
         )
+        self._settings.batch_source_groups = commands.readSettings(
+            self._settings.RV_SETTINGS_GROUP,
+            "batch_source_groups",
+            self._settings.batch_source_groups,
+        )
         self._settings.debug = commands.readSettings(
             self._settings.RV_SETTINGS_GROUP, "debug", self._settings.debug
         )
 
+        self._settings.trace = commands.readSettings(
+            self._settings.RV_SETTINGS_GROUP, "trace", self._settings.trace
+        )
+        self._settings.defer_color = commands.readSettings(
+            self._settings.RV_SETTINGS_GROUP, "defer_color", self._settings.defer_color
+        )
+        self._settings.defer_media_reps = commands.readSettings(
+            self._settings.RV_SETTINGS_GROUP,
+            "defer_media_reps",
+            self._settings.defer_media_reps,
+        )
+        # color pipelines waiting for their source to be viewed, per source group
+        self._deferred_color: dict[str, DeferredColor] = {}
+        # media reps waiting for their source to be viewed, per source group
+        self._deferred_media_reps: dict[str, DeferredMediaReps] = {}
+        # what was on screen the last time we looked, see on_frame_changed
+        self._viewed_sources: list[str] = []
+
         logger.setLevel(logging.DEBUG if self._settings.debug else logging.INFO)
+        tracer.enabled = self._settings.trace
 
-        if self._settings.load_luts_enabled:
-            try:
-                OCIO.SetCurrentConfig(get_ocio_config(self.config))
-            except Exception as e:
-                logger.error(f"Failed to load OCIO config: {e}")
-                self._settings.load_luts_enabled = False
+        self._load_ocio()
 
         init_bindings = [
             (
@@ -95,6 +173,26 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
                 self.after_progressive_loading,
                 "Load additional v000/plate media representations",
             ),
+            (
+                "before-session-deletion",
+                self.on_session_deletion,
+                "Stop reading ahead plates",
+            ),
+            (
+                "frame-changed",
+                self.on_frame_changed,
+                "Add the media reps and color of sources coming on screen",
+            ),
+            (
+                "after-graph-view-change",
+                self.on_view_changed,
+                "Add the media reps and color of sources coming on screen",
+            ),
+            (
+                "before-session-write",
+                self.before_session_write,
+                "Add the media reps and color still waiting to be viewed",
+            ),
         ]
 
         self.init(
@@ -119,11 +217,11 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
                                 stateHook=lambda: commands.DisabledMenuState,
                             ).tuple(),
                             MenuItem(
-                                label=f"    Plate MOVs: {self.config.plates.plate_mov_path}",
+                                label=f"    Plate MOVs: {_label(self.config.plates.plate_mov_path)}",
                                 stateHook=lambda: commands.DisabledMenuState,
                             ).tuple(),
                             MenuItem(
-                                label=f"    Plate Frames: {self.config.plates.plate_frames_path}",
+                                label=f"    Plate Frames: {_label(self.config.plates.plate_frames_path)}",
                                 stateHook=lambda: commands.DisabledMenuState,
                             ).tuple(),
                             MenuItem(
@@ -142,7 +240,7 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
                         ]
                         + [
                             MenuItem(
-                                label=f"    {media_rep.replace('_', ' ')}: {path}",
+                                label=f"    {media_rep.replace('_', ' ')}: {_label(path)}",
                                 stateHook=lambda: commands.DisabledMenuState,
                             ).tuple()
                             for media_rep, path in self.config.other.items()
@@ -166,17 +264,25 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
                                 stateHook=lambda: commands.DisabledMenuState,
                             ).tuple(),
                             MenuItem(
-                                label=f"    Look CDL: {self.config.color.look_cdl}",
+                                label=f"    Look CDL: {_label(self.config.color.look_cdl)}",
                                 stateHook=lambda: commands.DisabledMenuState,
                             ).tuple(),
                             MenuItem(
-                                label=f"    Look LUT: {self.config.color.look_lut}",
+                                label=f"    Look CDL ID: {self.config.color.look_cdl_id}",
+                                stateHook=lambda: commands.DisabledMenuState,
+                            ).tuple(),
+                            MenuItem(
+                                label=f"    Look LUT: {_label(self.config.color.look_lut)}",
                                 stateHook=lambda: commands.DisabledMenuState,
                             ).tuple(),
                             MenuItem(
                                 label=f"    Look LUT Output Colorspace: {self.config.color.look_lut_out_colorspace}",
                                 stateHook=lambda: commands.DisabledMenuState,
                             ).tuple(),
+                            MenuItem(
+                                label=f"    Look Mode: {self.config.color.look_mode}",
+                                stateHook=lambda: commands.DisabledMenuState,
+                            ).tuple(),
                             MenuItem("_").tuple(),
                             MenuItem(
                                 label="Load config from file...",
@@ -184,6 +290,28 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
                             ).tuple(),
                         ],
                     ),
+                    (
+                        "Performance Stats",
+                        [
+                            MenuItem(
+                                label=line,
+                                stateHook=lambda: commands.DisabledMenuState,
+                            ).tuple()
+                            for line in stats.summary()
+                        ]
+                        + [
+                            MenuItem("_").tuple(),
+                            MenuItem(
+                                label="Save Stats...",
+                                actionHook=self.save_stats,
+                            ).tuple(),
+                            MenuItem(
+                                label="Reset Stats",
+                                actionHook=self.reset_stats,
+                            ).tuple(),
+                        ],
+                    ),
+                    ("Autoload Status", self._status_menu()),
                     MenuItem("_").tuple(),
                     MenuItem(
                         label="Autoload Plates",
@@ -200,15 +328,97 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
                         actionHook=self.toggle_setting("load_luts_enabled"),
                         stateHook=self.is_enabled("load_luts_enabled"),
                     ).tuple(),
+                    MenuItem(
+                        label="Batch Source Loading",
+                        actionHook=self.toggle_setting("batch_source_groups"),
+                        stateHook=self.is_enabled("batch_source_groups"),
+                    ).tuple(),
+                    MenuItem(
+                        label="Defer Media Reps Until Viewed",
+                        actionHook=self.toggle_setting("defer_media_reps"),
+                        stateHook=self.is_enabled("defer_media_reps"),
+                    ).tuple(),
+                    MenuItem(
+                        label="Defer Color Until Viewed",
+                        actionHook=self.toggle_setting("defer_color"),
+                        stateHook=self.is_enabled("defer_color"),
+                    ).tuple(),
                     MenuItem(
                         label="Debug Logging",
                         actionHook=self.toggle_setting("debug"),
                         stateHook=self.is_enabled("debug"),
                     ).tuple(),
+                    MenuItem(
+                        label="Trace Loading",
+                        actionHook=self.toggle_setting("trace"),
+                        stateHook=self.is_enabled("trace"),
+                    ).tuple(),
+                    MenuItem(
+                        label="Save Trace...",
+                        actionHook=self.save_trace,
+                        stateHook=lambda: (
+                            commands.NeutralMenuState
+                            if tracer.events
+                            else commands.DisabledMenuState
+                        ),
+                    ).tuple(),
+                    MenuItem(
+                        label="Record Session Load",
+                        actionHook=self.toggle_recording,
+                        stateHook=lambda: (
+                            commands.CheckedMenuState
+                            if recorder.enabled
+                            else commands.UncheckedMenuState
+                        ),
+                    ).tuple(),
+                    MenuItem(
+                        label="Save Recording...",
+                        actionHook=self.save_recording,
+                        stateHook=lambda: (
+                            commands.NeutralMenuState
+                            if recorder.events
+                            else commands.DisabledMenuState
+                        ),
+                    ).tuple(),
                 ],
             )
         ]
 
+    def _status_menu(self) -> list:
+        """The registry's summary, and the sources with missing files."""
+        with_misses = self.registry.with_misses()
+        # items, and (label, submenu) for each source
+        menu: list[tuple] = [
+            MenuItem(label=line, stateHook=lambda: commands.DisabledMenuState).tuple()
+            for line in self.registry.summary()
+        ]
+        if with_misses:
+            menu.append(MenuItem("_").tuple())
+        for record in with_misses[:STATUS_MENU_SOURCES]:
+            menu.append(
+                (
+                    Path(record.source_path).name,
+                    [
+                        MenuItem(
+                            label=line, stateHook=lambda: commands.DisabledMenuState
+                        ).tuple()
+                        for line in record.summary()
+                    ],
+                )
+            )
+        if len(with_misses) > STATUS_MENU_SOURCES:
+            menu.append(
+                MenuItem(
+                    label=f"... and {len(with_misses) - STATUS_MENU_SOURCES} more",
+                    stateHook=lambda: commands.DisabledMenuState,
+                ).tuple()
+            )
+        return menu + [
+            MenuItem("_").tuple(),
+            MenuItem(label="Save Report...", actionHook=self.save_report).tuple(),
+            MenuItem(label="Forget Results", actionHook=self.forget_results).tuple(),
+        ]
+
     def is_enabled(self, settings_name: str) -> Callable[[], int]:
         def _is_enabled() -> int:
             return (
@@ -229,6 +439,13 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
 
             if settings_name == "debug":
                 logger.setLevel(logging.DEBUG if new_setting else logging.INFO)
+            elif settings_name == "trace":
+                tracer.enabled = new_setting
+                tracer.clear()
+            elif settings_name == "defer_media_reps" and not new_setting:
+                self._add_deferred_media_reps(lambda source_group, reps: True)
+            elif settings_name == "defer_color" and not new_setting:
+                self._build_deferred_color(lambda source_group, color: True)
 
         return _toggle
 
@@ -243,7 +460,7 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
         if cfg_path:
             try:
                 self.config = load_config_from_file(Path(cfg_path[0]))
-                commands.defineModeMenu("slingshot-autoloader", self.give_menu(), True)
+                self._refresh_menu()
             except Exception as e:
                 logger.warning(f"Error loading config: {e}")
                 commands.alertPanel(
@@ -256,36 +473,303 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
                     None,
                 )
 
-    def _find_file(self, source_path: Path, search_path: str) -> Path | None:
-        if matches := re.search(
-            self.config.main.version_regex, source_path.name, re.IGNORECASE
-        ):
-            search_path = Template(search_path).safe_substitute(**matches.groupdict())
+    def _refresh_menu(self):
+        commands.defineModeMenu("slingshot-autoloader", self.give_menu(), True)
 
-        if not (file_path := Path(search_path)).is_absolute():
+    def save_stats(self, event: "Event"):
+        try:
+            stats_path = commands.saveFileDialog(
+                True, "json|Performance Stats (*.json)", "", False
+            )
+        except Exception:
+            stats_path = None
+
+        if stats_path:
             try:
-                file_path = next(source_path.parent.glob(search_path)).resolve()
-            except StopIteration:
-                logger.warning(f"Can't find file: {source_path.parent}/{search_path}")
-                return
+                stats.write(Path(stats_path))
+            except OSError as e:
+                logger.warning(f"Error saving stats: {e}")
 
-        if not file_path.is_file():
-            logger.warning(f"Can't load file: {file_path} is not a file")
-            return
+    def reset_stats(self, event: "Event"):
+        stats.reset()
+        self._refresh_menu()
 
-        return file_path
+    def save_report(self, event: "Event"):
+        try:
+            report_path = commands.saveFileDialog(
+                True, "json|Autoload Report (*.json)", "", False
+            )
+        except Exception:
+            report_path = None
 
+        if report_path:
+            try:
+                self.registry.write(Path(report_path))
+            except OSError as e:
+                logger.warning(f"Error saving autoload report: {e}")
+
+    def forget_results(self, event: "Event"):
+        """Looks everything up on disk again next time, e.g. after a new publish."""
+        self.registry.clear()
+        self._refresh_menu()
+
+    def save_trace(self, event: "Event"):
+        try:
+            trace_path = commands.saveFileDialog(
+                True, "json|Chrome Trace Files (*.json)", "", False
+            )
+        except Exception:
+            trace_path = None
+
+        if trace_path:
+            try:
+                tracer.write(Path(trace_path))
+            except OSError as e:
+                logger.warning(f"Error saving trace: {e}")
+
+    def toggle_recording(self, event: "Event"):
+        """Starts recording from the current config and settings, or stops."""
+        if recorder.enabled:
+            recorder.stop()
+        else:
+            recorder.start(asdict(self.config), asdict(self._settings))
+
+    def save_recording(self, event: "Event"):
+        try:
+            recording_path = commands.saveFileDialog(
+                True, "json|Session Load Recordings (*.json)", "", False
+            )
+        except Exception:
+            recording_path = None
+
+        if recording_path:
+            try:
+                recorder.write(Path(recording_path))
+            except OSError as e:
+                logger.warning(f"Error saving recording: {e}")
+
+    def _record_event(self, name: str, event: "Event", source_group: str | None = None):
+        """Records an event, with the media of the source group it's for to replay it."""
+        media = None
+        if source_group:
+            # looking the media up isn't part of the load being recorded
+            recorder.enabled = False
+            try:
+                media = str(self._source_path(source_group))
+            except Exception as e:
+                logger.debug(f"Can't record the media of {source_group}: {e}")
+            recorder.enabled = True
+        recorder.event(name, event.contents(), media)
+
+    @property
+    def config(self) -> AutoloaderConfig:
+        return self._config
+
+    @config.setter
+    def config(self, config: AutoloaderConfig):
+        if resolver := getattr(self, "resolver", None):
+            resolver.close()
+        if readahead := getattr(self, "readahead", None):
+            readahead.cancel()
+        self._config = config
+        self.resolver = Resolver(config)
+        # what was found with the old config doesn't hold for the new one
+        self.registry = Registry()
+        self.readahead = (
+            ReadAhead(
+                config.plates.plate_readahead_frames,
+                (config.plates.plate_readahead_mb or READAHEAD_BUDGET_MB) * 1024 * 1024,
+            )
+            if config.plates.plate_readahead_frames
+            else None
+        )
+        if getattr(self, "_ocio_loaded", False):
+            # e.g. loaded from the menu, the combined looks are made for the config
+            self._load_ocio()
+
+    def _load_ocio(self):
+        self._ocio_loaded = True
+        if not self._settings.load_luts_enabled:
+            return
+
+        # start from RV's config again, not the last session config
+        if self._base_ocio is None:
+            os.environ.pop("OCIO", None)
+        else:
+            os.environ["OCIO"] = self._base_ocio
+        try:
+            if self.config.color.look_mode == "combined":
+                use_session_config(get_ocio_config(self.config), self.config.color)
+            else:
+                prepare_ocio(self.config)
+        except Exception as e:
+            logger.error(f"Failed to load OCIO config: {e}")
+            self._settings.load_luts_enabled = False
+
+    def _find_file(
+        self, source_path: Path, search_path: str, key: str | None = None
+    ) -> Path | None:
+        with tracer.span("find_file", source=source_path, key=key):
+            if not key:
+                return self.resolver.find_file(source_path, search_path, key)
+
+            # looked up already, e.g. for the "Source" media rep's new group
+            found = self.registry.lookup(source_path, key)
+            if not isinstance(found, NotHandled):
+                return found
+
+            start = time.perf_counter()
+            file_path = self.resolver.find_file(source_path, search_path, key)
+            self.registry.add_lookup(
+                source_path, key, file_path, time.perf_counter() - start
+            )
+            return file_path
+
+    def _sequence_path(self, media_path: Path) -> Path:
+        """sequence_path, probing each frame's sequence once per session."""
+        if (known := self.registry.sequence(media_path)) is not None:
+            return known
+        found = sequence_path(media_path)
+        self.registry.add_sequence(media_path, found)
+        return found
+
+    @timed
+    @traced
     def on_source_group_complete(self, event: "Event"):
         logger.debug(f"auto_load_plates: {event.contents()}")
         #  The contents of the "source-group-complete" looks like "group nodename;;action_type"
         group, action_type = event.contents().split(";;")
 
         event.reject()
+        if recorder.enabled:
+            self._record_event("source-group-complete", event, group)
+
+        if commands.propertyExists(f"{group}.{PREBAKED_PROPERTY}"):
+            logger.debug(f"{group} was set up by the session generator, skipping")
+            return
 
-        self.autoload_media(group)
-        self.autoload_color(group)
+        if group in self._scripted_groups:
+            logger.debug(f"{group} was handled by autoload_sources, skipping")
+            self._scripted_groups.discard(group)
+            return
+
+        if self._settings.batch_source_groups:
+            logger.debug(f"Batching {group} until after progressive loading")
+            self._pending_groups[group] = None
+            return
+
+        stats.count("sources_processed")
+        with tracer.span("autoload_group", group=group):
+            self.autoload_media(group)
+            self.autoload_color(group)
+
+    @timed
+    @traced
+    def autoload_sources(self, sources: list[str]):
+        """Autoloads media and color for a whole list of sources in one pass.
+
+        For pipeline tools that build playlists from scripts. sources can be RV
+        source group names or media paths, which are added to the session first.
+        Directory listings are shared by every source in the list, and the new media
+        reps are added together at the end instead of once per source."""
+        nodes = set(commands.nodes())
+        media_paths = [source for source in sources if source not in nodes]
+        added_groups = self._add_scripted_sources(media_paths) if media_paths else {}
+
+        self._autoload_groups([added_groups.get(source, source) for source in sources])
+
+        if not media_paths:
+            self._flush_pending_media_reps()
+            self._build_viewed_color()
+        # otherwise RV is still loading the new sources, so leave the pending reps
+        # for after_progressive_loading, like we do for sources loaded by hand
+
+        self._refresh_menu()
+
+    def _autoload_groups(self, source_groups: list[str]):
+        """Autoloads media and color for each source group once, sharing directory listings."""
+        logger.debug(f"Autoloading {len(source_groups)} source groups")
+        # the ones on screen first, sorted is stable so the rest stay in load order
+        priority = self._group_priority()
+        source_groups = sorted(
+            dict.fromkeys(source_groups),
+            key=lambda group: priority(
+                group, self._view_group(self._file_source(group), group)
+            ),
+        )
+        source_paths = (
+            [self._source_path(group) for group in source_groups]
+            if self.resolver.prefetches
+            else []
+        )
+        with self.resolver.batch(source_paths):
+            for source_group in source_groups:
+                stats.count("sources_processed")
+                with tracer.span("autoload_group", group=source_group):
+                    if new_group := self.autoload_media(source_group):
+                        # the new "Source" media rep gets its own group, do that one too
+                        self._scripted_groups.add(new_group)
+                        source_group = new_group
+                        self.autoload_media(source_group)
+                    self.autoload_color(source_group)
+
+    def _view_priority(self) -> Callable[[str], Priority]:
+        """Returns a sort key putting the source groups on screen first."""
+        visible: set[str] = set()
+        for source in commands.sourcesAtFrame(commands.frame()):
+            visible.add(commands.nodeGroup(source))
+            if switch_node := commands.sourceMediaRepSwitchNode(source):
+                visible.add(commands.nodeGroup(switch_node))
+        view_inputs = commands.nodeConnections(commands.viewNode(), False)[0]
+        return view_priority(visible, view_inputs)
+
+    def _group_priority(self) -> Callable[[str, str], Priority]:
+        """Returns a sort key for (source group, view group). Once a source has media
+        reps, the view's inputs are switch groups, so its view group (see
+        _view_group) is checked too."""
+        priority = self._view_priority()
+        return lambda source_group, view_group: min(
+            priority(source_group), priority(view_group)
+        )
+
+    def _file_source(self, source_group: str) -> str:
+        return extra_commands.nodesInGroupOfType(source_group, "RVFileSource")[0]
+
+    def _source_path(self, source_group: str) -> Path:
+        file_source = self._file_source(source_group)
+        return Path(
+            commands.getStringProperty(f"{file_source}.media.movie", 0, 1000)[0]
+        )
+
+    def _add_scripted_sources(self, media_paths: list[str]) -> dict[str, str]:
+        """Adds media to the session and returns {media path: source group}."""
+        commands.addSourceBegin()
+        try:
+            added_groups = {
+                path: commands.nodeGroup(commands.addSourceVerbose([path]))
+                for path in media_paths
+            }
+        finally:
+            commands.addSourceEnd()
+
+        # we'll handle these ourselves, skip them in on_source_group_complete
+        self._scripted_groups.update(added_groups.values())
+        return added_groups
+
+    @traced
+    def autoload_media(self, source_group: str) -> str | None:
+        """Queues up plates and other media for a source.
+
+        Returns the new source group, if a "Source" media rep had to be added first."""
+        file_source = extra_commands.nodesInGroupOfType(source_group, "RVFileSource")[0]
+        source_path = Path(
+            commands.getStringProperty(f"{file_source}.media.movie", 0, 1000)[0]
+        )
+        if (media_reps := commands.sourceMediaReps(file_source)) == [""]:
+            # the media was just loaded (again), so look again for what wasn't
+            # there last time. Its "Source" media rep's group reuses the lookups.
+            self.registry.forget_misses(source_path)
 
-    def autoload_media(self, source_group: str):
         if (
             not self._settings.load_plates_enabled
             and not self._settings.load_other_enabled
@@ -293,77 +777,60 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
             logger.debug("Plate and other auto loaders disabled")
             return
 
-        file_source = extra_commands.nodesInGroupOfType(source_group, "RVFileSource")[0]
-        source_path = Path(
-            commands.getStringProperty(f"{file_source}.media.movie", 0, 1000)[0]
-        )
-        if (media_reps := commands.sourceMediaReps(file_source)) != [""]:
-            self._enqueue_plate_autoloads(file_source, source_path, media_reps)
+        if media_reps != [""]:
+            self._enqueue_plate_autoloads(
+                source_group, file_source, source_path, media_reps
+            )
         else:
             # no media reps, we need to add our default
             return self._add_default_media_rep(source_group, file_source, source_path)
 
+    def _pending(self, source_group: str) -> PendingGroupWork:
+        if (work := self._pending_work.get(source_group)) is None:
+            work = self._pending_work[source_group] = PendingGroupWork()
+        return work
+
     def _enqueue_plate_autoloads(
-        self, file_source: str, source_path: Path, media_reps: list[str]
+        self,
+        source_group: str,
+        file_source: str,
+        source_path: Path,
+        media_reps: list[str],
     ):
-        if self._settings.load_plates_enabled:
-            _media_rep_name_lookup = {
-                "plate_mov_path": "Plate",
-                "plate_frames_path": "Plate Frames",
-            }
-
-            for _plate, media_rep_name in _media_rep_name_lookup.items():
-                if media_rep_name in media_reps:
-                    continue
-
-                new_source_relative_path: str = getattr(self.config.plates, _plate)
-                if not new_source_relative_path:
-                    logger.debug(f"{_plate} not configured")
-                    continue
-
-                new_source_file = self._find_file(source_path, new_source_relative_path)
-                if not new_source_file:
-                    logger.warning(f"Can't autoload: {_plate}")
-                    continue
-
-                # adding new media representations here interferes with the Flow Production Tracking Mode
-                # specifically in shotgrid_mode.mu method: afterProgressiveLoading (void; Event event)
-                #      > ERROR: after progressive loading, number of new sources (%s) != infos (%s)"
-                # an error is thrown and the Flow sources don't get updated with info from the Flow fields
-                # so we queue up our changes and then run them all after progressive loading is done.
-                logger.debug(f"Queueing autoload {media_rep_name} {new_source_file}")
-                self._autoload_queue.put(
-                    PendingMediaRep(
-                        file_source, media_rep_name, new_source_file, "autoload"
-                    )
-                )
-        if self._settings.load_other_enabled:
-            for name, path in self.config.other.items():
-                media_rep_name = name.replace("_", " ")
-                if media_rep_name in media_reps:
-                    continue
-
-                new_source_file = self._find_file(source_path, path)
-                if not new_source_file:
-                    logger.warning(f"Can't autoload: {name}")
-                    continue
-
-                logger.debug(f"Queueing autoload {media_rep_name} {new_source_file}")
-                self._autoload_queue.put(
-                    PendingMediaRep(
-                        file_source, media_rep_name, new_source_file, "autoload"
-                    )
-                )
+        pending_reps = self._pending(source_group).media_reps
+        # don't resolve reps we've already queued for this source
+        media_reps = media_reps + [
+            name for node, name in pending_reps if node == file_source
+        ]
+        for media_rep_name, new_source_file in find_media_reps(
+            self.config,
+            source_path,
+            media_reps,
+            self._find_file,
+            load_plates=self._settings.load_plates_enabled,
+            load_other=self._settings.load_other_enabled,
+            find_sequence=self._sequence_path,
+        ):
+            # adding new media representations here interferes with the Flow Production Tracking Mode
+            # specifically in shotgrid_mode.mu method: afterProgressiveLoading (void; Event event)
+            #      > ERROR: after progressive loading, number of new sources (%s) != infos (%s)"
+            # an error is thrown and the Flow sources don't get updated with info from the Flow fields
+            # so we queue up our changes and then run them all after progressive loading is done.
+            logger.debug(f"Queueing autoload {media_rep_name} {new_source_file}")
+            self.registry.add_media_rep(source_path, media_rep_name, new_source_file)
+            pending_reps[(file_source, media_rep_name)] = PendingMediaRep(
+                file_source, media_rep_name, new_source_file, "autoload"
+            )
 
     def _add_default_media_rep(
         self, source_group: str, file_source: str, source_path: Path
-    ):
+    ) -> str:
         logger.debug("Adding 'Source' media representation")
         rep_node = commands.addSourceMediaRep(file_source, "Source", [str(source_path)])
         commands.setActiveSourceMediaRep(file_source, "Source")
 
         # flag for deletion in after_progressive_loading
-        self._delete_node = source_group
+        self._pending(source_group).delete = True
 
         # rename switch node in UI with filename
         switch_node = commands.sourceMediaRepSwitchNode(rep_node)
@@ -372,8 +839,9 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
             extra_commands.setUIName(commands.nodeGroup(switch_node), source_path.name)
             # if self.config.plates.plate_offset:
             #     commands.setIntProperty(f"{switch_node}.mode.alignStartFrames", [1])
-        return
+        return commands.nodeGroup(rep_node)
 
+    @traced
     def autoload_color(self, source_group: str):
         if not self._settings.load_luts_enabled:
             logger.debug("LUT auto loader disabled")
@@ -384,13 +852,65 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
             commands.getStringProperty(f"{file_source}.media.movie", 0, 1000)[0]
         )
 
-        if source_path.suffix.lower() in {
-            ".mov",
-        }:
+        if (kind := color_kind(source_path)) not in ("mov", "frames"):
+            return
+        # the files are looked up now, with the rest of the load's
+        looks = (
+            look_setups(self.config, source_path, self._find_file)
+            if kind == "frames"
+            else []
+        )
+
+        if self._settings.defer_color:
+            view_group = self._view_group(file_source, source_group)
+            logger.debug(f"Deferring color for {source_group} until it's viewed")
+            self._deferred_color[source_group] = DeferredColor(kind, view_group, looks)
+        else:
+            self._build_color(source_group, kind, looks)
+
+    def _build_color(
+        self, source_group: str, kind: str, looks: list[OCIONodeSetup | None]
+    ):
+        if kind == "mov":
             self._setup_mov_linearize_node(source_group)
-        elif source_path.suffix.lower() in {".dpx", ".exr"}:
+        elif kind == "frames":
             self._setup_exr_linearize_node(source_group)
-            self._add_look_luts(source_group, source_path)
+            self._add_look_luts(source_group, looks)
+
+    @traced
+    def _build_deferred_color(self, build: Callable[[str, DeferredColor], bool]):
+        """Builds the deferred color pipelines that build(source group, color) picks."""
+        for source_group, color in list(self._deferred_color.items()):
+            if not build(source_group, color):
+                continue
+            del self._deferred_color[source_group]
+            logger.debug(f"Building deferred color for {source_group}")
+            try:
+                self._build_color(source_group, color.kind, color.looks)
+            except Exception as e:
+                # e.g. the source was removed from the session
+                logger.warning(f"Can't set up color for {source_group}: {e}")
+
+    def _build_viewed_color(self):
+        """Builds the deferred color of the sources on screen, and the ones next to
+        them in the view, so they're ready when playback gets there."""
+        if not self._deferred_color:
+            return
+        is_viewed = self._is_viewed()
+        self._build_deferred_color(
+            lambda source_group, color: is_viewed(source_group, color.view_group)
+        )
+
+    def _is_viewed(self) -> Callable[[str, str], bool]:
+        """Returns whether a (source group, view group) is on screen or next to it."""
+        priority = self._group_priority()
+        return lambda source_group, view_group: (
+            priority(source_group, view_group) <= NEXT_TO_VISIBLE
+        )
+
+    def _view_group(self, source_node: str, source_group: str) -> str:
+        switch_node = commands.sourceMediaRepSwitchNode(source_node)
+        return commands.nodeGroup(switch_node) if switch_node else source_group
 
     def _setup_mov_linearize_node(self, source_group: str):
         """Sets Color -> File Nonlinear to Linear Conversion"""
@@ -399,22 +919,8 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
         )[0]
         linNode = extra_commands.nodesInGroupOfType(linPipeNode, "RVLinearize")[0]
 
-        sRGB = 0
-        logT = 0
-        r709 = 0
-
-        transfer_function = self.config.color.mov_colorspace
-
-        if transfer_function == "sRGB":
-            sRGB = 1
-        elif transfer_function == "Rec709":
-            r709 = 1
-        elif transfer_function != "Linear":
-            raise ValueError(f"Unknown transfer function: {transfer_function}")
-
-        commands.setIntProperty(f"{linNode}.color.sRGB2linear", [sRGB], True)
-        commands.setIntProperty(f"{linNode}.color.logtype", [logT], True)
-        commands.setIntProperty(f"{linNode}.color.Rec709ToLinear", [r709], True)
+        for prop, value in mov_linearize_flags(self.config).items():
+            commands.setIntProperty(f"{linNode}.color.{prop}", [value], True)
 
     def _setup_exr_linearize_node(self, source_group: str):
         file_pipe = extra_commands.nodesInGroupOfType(
@@ -426,16 +932,9 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
         )
         commands.setStringProperty(f"{file_pipe}.pipeline.nodes", ["OCIOFile"], True)
         ocio_node = extra_commands.nodesInGroupOfType(file_pipe, "OCIOFile")[0]
-        applyOCIOProps(
-            ocio_node,
-            {
-                "ocio.function": "color",
-                "ocio.inColorSpace": self.config.color.exr_colorspace,
-                "ocio_color.outColorSpace": "scene_linear",
-            },
-        )
+        applyOCIOSetup(ocio_node, exr_linearize_setup(self.config))
 
-    def _add_look_luts(self, source_group: str, source_path: Path):
+    def _add_look_luts(self, source_group: str, setups: list[OCIONodeSetup | None]):
         look_pipe = extra_commands.nodesInGroupOfType(
             source_group, "RVLookPipelineGroup"
         )[0]
@@ -443,46 +942,15 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
         # this is not the right way to do this, ideally all these transforms would be defined in one look in the ocio.config
         # However, that means we would have to hardcode the colorspaces (trying to pass them in via context doesn't seem to work)
         # So to keep them configurable, we're going to do it with a bunch of look nodes
-
-        look_pipeline = [
-            "OCIOLook",  # scene_linear to working space (log)
-            "OCIOLook",  # working space to linear (log)
-        ]
-
-        if self.config.color.look_cdl:
-            look_pipeline.append("OCIOLook")  # CDL
-
-        if self.config.color.look_lut:
-            look_pipeline.append("OCIOLook")  # LUT
+        # ([color] look_mode = combined or baked use a single node instead)
+        look_pipeline = ["OCIOLook"] * len(setups)
 
         commands.setStringProperty(f"{look_pipe}.pipeline.nodes", look_pipeline, True)
         look_nodes = extra_commands.nodesInGroupOfType(look_pipe, "OCIOLook")
 
-        applyOCIOProps(
-            look_nodes[0],  # lin to working space
-            {
-                "ocio.function": "color",
-                "ocio.inColorSpace": "scene_linear",
-                "ocio_color.outColorSpace": self.config.color.working_space,
-            },
-        )
-
-        applyOCIOProps(
-            look_nodes[-1],  # lut output space to linear
-            {
-                "ocio.function": "color",
-                "ocio.inColorSpace": self.config.color.look_lut_out_colorspace
-                if self.config.color.look_lut
-                else self.config.color.working_space,
-                "ocio_color.outColorSpace": "scene_linear",
-            },
-        )
-
-        if self.config.color.look_cdl:
-            self._add_look_cdl(source_path, look_nodes[1])
-
-        if self.config.color.look_lut:
-            self._add_look_lut(source_path, look_nodes[-2])
+        for node, setup in zip(look_nodes, setups):
+            if setup:
+                applyOCIOSetup(node, setup)
 
         # print a debug summary
         _look_pipe_nodes = commands.nodesInGroup(look_pipe)
@@ -497,102 +965,199 @@ class SlingshotAutoLoaderMode(rvtypes.MinorMode):
                     f"    look: {commands.getStringProperty(f'{node}.ocio_look.look', 0, 1)[0]}"
                 )
 
-    def _add_look_cdl(self, source_path: Path, node: str):
-        if not self.config.color.look_cdl:
-            return
+    @timed
+    @traced
+    def after_progressive_loading(self, event: "Event"):
+        logger.debug(f"after_progressive_loading: {event.contents()}")
+        if recorder.enabled:
+            self._record_event("after-progressive-loading", event)
 
-        if not (cdl_path := self._find_file(source_path, self.config.color.look_cdl)):
-            logger.warning("Can't load look CDL")
-            return
+        if self._pending_groups:
+            pending_groups, self._pending_groups = list(self._pending_groups), {}
+            self._autoload_groups(pending_groups)
 
-        logger.info(f"Loading look CDL {cdl_path}")
-        # commands.readCDL(str(cdl_path), color_node, True)
-        applyOCIOProps(
-            node,
-            {
-                "ocio.function": "look",
-                "ocio_look.look": "slingshot_cdl",
-                "ocio.inColorSpace": "scene_linear",
-            },
-            context={"CDL_PATH": str(cdl_path)},
-        )
+        self._flush_pending_media_reps()
+        self._build_viewed_color()
+        self._refresh_menu()
 
-    def _add_look_lut(self, source_path: Path, node: str):
-        if not self.config.color.look_lut:
+        event.reject()
+
+    def on_session_deletion(self, event: "Event"):
+        if self.readahead:
+            self.readahead.cancel()
+        self._deferred_media_reps.clear()
+        self._deferred_color.clear()
+        event.reject()
+
+    def on_frame_changed(self, event: "Event"):
+        event.reject()
+        if not self._deferred_media_reps and not self._deferred_color:
             return
+        # called every frame during playback, only do more when the source changes
+        sources = commands.sourcesAtFrame(commands.frame())
+        if sources != self._viewed_sources:
+            self._viewed_sources = sources
+            self._add_viewed_media_reps()
+            self._build_viewed_color()
+
+    def on_view_changed(self, event: "Event"):
+        event.reject()
+        self._add_viewed_media_reps()
+        self._build_viewed_color()
+
+    def before_session_write(self, event: "Event"):
+        # a saved session has to have everything, viewed or not
+        event.reject()
+        self._add_deferred_media_reps(lambda source_group, reps: True)
+        self._build_deferred_color(lambda source_group, color: True)
 
-        if not (lut_path := self._find_file(source_path, self.config.color.look_lut)):
-            logger.warning("Can't load look LUT")
+    @traced
+    def _flush_pending_media_reps(self):
+        pending_work, self._pending_work = self._pending_work, {}
+        if not pending_work:
             return
 
-        logger.info(f"Loading look LUT: {lut_path}")
-        # commands.readLUT(str(lut_path), look_node, True)
-
-        applyOCIOProps(
-            node,
-            {
-                "ocio.function": "look",
-                "ocio_look.look": "slingshot_lut",
-                "ocio.inColorSpace": "scene_linear",
-            },
-            context={"LUT_PATH": str(lut_path)},
-        )
+        # the ones on screen first, then their neighbours, then the rest in load order
+        priority = self._group_priority()
+        queued: list[tuple[Priority, str, str, list[PendingMediaRep]]] = []
+        for source_group, work in pending_work.items():
+            if not (reps := list(work.media_reps.values())):
+                continue
+            view_group = self._view_group(reps[0].sourceNode, source_group)
+            queued.append(
+                (priority(source_group, view_group), source_group, view_group, reps)
+            )
 
-    def after_progressive_loading(self, event: "Event"):
-        logger.debug(f"after_progressive_loading: {event.contents()}")
+        media_reps = []
+        for group_priority, source_group, view_group, reps in sorted(
+            queued, key=lambda q: q[0]
+        ):
+            if self._settings.defer_media_reps and group_priority > NEXT_TO_VISIBLE:
+                # leave it for when it's viewed
+                logger.debug(f"Deferring media reps for {source_group}")
+                self._deferred_media_reps[source_group] = DeferredMediaReps(
+                    view_group, reps
+                )
+            else:
+                media_reps += reps
+        self._add_media_reps(media_reps)
+
+        for source_group, work in pending_work.items():
+            if work.delete:
+                logger.debug(f"Deleting {source_group}")
+                commands.deleteNode(source_group)
+                self._deferred_media_reps.pop(source_group, None)
+                self._deferred_color.pop(source_group, None)
+
+    def _add_viewed_media_reps(self):
+        """Adds the deferred media reps of the sources on screen, and the ones next
+        to them in the view. Which ones those are is worked out again every time,
+        so they follow the frame and the view."""
+        if not self._deferred_media_reps:
+            return
+        is_viewed = self._is_viewed()
+        self._add_deferred_media_reps(
+            lambda source_group, reps: is_viewed(source_group, reps.view_group)
+        )
 
-        while not self._autoload_queue.empty():
-            rep = self._autoload_queue.get_nowait()
-            logger.info(f"Autoloading {rep.mediaRepName} {rep.mediaRepPath}")
+    @traced
+    def _add_deferred_media_reps(self, add: Callable[[str, DeferredMediaReps], bool]):
+        """Adds the deferred media reps that add(source group, reps) picks."""
+        media_reps = []
+        for source_group, reps in list(self._deferred_media_reps.items()):
+            if add(source_group, reps):
+                del self._deferred_media_reps[source_group]
+                logger.debug(f"Adding deferred media reps for {source_group}")
+                media_reps += reps.media_reps
+        self._add_media_reps(media_reps)
+
+    def _add_media_reps(self, media_reps: list[PendingMediaRep]):
+        # existing media rep names per switch node, so we can skip reps that are already
+        # there without a round trip through addSourceMediaRep's "already exists" error
+        rep_index: dict[str, set[str]] = {}
+        switch_nodes: dict[str, str] = {}
+        for rep in media_reps:
             try:
-                new_rep = commands.addSourceMediaRep(
-                    rep.sourceNode,
-                    rep.mediaRepName,
-                    [str(rep.mediaRepPath)],
-                    rep.tag,
-                )
-            except Exception:
-                # source media representation name already exists, probably
-                # Exception: Exception thrown while calling commands.addSourceMediaRep, ERROR: Source media representation name already exists:
+                if (switch_node := switch_nodes.get(rep.sourceNode)) is None:
+                    switch_node = switch_nodes[rep.sourceNode] = (
+                        commands.sourceMediaRepSwitchNode(rep.sourceNode)
+                        or rep.sourceNode
+                    )
+                if (existing_reps := rep_index.get(switch_node)) is None:
+                    existing_reps = rep_index[switch_node] = set(
+                        commands.sourceMediaReps(rep.sourceNode)
+                    )
+            except Exception as e:
+                # e.g. a deferred source that was removed from the session
+                logger.warning(f"Can't add {rep.mediaRepName} to {rep.sourceNode}: {e}")
                 continue
 
-            extra_commands.setUIName(
-                commands.nodeGroup(new_rep),
-                f"{rep.mediaRepPath.name} ({rep.mediaRepName})",
+            if rep.mediaRepName in existing_reps:
+                logger.debug(f"{rep.mediaRepName} already exists on {switch_node}")
+                continue
+
+            self._add_pending_media_rep(rep)
+            existing_reps.add(rep.mediaRepName)
+
+    @traced
+    def _add_pending_media_rep(self, rep: PendingMediaRep):
+        logger.info(f"Autoloading {rep.mediaRepName} {rep.mediaRepPath}")
+        try:
+            new_rep = commands.addSourceMediaRep(
+                rep.sourceNode,
+                rep.mediaRepName,
+                [str(rep.mediaRepPath)],
+                rep.tag,
             )
+        except Exception as e:
+            # duplicate names are filtered out before we get here, so this is a real error
+            logger.warning(f"Can't add {rep.mediaRepName} to {rep.sourceNode}: {e}")
+            return
+        stats.count("media_reps_added")
 
-            if rep.mediaRepName.startswith("Plate"):
-                logger.debug(
-                    f"Setting {new_rep} plate cut.in: {self.config.plates.plate_cut_in_frame} rangeStart: {self.config.plates.plate_first_frame_in_file}"
-                )
-                if self.config.plates.plate_cut_in_frame:
-                    commands.setIntProperty(
-                        f"{new_rep}.cut.in", [self.config.plates.plate_cut_in_frame]
-                    )
+        extra_commands.setUIName(
+            commands.nodeGroup(new_rep),
+            f"{rep.mediaRepPath.name} ({rep.mediaRepName})",
+        )
 
-                if self.config.plates.plate_first_frame_in_file:
-                    if not commands.propertyExists(f"{new_rep}.group.rangeStart"):
-                        commands.newProperty(
-                            f"{new_rep}.group.rangeStart", commands.IntType, 1
-                        )
-                    commands.setIntProperty(
-                        f"{new_rep}.group.rangeStart",
-                        [self.config.plates.plate_first_frame_in_file],
-                        True,
+        if rep.mediaRepName.startswith("Plate"):
+            if self.readahead:
+                self.readahead.warm(rep.mediaRepPath)
+
+            cut_in, range_start = plate_frame_settings(self.config, rep.mediaRepName)
+            logger.debug(
+                f"Setting {new_rep} plate cut.in: {cut_in} rangeStart: {range_start}"
+            )
+            if cut_in:
+                commands.setIntProperty(f"{new_rep}.cut.in", [cut_in])
+
+            if range_start:
+                if not commands.propertyExists(f"{new_rep}.group.rangeStart"):
+                    commands.newProperty(
+                        f"{new_rep}.group.rangeStart", commands.IntType, 1
                     )
+                commands.setIntProperty(
+                    f"{new_rep}.group.rangeStart", [range_start], True
+                )
 
-        if self._delete_node:
-            logger.debug(f"Deleting {self._delete_node}")
-            commands.deleteNode(self._delete_node)
-            self._delete_node = None
 
-        event.reject()
+_mode: SlingshotAutoLoaderMode | None = None
 
 
 def createMode():
-    return SlingshotAutoLoaderMode()
+    global _mode
+    _mode = SlingshotAutoLoaderMode()
+    return _mode
 
 
+def autoload_sources(sources: list[str]):
+    """Scripted entry point, see SlingshotAutoLoaderMode.autoload_sources."""
+    if _mode is None:
+        raise RuntimeError("Slingshot Auto Loader mode is not loaded")
+    _mode.autoload_sources(sources)
+
+
+@traced
 def applyOCIOProps(
     node: str, properties: "OCIOProperties", context: dict | None = None
 ):
@@ -616,3 +1181,12 @@ def applyOCIOProps(
             raise ValueError(
                 f"Cannot set property {prop} with value of type {type(value)}"
             )
+
+
+def _label(search_path: str | None) -> str | None:
+    """A search path for the menu, its candidate patterns on one line."""
+    return " or ".join(search_paths(search_path)) if search_path else search_path
+
+
+def applyOCIOSetup(node: str, setup: OCIONodeSetup):
+    applyOCIOProps(node, setup.properties, context=setup.context or None)
@@ -0,0 +1,201 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# Looks files up in a pipeline asset database over HTTP, instead of globbing for them.
+# The database answers for many sources in one request:
+#
+#   POST <asset_db_url>/resolve
+#   {"sources": [{"path": "/show/sh010/comp/sh010_comp_v003.1001.exr",
+#                 "version": "sh010_comp_v003"}, ...]}
+#
+#   {"results": [{"plate_mov_path": "/show/sh010/plate/sh010_plt.mov",
+#                 "look_lut": "/show/luts/sh010.cube"}, null, ...]}
+#
+# Results are in the same order as the sources, keyed by config option like a
+# manifest entry (see ManifestIndex). null means the database doesn't know the
+# source, and it's searched for on disk instead. When the database can't be reached,
+# or its answer doesn't look like the above, sources are searched for on disk for a
+# while before it's asked again.
+
+import http.client
+import json
+import logging
+import queue
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+from slingshot_autoloader_resolver import (
+    NOT_HANDLED,
+    NotHandled,
+    ResolverBackend,
+    version_key,
+)
+from slingshot_autoloader_stats import stats
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+BATCH_SIZE = 500
+# requests are made on the UI thread, so don't wait long for a slow database
+TIMEOUT = 2.0
+# how long to search on disk after a failed request, before asking again
+RETRY_SECONDS = 30.0
+
+
+class ConnectionPool:
+    """Keep-alive HTTP connections to one server, reused between requests."""
+
+    def __init__(self, url: str, size: int = 4, timeout: float = TIMEOUT):
+        parts = urlsplit(url)
+        self.host = parts.netloc
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._connection_class = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._idle: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue(size)
+
+    def _get(self) -> tuple[http.client.HTTPConnection, bool]:
+        """Returns an idle connection, or a new one, and whether it was reused."""
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            stats.count("asset_db_connections")
+            return self._connection_class(self.host, timeout=self.timeout), False
+
+    def _put(self, connection: http.client.HTTPConnection):
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def post_json(self, path: str, payload: Any) -> Any:
+        body = json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+        while True:
+            connection, reused = self._get()
+            try:
+                connection.request("POST", self.base_path + path, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, ConnectionError):
+                connection.close()
+                if reused:
+                    # the server closed a connection while it was idle, try another
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+            break
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._put(connection)
+
+        if response.status != 200:
+            raise OSError(f"HTTP {response.status} {response.reason} from {self.host}")
+        return json.loads(data)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def _results(response: Any, count: int) -> list[dict[str, str] | None]:
+    """Returns the results from a /resolve response, or raises ValueError if it's
+    not count entries of {config option: path} or null."""
+    results = response.get("results") if isinstance(response, dict) else None
+    if not isinstance(results, list) or len(results) != count:
+        raise ValueError(f"expected {count} results, got {str(response)[:200]}")
+    for entry in results:
+        if entry is not None and not (
+            isinstance(entry, dict)
+            and all(isinstance(v, str | None) for v in entry.values())
+        ):
+            raise ValueError(f"malformed result: {str(entry)[:200]}")
+    return results
+
+
+class AssetDatabaseBackend(ResolverBackend):
+    """Asks the asset database for every source in a batch in one request."""
+
+    prefetches = True
+
+    def __init__(
+        self,
+        url: str,
+        version_regex: str,
+        pool: ConnectionPool | None = None,
+        timeout: float = TIMEOUT,
+    ):
+        self.version_regex = version_regex
+        self.pool = pool or ConnectionPool(url, timeout=timeout)
+        # source -> {config option: path}, or None if the database doesn't know it
+        self._entries: dict[Path, dict[str, str] | None] = {}
+        self._retry_at = 0.0
+
+    @contextmanager
+    def batch(self, source_paths: list[Path]):
+        # asked again each batch, in case they've been published since
+        self._entries = {}
+        self._fetch(source_paths)
+        yield
+
+    def _fetch(self, source_paths: list[Path]):
+        """Looks the sources up, unless the database failed a moment ago.
+
+        Sources that weren't looked up are left out of _entries, so they're asked
+        for again once the database is back."""
+        for start in range(0, len(source_paths), BATCH_SIZE):
+            if time.monotonic() < self._retry_at:
+                return
+            chunk = list(dict.fromkeys(source_paths[start : start + BATCH_SIZE]))
+            sources = [
+                {"path": str(path), "version": version_key(path, self.version_regex)}
+                for path in chunk
+            ]
+            try:
+                response = self.pool.post_json("/resolve", {"sources": sources})
+                stats.count("asset_db_requests")
+                results = _results(response, len(chunk))
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                logger.warning(
+                    f"Asset database lookup failed, searching on disk "
+                    f"for the next {RETRY_SECONDS:.0f} s: {e}"
+                )
+                self._retry_at = time.monotonic() + RETRY_SECONDS
+                return
+
+            logger.debug(f"Asset database resolved {len(chunk)} sources")
+            self._entries.update(zip(chunk, results))
+
+    def find_file(
+        self, source_path: Path, search_path: str, key: str | None
+    ) -> Path | None | NotHandled:
+        if not key:
+            return NOT_HANDLED
+        if source_path not in self._entries:
+            self._fetch([source_path])
+        if (entry := self._entries.get(source_path)) is None:
+            return NOT_HANDLED
+
+        if not (file_path := entry.get(key)):
+            logger.warning(
+                f"Can't find file: {key} not in asset database for {source_path}"
+            )
+            return None
+        logger.debug(f"Found {key} in asset database: {file_path}")
+        return source_path.parent / file_path
+
+    def close(self):
+        self.pool.close()
@@ -0,0 +1,153 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# Bakes the look pipeline (scene_linear -> working space -> CDL -> LUT -> LUT output
+# space -> scene_linear) into a single LUT file, so a source needs one OCIOLook node
+# instead of four. Bakes are cached on disk by a hash of everything that goes in them.
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+import PyOpenColorIO as OCIO
+
+from slingshot_autoloader_config import AutoloadColorConfig
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+BAKE_CACHE_PATH = Path(tempfile.gettempdir()) / "slingshot_autoloader" / "bakes"
+BAKE_FORMAT = "cinespace"  # supports a 1D shaper in front of the 3D LUT
+BAKE_CUBE_SIZE = 33
+BAKE_SHAPER_SIZE = 4096
+
+# scene linear values are log2 encoded before the 3D LUT, covering about 0.001 to 128
+SHAPER_SPACE = "slingshot_bake_shaper"
+SHAPER_ALLOCATION_VARS = [-10.0, 7.0, 2**-10]
+BAKED_LOOK = "slingshot_baked"
+
+
+def look_transform(
+    color: AutoloadColorConfig,
+    cdl_path: Path | str | None,
+    lut_path: Path | str | None,
+) -> OCIO.GroupTransform:
+    """The same transforms as the OCIOLook node pipeline, as one GroupTransform.
+
+    The paths can also be context variables, e.g. "${LUT_PATH}"."""
+    transforms: list[OCIO.Transform] = [
+        OCIO.ColorSpaceTransform(src="scene_linear", dst=color.working_space)
+    ]
+    if cdl_path:
+        transforms.append(OCIO.FileTransform(src=str(cdl_path), cccId="0"))
+    if lut_path:
+        transforms.append(
+            OCIO.FileTransform(src=str(lut_path), interpolation=OCIO.INTERP_LINEAR)
+        )
+    transforms.append(
+        OCIO.ColorSpaceTransform(
+            src=color.look_lut_out_colorspace if lut_path else color.working_space,
+            dst="scene_linear",
+        )
+    )
+    return OCIO.GroupTransform(transforms)
+
+
+def _reference_space(config: OCIO.Config) -> str:
+    for colorspace in config.getColorSpaces():
+        if (
+            colorspace.getReferenceSpaceType() == OCIO.REFERENCE_SPACE_SCENE
+            and not colorspace.isData()
+            and colorspace.getTransform(OCIO.COLORSPACE_DIR_TO_REFERENCE) is None
+            and colorspace.getTransform(OCIO.COLORSPACE_DIR_FROM_REFERENCE) is None
+        ):
+            return colorspace.getName()
+    raise ValueError("Can't find the scene reference colorspace")
+
+
+def _bake_config(config: OCIO.Config, transform: OCIO.GroupTransform) -> OCIO.Config:
+    """A copy of the config with the look and a shaper space for the baker."""
+    bake_config = copy.deepcopy(config)
+    bake_config.addLook(
+        OCIO.Look(name=BAKED_LOOK, processSpace="scene_linear", transform=transform)
+    )
+
+    # a plain log2 curve on scene_linear, the baker won't take shaper spaces with
+    # channel crosstalk (e.g. scene_linear -> ACEScc)
+    shaper = OCIO.ColorSpace(name=SHAPER_SPACE)
+    shaper.setTransform(
+        OCIO.GroupTransform(
+            [
+                OCIO.AllocationTransform(
+                    allocation=OCIO.ALLOCATION_LG2,
+                    vars=SHAPER_ALLOCATION_VARS,
+                    direction=OCIO.TRANSFORM_DIR_INVERSE,
+                ),
+                OCIO.ColorSpaceTransform(
+                    src="scene_linear", dst=_reference_space(config)
+                ),
+            ]
+        ),
+        OCIO.COLORSPACE_DIR_TO_REFERENCE,
+    )
+    bake_config.addColorSpace(shaper)
+    return bake_config
+
+
+def _bake_key(
+    config: OCIO.Config,
+    color: AutoloadColorConfig,
+    cdl_path: Path | None,
+    lut_path: Path | None,
+) -> str:
+    inputs = [
+        config.getCacheID(),
+        color.working_space,
+        color.look_lut_out_colorspace,
+        BAKE_FORMAT,
+        BAKE_CUBE_SIZE,
+        BAKE_SHAPER_SIZE,
+        SHAPER_ALLOCATION_VARS,
+    ]
+    for path in (cdl_path, lut_path):
+        inputs += [str(path), os.stat(path).st_mtime_ns] if path else [None, None]
+    return hashlib.sha1(json.dumps(inputs).encode()).hexdigest()
+
+
+def bake_look(
+    config: OCIO.Config,
+    color: AutoloadColorConfig,
+    cdl_path: Path | None,
+    lut_path: Path | None,
+    cache_path: Path | None = None,
+) -> Path:
+    """Returns a LUT file with the whole look pipeline for a shot, baking it if needed."""
+    extension = dict(OCIO.Baker.getFormats())[BAKE_FORMAT]
+    baked_path = (cache_path or BAKE_CACHE_PATH) / (
+        f"{_bake_key(config, color, cdl_path, lut_path)}.{extension}"
+    )
+    if baked_path.exists():
+        logger.debug(f"Using baked look {baked_path}")
+        return baked_path
+
+    baker = OCIO.Baker()
+    baker.setConfig(_bake_config(config, look_transform(color, cdl_path, lut_path)))
+    baker.setFormat(BAKE_FORMAT)
+    baker.setInputSpace("scene_linear")
+    baker.setTargetSpace("scene_linear")
+    baker.setLooks(BAKED_LOOK)
+    baker.setShaperSpace(SHAPER_SPACE)
+    baker.setShaperSize(BAKE_SHAPER_SIZE)
+    baker.setCubeSize(BAKE_CUBE_SIZE)
+
+    logger.info(f"Baking look: CDL {cdl_path}, LUT {lut_path}")
+    baked = baker.bake()
+
+    baked_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = baked_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(baked)
+    os.replace(tmp_path, baked_path)
+    return baked_path
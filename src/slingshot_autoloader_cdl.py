@@ -0,0 +1,150 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# Show-wide .ccc/.cdl files can hold thousands of ColorCorrections, and OCIO reads
+# the whole file for every source that points CDL_PATH at it. Here we parse each
+# file once, index it by ColorCorrection id, and write the one correction a shot
+# needs to its own small .cc file.
+
+import hashlib
+import logging
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from pathlib import Path
+
+from slingshot_autoloader_recorder import recorder
+from slingshot_autoloader_stats import stats
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+COLLECTION_EXTENSIONS = {".ccc", ".cdl"}
+CACHE_PATH = Path(tempfile.gettempdir()) / "slingshot_autoloader" / "cdl"
+
+
+@dataclass(frozen=True)
+class ColorCorrection:
+    id: str
+    slope: str = "1 1 1"
+    offset: str = "0 0 0"
+    power: str = "1 1 1"
+    saturation: str = "1"
+
+    def to_xml(self) -> str:
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<ColorCorrection id="{_escape(self.id)}">\n'
+            "    <SOPNode>\n"
+            f"        <Slope>{self.slope}</Slope>\n"
+            f"        <Offset>{self.offset}</Offset>\n"
+            f"        <Power>{self.power}</Power>\n"
+            "    </SOPNode>\n"
+            "    <SatNode>\n"
+            f"        <Saturation>{self.saturation}</Saturation>\n"
+            "    </SatNode>\n"
+            "</ColorCorrection>\n"
+        )
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+    )
+
+
+def _local_name(tag: str) -> str:
+    # strip the namespace, e.g. {urn:ASC:CDL:v1.01}ColorCorrection
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(element: ET.Element, *names: str) -> str | None:
+    for child in element.iter():
+        if _local_name(child.tag) in names and child.text:
+            return " ".join(child.text.split())
+    return None
+
+
+def parse_color_corrections(path: Path) -> dict[str, ColorCorrection]:
+    """Parses a .cc, .ccc or .cdl file into {ColorCorrection id: ColorCorrection}.
+
+    Corrections without an id are indexed by their position in the file."""
+    corrections: dict[str, ColorCorrection] = {}
+    for element in ET.parse(path).iter():
+        if _local_name(element.tag) != "ColorCorrection":
+            continue
+
+        cc_id = element.get("id") or str(len(corrections))
+        values = {
+            "slope": _child_text(element, "Slope"),
+            "offset": _child_text(element, "Offset"),
+            "power": _child_text(element, "Power"),
+            "saturation": _child_text(element, "Saturation"),
+        }
+        corrections[cc_id] = ColorCorrection(
+            cc_id, **{k: v for k, v in values.items() if v is not None}
+        )
+
+    return corrections
+
+
+class ColorCorrectionCache:
+    """Parsed CDL files, keyed by path and re-read when the file's mtime changes."""
+
+    def __init__(self, cache_path: Path = CACHE_PATH):
+        self.cache_path = cache_path
+        self._files: dict[Path, tuple[int, dict[str, ColorCorrection]]] = {}
+        self._extracted: dict[tuple[Path, int, str], Path] = {}
+
+    def read(self, path: Path) -> tuple[int, dict[str, ColorCorrection]]:
+        mtime = os.stat(path).st_mtime_ns
+        if (cached := self._files.get(path)) and cached[0] == mtime:
+            stats.count("cdl_cache_hits")
+            return cached
+
+        stats.count("cdl_files_parsed")
+        logger.debug(f"Parsing color corrections: {path}")
+        if recorder.enabled:
+            recorder.read(path, path.read_text())
+        self._files[path] = (mtime, parse_color_corrections(path))
+        return self._files[path]
+
+    def extract(self, path: Path, cc_id: str) -> Path | None:
+        """Writes the ColorCorrection with this id to its own .cc file and returns its path."""
+        try:
+            mtime, corrections = self.read(path)
+        except (OSError, ET.ParseError) as e:
+            logger.warning(f"Can't read color corrections from {path}: {e}")
+            return None
+
+        if (extracted := self._extracted.get((path, mtime, cc_id))) is not None:
+            return extracted
+
+        if not (correction := corrections.get(cc_id)):
+            logger.warning(f"Can't find ColorCorrection id {cc_id} in {path}")
+            return None
+
+        xml = correction.to_xml()
+        # named by content, so the same correction is only ever written once
+        cc_path = self.cache_path / f"{hashlib.sha1(xml.encode()).hexdigest()}.cc"
+        if not cc_path.exists():
+            tmp_path = cc_path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                cc_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path.write_text(xml)
+                os.replace(tmp_path, cc_path)
+            except OSError as e:
+                logger.warning(
+                    f"Can't write color correction {cc_id} to {cc_path}: {e}"
+                )
+                tmp_path.unlink(missing_ok=True)
+                return None
+
+        self._extracted[(path, mtime, cc_id)] = cc_path
+        return cc_path
+
+
+color_corrections = ColorCorrectionCache()
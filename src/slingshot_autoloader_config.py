@@ -1,13 +1,15 @@
 # Copyright (C) 2025 Slingshot Systems Inc.
 # SPDX-License-Identifier: Apache-2.0
 
+import hashlib
+import json
 import logging
 import os
 import shutil
 from configparser import ConfigParser
 from dataclasses import asdict, dataclass, field, is_dataclass
 from pathlib import Path
-from typing import Literal
+from typing import Any, Callable, Literal
 
 import PyOpenColorIO as OCIO
 
@@ -22,6 +24,10 @@ SUPPORT_FILES_PATH = (
 @dataclass(frozen=True)
 class AutoloadMainConfig:
     version_regex: str = r"_(?P<version>v\d+)"
+    manifest_dir: str | None = None
+    asset_db_url: str | None = None
+    asset_db_timeout: float | None = None
+    index_socket: str | None = None
 
 
 @dataclass(frozen=True)
@@ -30,6 +36,8 @@ class AutoloadPlatesConfig:
     plate_frames_path: str | None = None
     plate_cut_in_frame: int | None = None
     plate_first_frame_in_file: int | None = None
+    plate_readahead_frames: int | None = None
+    plate_readahead_mb: int | None = None
 
 
 @dataclass
@@ -38,8 +46,10 @@ class AutoloadColorConfig:
     exr_colorspace: str = "ACES2065-1"
     working_space: str = "ACEScc"
     look_cdl: str | None = None
+    look_cdl_id: str | None = None
     look_lut: str | None = None
     look_lut_out_colorspace: str = "g24_rec709"
+    look_mode: Literal["nodes", "baked", "combined"] = "nodes"
 
 
 @dataclass(frozen=True)
@@ -76,11 +86,29 @@ def _read_config(path: Path) -> ConfigParser:
     return config
 
 
+def _color_choice(config: ConfigParser, key: str, choices: tuple[str, ...]) -> Any:
+    """Returns a [color] option if it's one of choices, else its default."""
+    default = AutoloadColorConfig.__dataclass_fields__[key].default
+    value = config["color"].get(key)
+    if not value or value in choices:
+        return value or default
+    logger.warning(
+        f"Invalid {key} {value!r}, expected one of {', '.join(choices)}; using {default}"
+    )
+    return default
+
+
 def _convert_configparser_to_config(config: ConfigParser) -> AutoloaderConfig:
     return AutoloaderConfig(
         main=AutoloadMainConfig(
             version_regex=config["main"].get("version_regex")
-            or AutoloadMainConfig.__dataclass_fields__["version_regex"].default
+            or AutoloadMainConfig.__dataclass_fields__["version_regex"].default,
+            manifest_dir=config["main"].get("manifest_dir"),
+            asset_db_url=config["main"].get("asset_db_url"),
+            asset_db_timeout=float(config["main"]["asset_db_timeout"])
+            if config["main"].get("asset_db_timeout")
+            else None,
+            index_socket=config["main"].get("index_socket"),
         )
         if config.has_section("main")
         else AutoloadMainConfig(),
@@ -93,6 +121,12 @@ def _convert_configparser_to_config(config: ConfigParser) -> AutoloaderConfig:
             plate_cut_in_frame=int(config["plates"]["plate_cut_in_frame"])
             if config["plates"].get("plate_cut_in_frame")
             else None,
+            plate_readahead_frames=int(config["plates"]["plate_readahead_frames"])
+            if config["plates"].get("plate_readahead_frames")
+            else None,
+            plate_readahead_mb=int(config["plates"]["plate_readahead_mb"])
+            if config["plates"].get("plate_readahead_mb")
+            else None,
         )
         if config.has_section("plates")
         else AutoloadPlatesConfig(),
@@ -100,22 +134,23 @@ def _convert_configparser_to_config(config: ConfigParser) -> AutoloaderConfig:
         if config.has_section("other")
         else {},
         color=AutoloadColorConfig(
-            mov_colorspace=(
-                value
-                if (value := config["color"].get("mov_colorspace"))
-                in ("sRGB", "Rec709", "Linear")
-                else AutoloadColorConfig.__dataclass_fields__["mov_colorspace"].default
+            mov_colorspace=_color_choice(
+                config, "mov_colorspace", ("sRGB", "Rec709", "Linear")
             ),
             exr_colorspace=config["color"].get("exr_colorspace")
             or AutoloadColorConfig.__dataclass_fields__["exr_colorspace"].default,
             working_space=config["color"].get("working_space")
             or AutoloadColorConfig.__dataclass_fields__["working_space"].default,
             look_cdl=config["color"].get("look_cdl"),
+            look_cdl_id=config["color"].get("look_cdl_id"),
             look_lut=config["color"].get("look_lut"),
             look_lut_out_colorspace=config["color"].get("look_lut_out_colorspace")
             or AutoloadColorConfig.__dataclass_fields__[
                 "look_lut_out_colorspace"
             ].default,
+            look_mode=_color_choice(
+                config, "look_mode", ("nodes", "baked", "combined")
+            ),
         )
         if config.has_section("color")
         else AutoloadColorConfig(),
@@ -145,24 +180,35 @@ def load_or_create_config() -> AutoloaderConfig:
     return _convert_configparser_to_config(_config)
 
 
+def read_config(path: Path) -> AutoloaderConfig:
+    """Reads a config file without installing it as the user's config."""
+    return _convert_configparser_to_config(_read_config(path))
+
+
 def load_config_from_file(path: Path) -> AutoloaderConfig:
-    config = _convert_configparser_to_config(_read_config(path))
+    config = read_config(path)
     dest_path = get_config_path()
     logger.debug(f"Copying config file {path} to {dest_path}")
     shutil.copy(path, dest_path)
     return config
 
 
-def get_ocio_config(autoloader_config: AutoloaderConfig) -> OCIO.Config:
+# the bundled config, installed to SupportFiles
+OCIO_CONFIG_NAME = "studio-config-v2.1.0_aces-v1.3_ocio-v2.2.ocio"
+# written next to the config by scripts/build.py, see write_ocio_cache
+OCIO_CACHE_SUFFIX = ".colorspaces.json"
+# the colorspaces the autoloader config names
+COLORSPACE_FIELDS = ["working_space", "exr_colorspace", "look_lut_out_colorspace"]
+
+
+def get_ocio_config_path() -> Path:
     if os.environ.get("OCIO"):
         ocio_config_path = Path(os.environ["OCIO"])
         logger.debug(
             f"Using OCIO config from environment variable: {ocio_config_path.as_posix()}"
         )
     else:
-        ocio_config_path = (
-            SUPPORT_FILES_PATH / "ocio/studio-config-v2.1.0_aces-v1.3_ocio-v2.2.ocio"
-        )
+        ocio_config_path = SUPPORT_FILES_PATH / "ocio" / OCIO_CONFIG_NAME
 
         if not ocio_config_path.exists():
             raise Exception(
@@ -173,17 +219,90 @@ def get_ocio_config(autoloader_config: AutoloaderConfig) -> OCIO.Config:
         # https://github.com/AcademySoftwareFoundation/OpenRV/blob/d96b2a8c93525da39bb2dc721690f214d3ea9181/src/lib/ip/OCIONodes/OCIOIPNode.cpp#L231
         os.environ["OCIO"] = ocio_config_path.as_posix()
 
-    logger.debug(f"Loading OCIO config: {ocio_config_path.as_posix()}")
-    config_module = OCIO.Config()
-    config = config_module.CreateFromFile(str(ocio_config_path))
+    return ocio_config_path
 
-    # validate configuration
-    for _field in ["working_space", "exr_colorspace", "look_lut_out_colorspace"]:
+
+def _validate_colorspaces(
+    autoloader_config: AutoloaderConfig, parse: Callable[[str], str | None]
+):
+    for _field in COLORSPACE_FIELDS:
         colorspace = getattr(autoloader_config.color, _field)
-        if not (validated_colorspace := config.parseColorSpaceFromString(colorspace)):
+        if not (validated_colorspace := parse(colorspace)):
             raise Exception(
                 f"Configuration error: Could not find color space: {colorspace}"
             )
         setattr(autoloader_config.color, _field, validated_colorspace)
 
+
+def get_ocio_config(autoloader_config: AutoloaderConfig) -> OCIO.Config:
+    ocio_config_path = get_ocio_config_path()
+
+    logger.debug(f"Loading OCIO config: {ocio_config_path.as_posix()}")
+    config_module = OCIO.Config()
+    config = config_module.CreateFromFile(str(ocio_config_path))
+
+    # validate configuration
+    _validate_colorspaces(autoloader_config, config.parseColorSpaceFromString)
+
     return config
+
+
+def write_ocio_cache(ocio_config_path: Path, cache_path: Path):
+    """Writes the config's colorspace names and aliases, and a hash of the config.
+
+    Parsing the whole config is most of the startup cost of the plugin; with this the
+    colorspaces in the autoloader config can be checked without it."""
+    data = ocio_config_path.read_bytes()
+    config = OCIO.Config.CreateFromStream(data.decode())
+    names = [
+        name
+        for colorspace in config.getColorSpaces()
+        for name in [colorspace.getName(), *colorspace.getAliases()]
+    ]
+    cache_path.write_text(
+        json.dumps(
+            {
+                "config_sha1": hashlib.sha1(data).hexdigest(),
+                "colorspaces": {
+                    name: config.parseColorSpaceFromString(name) for name in names
+                },
+            },
+            indent=1,
+        )
+    )
+
+
+def read_ocio_cache(ocio_config_path: Path) -> dict[str, str] | None:
+    """Returns {name or alias: colorspace} from the config's cache, if it has one
+    and it was written for this config."""
+    cache_path = ocio_config_path.with_name(ocio_config_path.name + OCIO_CACHE_SUFFIX)
+    try:
+        cache = json.loads(cache_path.read_text())
+        data = ocio_config_path.read_bytes()
+    except (OSError, ValueError):
+        return None
+
+    if cache.get("config_sha1") != hashlib.sha1(data).hexdigest():
+        logger.warning(f"Ignoring {cache_path}, it's for a different OCIO config")
+        return None
+    return cache["colorspaces"]
+
+
+def prepare_ocio(autoloader_config: AutoloaderConfig):
+    """Points $OCIO at the config and checks the colorspaces we use are in it.
+
+    With the cache the build ships, the config isn't parsed until something needs
+    it (OCIO.GetCurrentConfig() loads it from $OCIO), which usually is never: RV's
+    OCIO nodes read it themselves."""
+    ocio_config_path = get_ocio_config_path()
+    colorspaces = read_ocio_cache(ocio_config_path)
+    if colorspaces is None or not all(
+        getattr(autoloader_config.color, _field) in colorspaces
+        for _field in COLORSPACE_FIELDS
+    ):
+        # no cache, or a colorspace string only the full parser understands
+        OCIO.SetCurrentConfig(get_ocio_config(autoloader_config))
+        return
+
+    logger.debug(f"Using OCIO colorspace cache for {ocio_config_path.as_posix()}")
+    _validate_colorspaces(autoloader_config, colorspaces.get)
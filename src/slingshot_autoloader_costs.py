@@ -0,0 +1,224 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# What a [color] config costs: builds the OCIO processors autoload_color would set up
+# for sample sources, one per node, and compares them with the same chain as a single
+# combined transform. Run it outside RV:
+#
+#   python slingshot_autoloader_costs.py -c show.cfg /show/sh010/comp/sh010_comp_v003.1001.exr
+
+import argparse
+import array
+import copy
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import PyOpenColorIO as OCIO
+
+from slingshot_autoloader_config import (
+    AutoloaderConfig,
+    get_ocio_config,
+    load_or_create_config,
+    read_config,
+)
+from slingshot_autoloader_looks import use_session_config
+from slingshot_autoloader_resolver import Resolver
+from slingshot_autoloader_rules import (
+    FindFile,
+    OCIONodeSetup,
+    color_kind,
+    exr_linearize_setup,
+    look_setups,
+)
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+DEFAULT_IMAGE_SIZE = (512, 512)
+
+
+def node_transform(setup: OCIONodeSetup) -> OCIO.Transform:
+    """The transform an OCIOFile/OCIOLook node applies with these properties."""
+    properties = setup.properties
+    in_colorspace = properties.get("ocio.inColorSpace", "")
+    if properties.get("ocio.function") == "look":
+        return OCIO.LookTransform(
+            src=in_colorspace,
+            dst=in_colorspace,
+            looks=properties.get("ocio_look.look", ""),
+        )
+    return OCIO.ColorSpaceTransform(
+        src=in_colorspace, dst=properties.get("ocio_color.outColorSpace", "")
+    )
+
+
+def node_setups(
+    config: AutoloaderConfig, source_path: Path, find_file: FindFile
+) -> list[OCIONodeSetup]:
+    """The OCIO nodes autoload_color sets up for a source, in order."""
+    if color_kind(source_path) != "frames":
+        # movies are linearized by RV itself, not with OCIO
+        return []
+
+    setups = [exr_linearize_setup(config)]
+    setups += [s for s in look_setups(config, source_path, find_file) if s]
+    return setups
+
+
+def _context(ocio_config: OCIO.Config, setups: list[OCIONodeSetup]) -> OCIO.Context:
+    context = copy.deepcopy(ocio_config.getCurrentContext())
+    for setup in setups:
+        for key, value in setup.context.items():
+            context[key] = value
+    return context
+
+
+def _image(width: int, height: int):
+    """A width x height RGB float buffer with a ramp of values from 0 to 16."""
+    size = width * height * 3
+    try:
+        import numpy as np  # type: ignore  # not a dependency, used when it's there
+    except ImportError:  # the report works without it, on a plain float array
+        return array.array("f", (16.0 * i / size for i in range(size)))
+    return np.linspace(0.0, 16.0, size, dtype=np.float32).reshape(height, width, 3)
+
+
+@dataclass
+class ChainCost:
+    """Timings for one way of applying a source's color, in seconds."""
+
+    processors: list[OCIO.Processor] = field(default_factory=list)
+    build_time: float = 0.0
+    apply_time: float = 0.0
+
+    def apply(self, image):
+        cpus = [processor.getDefaultCPUProcessor() for processor in self.processors]
+        start = time.perf_counter()
+        for cpu in cpus:
+            cpu.applyRGB(image)
+        self.apply_time += time.perf_counter() - start
+
+
+@dataclass
+class SourceCost:
+    source_path: Path
+    nodes: ChainCost
+    combined: ChainCost
+    pixels: int = 0
+
+
+@dataclass
+class CostReport:
+    sources: list[SourceCost] = field(default_factory=list)
+
+    def repeated_processors(self, chain: str) -> tuple[int, int]:
+        """(repeats, builds): builds with the same cache ID as an earlier processor.
+
+        These are the same transform built again, which a session could share. It
+        says nothing about whether OCIO's own cache actually served them."""
+        seen: set[str] = set()
+        repeats = builds = 0
+        for source in self.sources:
+            for processor in getattr(source, chain).processors:
+                builds += 1
+                if (cache_id := processor.getCacheID()) in seen:
+                    repeats += 1
+                seen.add(cache_id)
+        return repeats, builds
+
+    def format(self) -> str:
+        lines = []
+        for chain in ("nodes", "combined"):
+            costs = [getattr(source, chain) for source in self.sources]
+            build_time = sum(cost.build_time for cost in costs)
+            apply_time = sum(cost.apply_time for cost in costs)
+            pixels = sum(source.pixels for source in self.sources)
+            repeats, builds = self.repeated_processors(chain)
+            lines.append(
+                f"{chain}: {builds} processors, {repeats} repeated, "
+                f"build {build_time * 1000:.2f} ms, "
+                f"{pixels / apply_time / 1e6 if apply_time else 0:.1f} Mpixels/s"
+            )
+        for source in self.sources:
+            lines.append(
+                f"  {source.source_path.name}: {len(source.nodes.processors)} nodes, "
+                f"build {source.nodes.build_time * 1000:.2f} ms vs "
+                f"{source.combined.build_time * 1000:.2f} ms combined"
+            )
+        return "\n".join(lines)
+
+
+def _build(
+    ocio_config: OCIO.Config, context: OCIO.Context, transforms: list[OCIO.Transform]
+) -> ChainCost:
+    cost = ChainCost()
+    for transform in transforms:
+        start = time.perf_counter()
+        cost.processors.append(
+            ocio_config.getProcessor(context, transform, OCIO.TRANSFORM_DIR_FORWARD)
+        )
+        cost.build_time += time.perf_counter() - start
+    return cost
+
+
+def color_costs(
+    config: AutoloaderConfig,
+    ocio_config: OCIO.Config,
+    source_paths: list[Path],
+    image_size: tuple[int, int] = DEFAULT_IMAGE_SIZE,
+    find_file: FindFile | None = None,
+) -> CostReport:
+    find_file = find_file or Resolver(config).find_file
+    report = CostReport()
+
+    for source_path in source_paths:
+        if not (setups := node_setups(config, source_path, find_file)):
+            logger.info(f"No OCIO nodes for {source_path}")
+            continue
+
+        context = _context(ocio_config, setups)
+        transforms = [node_transform(setup) for setup in setups]
+        source = SourceCost(
+            source_path,
+            nodes=_build(ocio_config, context, transforms),
+            combined=_build(ocio_config, context, [OCIO.GroupTransform(transforms)]),
+            pixels=image_size[0] * image_size[1],
+        )
+        # both chains get the same input, each on its own copy
+        source.nodes.apply(_image(*image_size))
+        source.combined.apply(_image(*image_size))
+        report.sources.append(source)
+
+    return report
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Measure what the [color] config costs for some sample media"
+    )
+    parser.add_argument("media", nargs="+", type=Path)
+    parser.add_argument(
+        "-c", "--config", type=Path, help="defaults to ~/.slingshot_rv_autoloader.cfg"
+    )
+    parser.add_argument(
+        "--size",
+        type=lambda size: tuple(int(n) for n in size.split("x")),
+        default=DEFAULT_IMAGE_SIZE,
+        help="test image size, e.g. 1920x1080",
+    )
+    args = parser.parse_args(argv)
+
+    config = read_config(args.config) if args.config else load_or_create_config()
+    ocio_config = get_ocio_config(config)
+    if config.color.look_mode == "combined":
+        ocio_config = use_session_config(ocio_config, config.color)
+    else:
+        OCIO.SetCurrentConfig(ocio_config)
+
+    print(color_costs(config, ocio_config, args.media, args.size).format())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
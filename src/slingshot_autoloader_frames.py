@@ -0,0 +1,139 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# Finds the frame range of an image sequence from one of its frames, by checking
+# whether frames exist instead of listing the directory: outwards in doubling steps
+# until a frame is missing, then a binary search for the last one. That's a few dozen
+# stat calls for a 10,000 frame plate. The range is passed to RV in its sequence
+# notation (e.g. sh010_plt.1001-1100#.exr), so RV doesn't list the directory either.
+
+import logging
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from slingshot_autoloader_recorder import recorder
+from slingshot_autoloader_stats import stats
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+# sh010_plt.1001.exr -> ("sh010_plt.", "1001", ".exr"), a frame number has a "." or
+# "_" before it and at least 4 digits, so the v003 in sh010_comp_v003.exr isn't one
+FRAME_REGEX = re.compile(r"^(?P<head>.*?[._])(?P<frame>\d{4,})(?P<tail>\.[^.]+)$")
+
+# sh010_plt.985-1100#.exr -> ("sh010_plt.", "985", "1100", "#", ".exr")
+RV_SEQUENCE_REGEX = re.compile(
+    r"^(?P<head>.*?)(?P<first>\d+)-(?P<last>\d+)(?P<padding>#|@+)(?P<tail>\.[^.]+)$"
+)
+
+# frames past each end that are checked for a gap, e.g. a missing frame mid-plate
+GAP_PROBES = (2, 3, 10, 100)
+
+
+@dataclass(frozen=True)
+class FrameSequence:
+    directory: Path
+    head: str
+    tail: str
+    padding: int
+    first: int
+    last: int
+
+    def frame_path(self, frame: int) -> Path:
+        return self.directory / f"{self.head}{frame:0{self.padding}d}{self.tail}"
+
+    def rv_path(self) -> Path:
+        """e.g. sh010_plt.1001-1100#.exr, # is 4 digits of padding, @ is one."""
+        padding = "#" if self.padding == 4 else "@" * self.padding
+        return (
+            self.directory / f"{self.head}{self.first}-{self.last}{padding}{self.tail}"
+        )
+
+
+def parse_rv_path(path: Path) -> FrameSequence | None:
+    """The reverse of FrameSequence.rv_path, None for other paths."""
+    if not (match := RV_SEQUENCE_REGEX.match(path.name)):
+        return None
+    padding = 4 if match["padding"] == "#" else len(match["padding"])
+    return FrameSequence(
+        path.parent,
+        match["head"],
+        match["tail"],
+        padding,
+        int(match["first"]),
+        int(match["last"]),
+    )
+
+
+def _last_frame(exists: Callable[[int], bool], frame: int, step: int) -> int:
+    """The last frame that exists going from frame (which does) in the step direction."""
+    # double the distance until a frame is missing
+    found, distance = frame, 1
+    while exists(missing := frame + step * distance):
+        found = missing
+        distance *= 2
+
+    # then binary search between the last frame we found and the missing one
+    while abs(missing - found) > 1:
+        middle = (found + missing) // 2
+        if exists(middle):
+            found = middle
+        else:
+            missing = middle
+    return found
+
+
+def _range_from_listing(
+    directory: Path, head: str, tail: str, padding: int
+) -> tuple[int, int] | None:
+    frame_regex = re.compile(
+        rf"^{re.escape(head)}(?P<frame>\d{{{padding},}}){re.escape(tail)}$"
+    )
+    try:
+        with os.scandir(directory) as it:
+            matches = [
+                match for entry in it if (match := frame_regex.match(entry.name))
+            ]
+    except OSError:
+        return None
+    if recorder.enabled:
+        recorder.listing(directory, {match.string: False for match in matches})
+    frames = [int(match["frame"]) for match in matches]
+    return (min(frames), max(frames)) if frames else None
+
+
+def find_frame_range(frame_path: Path) -> FrameSequence | None:
+    """Returns the sequence a frame belongs to, or None if it isn't numbered."""
+    if not (match := FRAME_REGEX.match(frame_path.name)):
+        return None
+
+    directory = frame_path.parent
+    head, tail, padding = match["head"], match["tail"], len(match["frame"])
+    frame = int(match["frame"])
+
+    def exists(frame: int) -> bool:
+        if frame < 0:
+            return False
+        stats.count("frame_probes")
+        path = directory / f"{head}{frame:0{padding}d}{tail}"
+        found = path.exists()
+        if recorder.enabled:
+            recorder.exist(path, found)
+        return found
+
+    first = _last_frame(exists, frame, -1)
+    last = _last_frame(exists, frame, 1)
+
+    if any(exists(first - n) for n in GAP_PROBES) or any(
+        exists(last + n) for n in GAP_PROBES
+    ):
+        # a frame is missing, the search may have stopped at it
+        logger.debug(f"Gap in {directory / head}*{tail}, listing the directory")
+        if frame_range := _range_from_listing(directory, head, tail, padding):
+            first, last = frame_range
+
+    sequence = FrameSequence(directory, head, tail, padding, first, last)
+    logger.debug(f"Found frames {first}-{last} for {frame_path}")
+    return sequence
@@ -0,0 +1,462 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# A local index of the show directories, for Linux review stations where every RV
+# instance globs the same shots over and over. The daemon lists the show roots once,
+# keeps the listings current with inotify, and hands them out over a Unix socket, so
+# the plugin's lookups are memory lookups. Run it on the review station:
+#
+#   python slingshot_autoloader_index.py --socket /tmp/slingshot_index.sock /show/proj1
+#
+# and point [main] index_socket at the socket. One JSON object per line each way:
+#
+#   {"path": "/show/proj1/sh010/comp/../plate"}
+#   {"realpath": "/show/proj1/sh010/plate", "entries": {"sh010_plt.mov": false}}
+#
+# entries is null for directories the index doesn't have, e.g. outside the roots.
+# inotify only sees changes made on this machine, so for roots on a network share the
+# plugin still looks on disk for anything the index doesn't have, and --rescan lists
+# everything again every so often to pick up deletions.
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Iterator, cast
+
+from slingshot_autoloader_recorder import recorder
+from slingshot_autoloader_resolver import (
+    NOT_HANDLED,
+    DirectoryListings,
+    NotHandled,
+    ResolverBackend,
+    first_match,
+)
+from slingshot_autoloader_stats import stats
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+INOTIFY = sys.platform.startswith("linux")
+
+# how long the plugin waits for an answer, and before trying to connect again
+TIMEOUT = 1.0
+RETRY_SECONDS = 30.0
+
+# from <sys/inotify.h>
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x1000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (
+    IN_CREATE
+    | IN_DELETE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+# struct inotify_event, followed by the name
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class Inotify:
+    """inotify through ctypes, so the daemon only needs the standard library."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        # there's no inotify, or O_CLOEXEC, off Linux; the daemon won't start there
+        cloexec = os.O_CLOEXEC if sys.platform != "win32" else 0
+        self.fd = libc.inotify_init1(cloexec)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "Can't start inotify")
+
+    def add_watch(self, path: str) -> int:
+        if (wd := self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)) < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+        return wd
+
+    def rm_watch(self, wd: int):
+        self._rm_watch(self.fd, wd)
+
+    def read(self) -> Iterator[tuple[int, int, str]]:
+        """Waits for events, and yields (watch, mask, name) for each."""
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            yield wd, mask, name
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ShotIndex:
+    """Listings of every directory under the roots, kept current with inotify."""
+
+    def __init__(self, roots: list[str], inotify: Inotify | None = None):
+        self.roots = [os.path.realpath(root) for root in roots]
+        self.inotify = inotify
+        self._lock = threading.Lock()
+        # directory (real path) -> {name: is_dir}
+        self._dirs: dict[str, dict[str, bool]] = {}
+        self._watches: dict[int, str] = {}
+        # one scan at a time, and the inotify events that came in during it
+        self._scan_lock = threading.Lock()
+        self._scan_events: list[tuple[int, int, str]] | None = None
+
+    def scan(self):
+        """Lists everything under the roots, again.
+
+        The new listings are built without the lock, so lookups are answered from
+        the old ones in the meantime, and swapped in once they're done."""
+        start = time.perf_counter()
+        with self._scan_lock:
+            with self._lock:
+                self._scan_events = []
+            dirs: dict[str, dict[str, bool]] = {}
+            watches: dict[int, str] = {}
+            for root in self.roots:
+                self._scan(root, dirs, watches)
+
+            with self._lock:
+                old_watches, self._dirs, self._watches = self._watches, dirs, watches
+                # watching a directory again gives the same watch
+                if self.inotify:
+                    for wd in old_watches.keys() - watches.keys():
+                        self.inotify.rm_watch(wd)
+                # anything that changed after it was listed
+                events, self._scan_events = self._scan_events, None
+                for event in events:
+                    self._apply(*event)
+                directories = len(self._dirs)
+        logger.info(
+            f"Indexed {directories} directories in {time.perf_counter() - start:.1f} s"
+        )
+
+    def _scan(
+        self,
+        directory: str,
+        dirs: dict[str, dict[str, bool]],
+        watches: dict[int, str],
+    ):
+        """Lists a directory and everything under it into dirs and watches."""
+        stack = [directory]
+        while stack:
+            directory = stack.pop()
+            # watched before it's listed, so nothing created in between is missed
+            if self.inotify:
+                try:
+                    watches[self.inotify.add_watch(directory)] = directory
+                except OSError as e:
+                    # e.g. fs.inotify.max_user_watches, it would go stale
+                    logger.warning(f"Not indexing {directory}: {e}")
+                    continue
+
+            entries = {}
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        entries[entry.name] = entry.is_dir()
+                        # symlinks are answered by their target's listing
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError as e:
+                logger.warning(f"Not indexing {directory}: {e}")
+                continue
+            dirs[directory] = entries
+
+    def _drop(self, directory: str):
+        """Forgets a directory and everything under it, with the lock held."""
+        prefix = directory + os.sep
+        for path in [d for d in self._dirs if d == directory or d.startswith(prefix)]:
+            del self._dirs[path]
+        for wd, path in list(self._watches.items()):
+            if path == directory or path.startswith(prefix):
+                del self._watches[wd]
+                if self.inotify:
+                    self.inotify.rm_watch(wd)
+
+    def apply(self, wd: int, mask: int, name: str):
+        """Updates the listings for an inotify event."""
+        if mask & IN_Q_OVERFLOW:
+            logger.warning("Missed inotify events, indexing everything again")
+            self.scan()
+            return
+        with self._lock:
+            if self._scan_events is not None:
+                # applied again to the new listings, see scan
+                self._scan_events.append((wd, mask, name))
+            self._apply(wd, mask, name)
+
+    def _apply(self, wd: int, mask: int, name: str):
+        """apply, with the lock held."""
+        if (directory := self._watches.get(wd)) is None:
+            return
+        if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+            self._drop(directory)
+            return
+        if (entries := self._dirs.get(directory)) is None:
+            return
+
+        path = os.path.join(directory, name)
+        if mask & (IN_CREATE | IN_MOVED_TO):
+            entries[name] = os.path.isdir(path)
+            if mask & IN_ISDIR:
+                self._scan(path, self._dirs, self._watches)
+        elif mask & (IN_DELETE | IN_MOVED_FROM):
+            entries.pop(name, None)
+            if mask & IN_ISDIR:
+                self._drop(path)
+
+    def watch(self):
+        """Applies inotify events as they come, forever."""
+        assert self.inotify
+        while True:
+            for wd, mask, name in self.inotify.read():
+                self.apply(wd, mask, name)
+
+    def listing(self, path: str) -> tuple[str, dict[str, bool] | None]:
+        """(real path, {name: is_dir}) for a directory, None if it isn't indexed."""
+        realpath = os.path.realpath(path)
+        with self._lock:
+            entries = self._dirs.get(realpath)
+            return realpath, dict(entries) if entries is not None else None
+
+
+# the daemon only runs on Linux, see main
+if sys.platform != "win32":
+
+    class _RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            index = cast(IndexServer, self.server).index
+            for line in self.rfile:
+                try:
+                    realpath, entries = index.listing(json.loads(line)["path"])
+                    reply = {"realpath": realpath, "entries": entries}
+                except (ValueError, KeyError, TypeError) as e:
+                    reply = {"error": f"Bad request: {e}"}
+                self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+    class IndexServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+        def __init__(self, socket_path: str, index: ShotIndex):
+            self.index = index
+            super().__init__(socket_path, _RequestHandler)
+
+
+def serve(socket_path: str, roots: list[str], rescan: float = 0.0):
+    if sys.platform == "win32":
+        raise OSError("the shot index only runs on Linux")
+    index = ShotIndex(roots, Inotify())
+    index.scan()
+    threading.Thread(target=index.watch, daemon=True).start()
+    if rescan:
+
+        def _rescan():
+            while True:
+                time.sleep(rescan)
+                index.scan()
+
+        threading.Thread(target=_rescan, daemon=True).start()
+
+    # left behind by a daemon that didn't shut down cleanly
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    with IndexServer(socket_path, index) as server:
+        logger.info(f"Serving the shot index on {socket_path}")
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(socket_path)
+
+
+class IndexClient:
+    """The plugin's connection to the daemon, reconnected if it's restarted."""
+
+    def __init__(self, socket_path: str, timeout: float = TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._socket: socket.socket | None = None
+        self._file = None
+        self._retry_at = 0.0
+
+    def available(self) -> bool:
+        """Connects if we aren't, unless the daemon wasn't running a moment ago."""
+        if self._file:
+            return True
+        if time.monotonic() < self._retry_at:
+            return False
+        if sys.platform == "win32":
+            # no Unix sockets to connect to, the daemon only runs on Linux
+            return False
+
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(self.timeout)
+        try:
+            self._socket.connect(self.socket_path)
+        except OSError as e:
+            logger.info(f"Shot index isn't running, listing on disk: {e}")
+            self._fail()
+            return False
+        self._file = self._socket.makefile("rwb")
+        return True
+
+    def listing(self, directory: Path) -> tuple[Path, dict[str, bool] | None] | None:
+        """(real path, {name: is_dir}) for a directory from the index, with no
+        entries if the index doesn't have it, or None if the daemon isn't running."""
+        if not self.available() or not (file := self._file):
+            return None
+        try:
+            file.write(json.dumps({"path": str(directory)}).encode() + b"\n")
+            file.flush()
+            reply = json.loads(file.readline())
+            return Path(reply["realpath"]), reply["entries"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Shot index lookup failed, listing on disk: {e}")
+            self._fail()
+            return None
+
+    def _fail(self):
+        self.close()
+        self._retry_at = time.monotonic() + RETRY_SECONDS
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self._socket:
+            self._socket.close()
+            self._socket = None
+
+
+class IndexListings(DirectoryListings):
+    """Directory listings from the shot index, listed on disk if it doesn't have them."""
+
+    def __init__(self, client: IndexClient):
+        super().__init__()
+        self.client = client
+        # directory -> whether the index had its listing
+        self._indexed: dict[Path, bool] = {}
+
+    def _lookup(self, directory: Path) -> bool:
+        """Asks the index for a directory's listing and real path, once."""
+        if (indexed := self._indexed.get(directory)) is not None:
+            return indexed
+
+        indexed = False
+        if (reply := self.client.listing(directory)) is not None:
+            realpath, entries = reply
+            self._canonical[directory] = realpath
+            if entries is not None:
+                stats.count("index_lookups")
+                self._listings[directory] = entries
+                if recorder.enabled:
+                    recorder.listing(directory, entries)
+                indexed = True
+        self._indexed[directory] = indexed
+        return indexed
+
+    def _open(self, directory: Path) -> int | None:
+        # directories the index has aren't listed on disk, so don't open them
+        if self._lookup(directory):
+            return None
+        return super()._open(directory)
+
+    def entries(self, directory: Path) -> dict[str, bool]:
+        if directory not in self._listings and self._lookup(directory):
+            return self._listings[directory]
+        return super().entries(directory)
+
+    def canonical(self, directory: Path) -> Path:
+        self._lookup(directory)
+        return super().canonical(directory)
+
+
+class IndexBackend(ResolverBackend):
+    """Globs the config's search paths against the shot index's listings."""
+
+    def __init__(
+        self, socket_path: str, version_regex: str, client: IndexClient | None = None
+    ):
+        self.version_regex = version_regex
+        self.client = client or IndexClient(socket_path)
+        self._listings: IndexListings | None = None
+
+    @contextmanager
+    def batch(self, source_paths: list[Path]):
+        with closing(IndexListings(self.client)) as self._listings:
+            try:
+                yield
+            finally:
+                self._listings = None
+
+    def find_file(
+        self, source_path: Path, search_path: str, key: str | None
+    ) -> Path | None | NotHandled:
+        if not self.client.available():
+            return NOT_HANDLED
+        if self._listings is None:
+            with self.batch([]):
+                return self.find_file(source_path, search_path, key)
+
+        if file_path := first_match(
+            source_path, search_path, self.version_regex, self._listings
+        ):
+            return file_path
+        # it may have been published from another machine, which inotify doesn't see
+        return NOT_HANDLED
+
+    def close(self):
+        self.client.close()
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Serve an inotify index of show directories to the autoloader"
+    )
+    parser.add_argument("roots", nargs="+", help="show directories to index")
+    parser.add_argument("--socket", required=True, help="Unix socket to listen on")
+    parser.add_argument(
+        "--rescan",
+        type=float,
+        default=0.0,
+        help="seconds between full rescans, for roots on network shares",
+    )
+    args = parser.parse_args(argv)
+
+    if not INOTIFY:
+        parser.error("the shot index needs inotify, it only runs on Linux")
+    # so the socket is cleaned up when the service is stopped
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    serve(args.socket, args.roots, args.rescan)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
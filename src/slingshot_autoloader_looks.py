@@ -0,0 +1,91 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# Writes a session OCIO config: the loaded config plus one look for each combination
+# of steps a source can need (working space, CDL, LUT, back to scene linear), so each
+# source is colored with a single OCIOLook node. The CDL and LUT paths are still
+# passed in with CDL_PATH/LUT_PATH context variables, so every shot shares the same
+# few looks, and shots with the same files share one processor in OCIO's cache.
+
+import copy
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+import PyOpenColorIO as OCIO
+
+from slingshot_autoloader_bake import look_transform
+from slingshot_autoloader_config import AutoloadColorConfig
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+SESSION_CONFIG_PATH = Path(tempfile.gettempdir()) / "slingshot_autoloader" / "ocio"
+COMBINED_LOOK_PREFIX = "slingshot_look"
+
+
+def combined_look_name(color: AutoloadColorConfig, cdl: bool, lut: bool) -> str:
+    """e.g. slingshot_look_cdl_lut_1a2b3c4d, the hash covers the colorspaces."""
+    colorspaces = f"{color.working_space}\n{color.look_lut_out_colorspace}"
+    digest = hashlib.sha1(colorspaces.encode()).hexdigest()[:8]
+    steps = [step for step, used in (("cdl", cdl), ("lut", lut)) if used]
+    return "_".join([COMBINED_LOOK_PREFIX, *steps, digest])
+
+
+def session_config(
+    config: OCIO.Config, color: AutoloadColorConfig
+) -> tuple[OCIO.Config, str]:
+    """A copy of the config with the combined looks, and its serialized form."""
+    session = copy.deepcopy(config)
+    look_names = {look.getName() for look in config.getLooks()}
+
+    for cdl in (False, True):
+        for lut in (False, True):
+            if (name := combined_look_name(color, cdl, lut)) in look_names:
+                continue
+            session.addLook(
+                OCIO.Look(
+                    name=name,
+                    processSpace="scene_linear",
+                    transform=look_transform(
+                        color,
+                        "${CDL_PATH}" if cdl else None,
+                        "${LUT_PATH}" if lut else None,
+                    ),
+                )
+            )
+
+    # the session config is written somewhere else, keep relative search paths working
+    # (one at a time, joined with ":" a Windows drive letter would split the path)
+    if working_dir := config.getWorkingDir():
+        session.clearSearchPaths()
+        for path in config.getSearchPaths():
+            if not (path.startswith("$") or os.path.isabs(path)):
+                path = os.path.join(working_dir, path)
+            session.addSearchPath(path)
+
+    return session, session.serialize()
+
+
+def use_session_config(
+    config: OCIO.Config,
+    color: AutoloadColorConfig,
+    cache_path: Path | None = None,
+) -> OCIO.Config:
+    """Writes the session config and makes it the one OCIO nodes load (via $OCIO)."""
+    session, serialized = session_config(config, color)
+    session_path = (cache_path or SESSION_CONFIG_PATH) / (
+        f"{hashlib.sha1(serialized.encode()).hexdigest()}.ocio"
+    )
+
+    if not session_path.exists():
+        session_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = session_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(serialized)
+        os.replace(tmp_path, session_path)
+
+    logger.debug(f"Using session OCIO config: {session_path.as_posix()}")
+    os.environ["OCIO"] = session_path.as_posix()
+    OCIO.SetCurrentConfig(session)
+    return session
@@ -0,0 +1,39 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# The order sources are autoloaded in, and which deferred work to do now: the
+# sources on screen, then their neighbours in the view (the next and previous shots
+# in a sequence), then the rest in load order. In a session of hundreds of clips the
+# artist gets the plate and color they're looking at first, and deferred work is done
+# as the frame or view comes to it.
+
+from typing import Callable
+
+VISIBLE = 0
+NEIGHBOUR = 1
+OTHER = 2
+
+Priority = tuple[int, int]
+
+# the sources on screen, and the next and previous ones in the view
+NEXT_TO_VISIBLE: Priority = (NEIGHBOUR, 1)
+
+
+def view_priority(
+    visible: set[str], view_inputs: list[str]
+) -> Callable[[str], Priority]:
+    """Returns a sort key for source groups, lowest first.
+
+    visible is the groups shown at the current frame (and the switch groups they're
+    in), view_inputs the inputs of the view node, in order."""
+    inputs = {node: i for i, node in enumerate(view_inputs)}
+    visible_inputs = [i for i, node in enumerate(view_inputs) if node in visible]
+
+    def priority(source_group: str) -> Priority:
+        if source_group in visible:
+            return VISIBLE, 0
+        if visible_inputs and (i := inputs.get(source_group)) is not None:
+            return NEIGHBOUR, min(abs(i - v) for v in visible_inputs)
+        return OTHER, 0
+
+    return priority
@@ -0,0 +1,133 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# Warms the page cache with the start of the plates we just added, so the first
+# playback after switching to a "Plate" or "Plate Frames" rep doesn't stutter on cold
+# network reads. Files are read on a few background threads, up to a budget of bytes
+# per session. On Linux this only asks the kernel to read ahead (posix_fadvise), so
+# nothing is copied into Python.
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from slingshot_autoloader_frames import parse_rv_path
+from slingshot_autoloader_stats import stats
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+# per session, unless [plates] plate_readahead_mb is set
+READAHEAD_BUDGET_MB = 2048
+MOV_HEAD_BYTES = 64 * 1024 * 1024
+# the index (moov atom) is at the end of movies that weren't written "fast start"
+MOV_TAIL_BYTES = 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+
+class ReadAhead:
+    def __init__(self, frames: int, budget: int, workers: int = 4):
+        self.frames = frames
+        self.budget = budget
+        self.bytes_requested = 0
+        self.workers = workers
+        self._warmed: set[Path] = set()
+        self._lock = threading.Lock()
+        # started with the first read of a session, see cancel()
+        self._executor: ThreadPoolExecutor | None = None
+        self._cancelled = threading.Event()
+
+    def warm(self, media_path: Path):
+        """Queues the first frames of a sequence, or the start of a movie."""
+        if media_path in self._warmed:
+            return
+        self._warmed.add(media_path)
+
+        if self._executor is None:
+            self._cancelled = threading.Event()
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="slingshot-readahead"
+            )
+        submit, cancelled = self._executor.submit, self._cancelled
+
+        if sequence := parse_rv_path(media_path):
+            last = min(sequence.last, sequence.first + self.frames - 1)
+            for frame in range(sequence.first, last + 1):
+                submit(self._warm_file, cancelled, sequence.frame_path(frame))
+        elif media_path.suffix.lower() == ".mov":
+            submit(
+                self._warm_file, cancelled, media_path, MOV_HEAD_BYTES, MOV_TAIL_BYTES
+            )
+        else:
+            submit(self._warm_file, cancelled, media_path)
+
+    def cancel(self):
+        """Drops the queued reads, e.g. when the session is closed. The next session
+        starts again with the whole budget."""
+        if self._executor is None:
+            return
+        self._cancelled.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._warmed.clear()
+        with self._lock:
+            self.bytes_requested = 0
+
+    def wait(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _reserve(self, length: int) -> int:
+        with self._lock:
+            length = max(0, min(length, self.budget - self.bytes_requested))
+            self.bytes_requested += length
+        stats.count("readahead_bytes", length)
+        return length
+
+    def _warm_file(
+        self,
+        cancelled: threading.Event,
+        path: Path,
+        head: int | None = None,
+        tail: int = 0,
+    ):
+        if cancelled.is_set():
+            return
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError as e:
+            logger.debug(f"Can't read ahead {path}: {e}")
+            return
+
+        try:
+            size = os.fstat(fd).st_size
+            if head is None or head + tail >= size:
+                ranges = [(0, size)]
+            else:
+                ranges = [(0, head), (size - tail, tail)]
+
+            for offset, length in ranges:
+                if not (length := self._reserve(length)):
+                    logger.debug(f"Read ahead budget spent, skipping {path}")
+                    return
+                self._read_ahead(cancelled, fd, offset, length)
+        except OSError as e:
+            logger.debug(f"Can't read ahead {path}: {e}")
+        finally:
+            os.close(fd)
+
+    def _read_ahead(
+        self, cancelled: threading.Event, fd: int, offset: int, length: int
+    ):
+        if (fadvise := getattr(os, "posix_fadvise", None)) is not None:
+            fadvise(fd, offset, length, getattr(os, "POSIX_FADV_WILLNEED"))
+            return
+
+        # no fadvise on macOS and Windows, read it and throw it away
+        os.lseek(fd, offset, os.SEEK_SET)
+        while length > 0 and not cancelled.is_set():
+            if not (data := os.read(fd, min(CHUNK_SIZE, length))):
+                return
+            length -= len(data)
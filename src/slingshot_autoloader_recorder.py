@@ -0,0 +1,91 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# Records a session load: the events the mode handled, the RV commands it called
+# and what they returned, and what it saw on disk (directory listings, files that
+# did or didn't exist, manifests and CDLs read). scripts/replay.py runs the mode
+# against a recording outside RV, so a slow load on a show can be profiled, and
+# compared between plugin versions, on exactly the same workload.
+
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+RECORDING_VERSION = 1
+
+# commands whose arguments aren't worth keeping, e.g. the whole menu
+UNRECORDED_ARGS = {"defineModeMenu"}
+
+
+def _jsonable(value: Any) -> Any:
+    """The value as it will be written, e.g. menu callbacks as their repr."""
+    return json.loads(json.dumps(value, default=repr))
+
+
+class Recorder:
+    def __init__(self):
+        self.enabled = False
+        self.clear()
+
+    def clear(self):
+        self.config: dict[str, Any] = {}
+        self.settings: dict[str, Any] = {}
+        self.events: list[dict[str, Any]] = []
+        self.commands: list[list[Any]] = []
+        # directory -> {name: is_dir}
+        self.listings: dict[str, dict[str, bool]] = {}
+        # path -> whether it exists
+        self.exists: dict[str, bool] = {}
+        # path -> text, for the files we read ourselves
+        self.files: dict[str, str] = {}
+
+    def start(self, config: dict[str, Any], settings: dict[str, Any]):
+        self.clear()
+        self.config = _jsonable(config)
+        self.settings = _jsonable(settings)
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def event(self, name: str, contents: str, media: str | None = None):
+        self.events.append({"name": name, "contents": contents, "media": media})
+
+    def command(self, name: str, args: tuple, result: Any):
+        if name in UNRECORDED_ARGS:
+            args = ()
+        self.commands.append([name, _jsonable(args), _jsonable(result)])
+
+    def listing(self, directory: Path, entries: dict[str, bool]):
+        self.listings[str(directory)] = entries
+
+    def exist(self, path: Path, exists: bool):
+        self.exists[str(path)] = exists
+
+    def read(self, path: Path, text: str):
+        self.files[str(path)] = text
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": RECORDING_VERSION,
+            "config": self.config,
+            "settings": self.settings,
+            "events": self.events,
+            "commands": self.commands,
+            "listings": self.listings,
+            "exists": self.exists,
+            "files": self.files,
+        }
+
+    def write(self, path: Path):
+        logger.info(
+            f"Writing recording of {len(self.events)} events and "
+            f"{len(self.commands)} RV commands to {path}"
+        )
+        path.write_text(json.dumps(self.to_dict()))
+
+
+recorder = Recorder()
@@ -0,0 +1,130 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# What the autoloader found (or didn't) for every source in the session, so it can
+# be looked at from the menu or reused without searching the disk again. Kept small
+# for sessions with thousands of sources: one slotted record per source, paths
+# interned (every source of a shot shares its plate and LUT paths).
+
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any
+
+from slingshot_autoloader_resolver import NOT_HANDLED, NotHandled
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+# config options that find color files rather than media
+COLOR_KEYS = {"look_cdl", "look_lut"}
+
+
+class SourceRecord:
+    __slots__ = ("source_path", "files", "misses", "media_reps", "seconds")
+
+    def __init__(self, source_path: str):
+        self.source_path = source_path
+        # (config option, path) for each file found
+        self.files: tuple[tuple[str, str], ...] = ()
+        # config options nothing was found for
+        self.misses: tuple[str, ...] = ()
+        # (media rep name, path) for each media rep queued
+        self.media_reps: tuple[tuple[str, str], ...] = ()
+        # time spent looking files up
+        self.seconds = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "media_reps": dict(self.media_reps),
+            "color_files": {k: p for k, p in self.files if k in COLOR_KEYS},
+            "files": {k: p for k, p in self.files if k not in COLOR_KEYS},
+            "misses": list(self.misses),
+            "seconds": self.seconds,
+        }
+
+    def summary(self) -> list[str]:
+        lines = [f"{name}: {path}" for name, path in self.media_reps]
+        lines += [f"{key}: {path}" for key, path in self.files if key in COLOR_KEYS]
+        lines += [f"{key}: not found" for key in self.misses]
+        lines.append(f"lookups: {self.seconds * 1000:.0f} ms")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.records: dict[str, SourceRecord] = {}
+        # frame found for a media rep -> its sequence in RV's notation, so the frame
+        # range of a plate shared by several sources is only probed once
+        self.sequences: dict[str, str] = {}
+
+    def record(self, source_path: Path) -> SourceRecord:
+        key = sys.intern(str(source_path))
+        if (record := self.records.get(key)) is None:
+            record = self.records[key] = SourceRecord(key)
+        return record
+
+    def lookup(self, source_path: Path, key: str) -> Path | None | NotHandled:
+        """The file found for a config option earlier, None if there wasn't one, or
+        NOT_HANDLED if it hasn't been looked up."""
+        if (record := self.records.get(str(source_path))) is None:
+            return NOT_HANDLED
+        for file_key, path in record.files:
+            if file_key == key:
+                return Path(path)
+        return None if key in record.misses else NOT_HANDLED
+
+    def add_lookup(
+        self, source_path: Path, key: str, file_path: Path | None, seconds: float
+    ):
+        record = self.record(source_path)
+        if file_path:
+            record.files += ((sys.intern(key), sys.intern(str(file_path))),)
+        else:
+            record.misses += (sys.intern(key),)
+        record.seconds += seconds
+
+    def forget_misses(self, source_path: Path):
+        """Looks the files that weren't found for a source up again, e.g. when its
+        media is loaded again after a new publish."""
+        if (record := self.records.get(str(source_path))) is not None:
+            record.misses = ()
+
+    def add_media_rep(self, source_path: Path, name: str, path: Path):
+        # replaces a media rep of the same name, e.g. when the source is reloaded
+        record = self.record(source_path)
+        record.media_reps = tuple(
+            rep for rep in record.media_reps if rep[0] != name
+        ) + ((sys.intern(name), sys.intern(str(path))),)
+
+    def sequence(self, frame_path: Path) -> Path | None:
+        """The sequence found for a frame earlier, None if it hasn't been probed."""
+        if (sequence_path := self.sequences.get(str(frame_path))) is None:
+            return None
+        return Path(sequence_path)
+
+    def add_sequence(self, frame_path: Path, sequence_path: Path):
+        self.sequences[sys.intern(str(frame_path))] = sys.intern(str(sequence_path))
+
+    def clear(self):
+        self.records.clear()
+        self.sequences.clear()
+
+    def summary(self) -> list[str]:
+        records = self.records.values()
+        return [
+            f"Sources: {len(records)}",
+            f"Media reps: {sum(len(r.media_reps) for r in records)}",
+            f"Sources with missing files: {len(self.with_misses())}",
+        ]
+
+    def with_misses(self) -> list[SourceRecord]:
+        return [record for record in self.records.values() if record.misses]
+
+    def write(self, path: Path):
+        logger.info(f"Writing autoload report to {path}")
+        path.write_text(
+            json.dumps(
+                {source: r.to_dict() for source, r in self.records.items()}, indent=2
+            )
+        )
@@ -0,0 +1,488 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+import abc
+import json
+import logging
+import os
+import re
+from contextlib import ExitStack, closing, contextmanager
+from fnmatch import fnmatch
+from pathlib import Path
+from string import Template
+from typing import Iterable, Iterator
+
+from slingshot_autoloader_config import AutoloaderConfig
+from slingshot_autoloader_recorder import recorder
+from slingshot_autoloader_stats import stats
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+# sidecar manifest, read from the source media's directory
+MANIFEST_FILENAME = "autoload_manifest.json"
+
+
+def expand_search_path(source_path: Path, search_path: str, version_regex: str) -> str:
+    """Substitutes ${version} style variables parsed from the source filename."""
+    if matches := re.search(version_regex, source_path.name, re.IGNORECASE):
+        search_path = Template(search_path).safe_substitute(**matches.groupdict())
+    return search_path
+
+
+def version_key(source_path: Path, version_regex: str) -> str:
+    """The source filename up to and including the version, e.g. "sh010_comp_v003".
+
+    This is shared by the movie and the frames of a version, so one manifest entry
+    covers both."""
+    if matches := re.search(version_regex, source_path.name, re.IGNORECASE):
+        return source_path.name[: matches.end()]
+    return source_path.stem
+
+
+# list directories through open directory handles, opening each one relative to its
+# parent's handle, so a lookup doesn't walk the whole path from the root again
+# (not on Windows, which can't list a directory handle)
+SCAN_BY_FD = os.scandir in os.supports_fd and os.open in os.supports_dir_fd
+# only where there's a directory handle to open
+O_DIRECTORY: int = getattr(os, "O_DIRECTORY", 0)
+# directory handles kept open at once, the least recently used are closed first;
+# well under the usual soft limit of 1024 open files
+MAX_OPEN_DIRECTORIES = 64
+
+
+class DirectoryListings:
+    """Globs search paths against directory listings, listing each directory once.
+
+    Share one instance between lookups to share the listings, e.g. for every source
+    in a batch; listings are never refreshed, so don't keep one around for longer.
+    close() it when done, it holds up to MAX_OPEN_DIRECTORIES directories open."""
+
+    def __init__(self):
+        self._listings: dict[Path, dict[str, bool]] = {}
+        # in the order they were last used
+        self._fds: dict[Path, int | None] = {}
+        self._symlinks: set[Path] = set()
+        self._canonical: dict[Path, Path] = {}
+
+    def _open(self, directory: Path) -> int | None:
+        """Returns a handle for a directory, opened relative to the nearest open parent.
+
+        The handle is only good until the next call, which may close it."""
+        if directory in self._fds:
+            fd = self._fds[directory] = self._fds.pop(directory)
+            return fd
+
+        parent = directory.parent
+        if parent != directory and any(p in self._fds for p in directory.parents):
+            if (parent_fd := self._open(parent)) is None:
+                fd = None
+            else:
+                fd = self._open_fd(directory.name, parent_fd)
+        else:
+            fd = self._open_fd(directory)
+        self._fds[directory] = fd
+        if len(self._fds) > MAX_OPEN_DIRECTORIES:
+            self._close(next(iter(self._fds)))
+        return fd
+
+    def _open_fd(self, path: Path | str, dir_fd: int | None = None) -> int | None:
+        try:
+            return os.open(path, os.O_RDONLY | O_DIRECTORY, dir_fd=dir_fd)
+        except OSError:
+            return None
+
+    def _scandir(self, directory: Path):
+        if SCAN_BY_FD and (fd := self._open(directory)) is not None:
+            return os.scandir(fd)
+        return os.scandir(directory)
+
+    def entries(self, directory: Path) -> dict[str, bool]:
+        """Returns {name: is_dir} for a directory, or {} if it can't be listed."""
+        if (entries := self._listings.get(directory)) is None:
+            stats.count("directories_listed")
+            try:
+                with self._scandir(directory) as it:
+                    entries = {}
+                    for entry in it:
+                        entries[entry.name] = entry.is_dir()
+                        if entry.is_symlink():
+                            self._symlinks.add(directory / entry.name)
+            except OSError:
+                entries = {}
+            self._listings[directory] = entries
+            if recorder.enabled:
+                recorder.listing(directory, entries)
+        else:
+            stats.count("listing_cache_hits")
+        return entries
+
+    def is_dir(self, path: Path) -> bool | None:
+        """Whether a path from glob() is a directory, None if it wasn't listed."""
+        return self._listings.get(path.parent, {}).get(path.name)
+
+    def is_symlink(self, path: Path) -> bool:
+        """Whether a listed path is a symlink, which may point at nothing."""
+        return path in self._symlinks
+
+    def canonical(self, directory: Path) -> Path:
+        """The directory without symlinks or "..", worked out once per directory."""
+        if (canonical := self._canonical.get(directory)) is None:
+            fd = self._open(directory) if SCAN_BY_FD else None
+            try:
+                # the kernel already knows where an open directory is, on Linux
+                canonical = Path(os.readlink(f"/proc/self/fd/{fd}"))
+            except OSError:
+                canonical = directory.resolve()
+            self._canonical[directory] = canonical
+        return canonical
+
+    def _close(self, directory: Path):
+        if (fd := self._fds.pop(directory)) is not None:
+            os.close(fd)
+
+    def close(self):
+        for directory in list(self._fds):
+            self._close(directory)
+
+    def glob(self, directory: Path, pattern: str) -> Iterator[Path]:
+        if "**" in pattern:
+            # recursive patterns aren't worth caching, let pathlib handle them
+            for match in sorted(directory.glob(pattern)):
+                if recorder.enabled:
+                    recorder.exist(match, True)
+                yield match
+            return
+        if SCAN_BY_FD:
+            # the one full path lookup, everything in the pattern is relative to it
+            self._open(directory)
+        yield from self._glob(directory, Path(pattern).parts)
+
+    def _glob(self, directory: Path, parts: tuple[str, ...]) -> Iterator[Path]:
+        part, rest = parts[0], parts[1:]
+        if rest and (part in (".", "..") or not _has_magic(part)):
+            # no need to list a directory to step through it
+            yield from self._glob(directory / part, rest)
+            return
+
+        for name, is_dir in sorted(self.entries(directory).items()):
+            if not fnmatch(name, part) or (rest and not is_dir):
+                continue
+            if rest:
+                yield from self._glob(directory / name, rest)
+            else:
+                yield directory / name
+
+
+def _has_magic(part: str) -> bool:
+    return any(c in part for c in "*?[")
+
+
+def search_paths(search_path: str) -> list[str]:
+    """The candidate patterns in a config value, one per line, in the order they're tried."""
+    return [line.strip() for line in search_path.splitlines() if line.strip()]
+
+
+def find_file(
+    source_path: Path,
+    search_path: str,
+    version_regex: str,
+    listings: DirectoryListings | None = None,
+) -> Path | None:
+    """Returns the first file matching any of the search path's candidate patterns.
+
+    The candidates are globbed against the same directory listings, so a fallback
+    pattern in a directory we've already listed costs nothing."""
+    if listings is None:
+        with closing(DirectoryListings()) as listings:
+            return find_file(source_path, search_path, version_regex, listings)
+
+    if file_path := first_match(source_path, search_path, version_regex, listings):
+        return file_path
+
+    candidates = " or ".join(search_paths(search_path))
+    logger.warning(f"Can't find file: {source_path.parent}/{candidates}")
+    return None
+
+
+def first_match(
+    source_path: Path,
+    search_path: str,
+    version_regex: str,
+    listings: DirectoryListings,
+) -> Path | None:
+    """find_file, without the warning when nothing matches."""
+    for candidate in search_paths(search_path):
+        candidate = expand_search_path(source_path, candidate, version_regex)
+        if file_path := _find_candidate(source_path, candidate, listings):
+            return file_path
+    return None
+
+
+def _find_candidate(
+    source_path: Path, search_path: str, listings: DirectoryListings
+) -> Path | None:
+    if (file_path := Path(search_path)).is_absolute():
+        is_file = file_path.is_file()
+        if recorder.enabled:
+            recorder.exist(file_path, is_file)
+        if not is_file:
+            logger.debug(f"Can't load file: {file_path} is not a file")
+            return
+        return file_path
+
+    directory = source_path.parent
+    try:
+        match = next(listings.glob(directory, search_path))
+    except StopIteration:
+        logger.debug(f"Nothing matches {directory}/{search_path}")
+        return
+
+    # glob listed it, unless the pattern was recursive; a symlink that isn't a
+    # directory may still be broken
+    is_dir = listings.is_dir(match)
+    if is_dir or (
+        (is_dir is None or listings.is_symlink(match)) and not match.is_file()
+    ):
+        logger.debug(f"Can't load file: {match} is not a file")
+        return
+
+    # the pattern's ".." are taken from the canonical source directory
+    return Path(
+        os.path.normpath(listings.canonical(directory) / match.relative_to(directory))
+    )
+
+
+class ManifestIndex:
+    """Resolution manifests written by the publish pipeline.
+
+    A manifest maps version keys (see version_key) to the already resolved files
+    for that version, keyed by the config option that would have found them:
+
+        {"versions": {"sh010_comp_v003": {
+            "plate_mov_path": "../plate/sh010_plt.mov",
+            "v000": "sh010_comp_v000.mov",
+            "look_lut": "/show/luts/sh010.cube"}}}
+
+    Relative paths are relative to the manifest. Manifests are looked up next to
+    the source (autoload_manifest.json) and in [main] manifest_dir (<version key>.json),
+    and each file is only read once. Manifests that weren't there are looked for
+    again after forget_missing(), in case the version has been published since."""
+
+    def __init__(self, version_regex: str, manifest_dir: str | None = None):
+        self.version_regex = version_regex
+        self.manifest_dir = Path(manifest_dir) if manifest_dir else None
+        self._manifests: dict[Path, dict[str, dict[str, str]] | None] = {}
+
+    def _read(self, manifest_path: Path) -> dict[str, dict[str, str]] | None:
+        if manifest_path in self._manifests:
+            stats.count("manifest_cache_hits")
+            return self._manifests[manifest_path]
+
+        stats.count("manifests_read")
+        try:
+            text = manifest_path.read_text()
+            if recorder.enabled:
+                recorder.read(manifest_path, text)
+            versions = json.loads(text)["versions"]
+            logger.debug(f"Read manifest {manifest_path}")
+        except FileNotFoundError:
+            if recorder.enabled:
+                recorder.exist(manifest_path, False)
+            versions = None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Can't read manifest {manifest_path}: {e}")
+            versions = None
+
+        self._manifests[manifest_path] = versions
+        return versions
+
+    def forget_missing(self):
+        self._manifests = {
+            path: versions
+            for path, versions in self._manifests.items()
+            if versions is not None
+        }
+
+    def entry(self, source_path: Path) -> dict[str, Path | None] | None:
+        """Returns the manifest entry for a source, or None if it wasn't published with one."""
+        key = version_key(source_path, self.version_regex)
+        manifests = [source_path.parent / MANIFEST_FILENAME]
+        if self.manifest_dir:
+            manifests.append(self.manifest_dir / f"{key}.json")
+
+        for manifest_path in manifests:
+            if not (versions := self._read(manifest_path)):
+                continue
+            if (entry := versions.get(source_path.name) or versions.get(key)) is None:
+                continue
+            return {
+                name: manifest_path.parent / path if path else None
+                for name, path in entry.items()
+            }
+
+        return None
+
+
+class NotHandled:
+    def __repr__(self):
+        return "NOT_HANDLED"
+
+
+# returned by a backend that has no answer for a lookup, so the next one is asked
+NOT_HANDLED = NotHandled()
+
+
+class ResolverBackend(abc.ABC):
+    """Somewhere the resolver can look up files for a source.
+
+    find_file returns the file, None if the backend knows there isn't one, or
+    NOT_HANDLED to leave the lookup to the next backend."""
+
+    # wants the source paths passed to batch() up front
+    prefetches = False
+
+    @abc.abstractmethod
+    def find_file(
+        self, source_path: Path, search_path: str, key: str | None
+    ) -> Path | None | NotHandled: ...
+
+    @contextmanager
+    def batch(self, source_paths: list[Path]):
+        """Lookups for these sources are coming, e.g. to fetch them all at once."""
+        yield
+
+    def close(self):
+        pass
+
+
+class LocalBackend(ResolverBackend):
+    """Globs the config's search paths on disk."""
+
+    def __init__(self, version_regex: str):
+        self.version_regex = version_regex
+        self._listings: DirectoryListings | None = None
+
+    @contextmanager
+    def batch(self, source_paths: list[Path]):
+        with closing(DirectoryListings()) as self._listings:
+            try:
+                yield
+            finally:
+                self._listings = None
+
+    def find_file(
+        self, source_path: Path, search_path: str, key: str | None
+    ) -> Path | None:
+        return find_file(source_path, search_path, self.version_regex, self._listings)
+
+
+class ManifestBackend(ResolverBackend):
+    """Published manifests, see ManifestIndex."""
+
+    def __init__(self, manifests: ManifestIndex):
+        self.manifests = manifests
+
+    @contextmanager
+    def batch(self, source_paths: list[Path]):
+        self.manifests.forget_missing()
+        yield
+
+    def find_file(
+        self, source_path: Path, search_path: str, key: str | None
+    ) -> Path | None | NotHandled:
+        if not key or (entry := self.manifests.entry(source_path)) is None:
+            return NOT_HANDLED
+
+        if not (file_path := entry.get(key)):
+            logger.warning(f"Can't find file: {key} not in manifest for {source_path}")
+            return None
+
+        is_file = file_path.is_file()
+        if recorder.enabled:
+            recorder.exist(file_path, is_file)
+        if not is_file:
+            # a stale manifest, e.g. the file was moved after publishing
+            logger.warning(f"Manifest for {source_path} points to a missing {key}")
+            return NOT_HANDLED
+        logger.debug(f"Found {key} in manifest: {file_path}")
+        return file_path
+
+
+def create_backends(config: AutoloaderConfig) -> list[ResolverBackend]:
+    """The backends for a config, in the order they're asked."""
+    backends: list[ResolverBackend] = [
+        ManifestBackend(
+            ManifestIndex(config.main.version_regex, config.main.manifest_dir)
+        )
+    ]
+    if config.main.asset_db_url:
+        # imported here, it builds on the backends in this module
+        from slingshot_autoloader_assetdb import TIMEOUT, AssetDatabaseBackend
+
+        backends.append(
+            AssetDatabaseBackend(
+                config.main.asset_db_url,
+                config.main.version_regex,
+                timeout=config.main.asset_db_timeout or TIMEOUT,
+            )
+        )
+    if config.main.index_socket:
+        from slingshot_autoloader_index import IndexBackend
+
+        backends.append(
+            IndexBackend(config.main.index_socket, config.main.version_regex)
+        )
+    backends.append(LocalBackend(config.main.version_regex))
+    return backends
+
+
+class Resolver:
+    """Finds the files the config points to, relative to a source.
+
+    Each backend is asked in turn: published manifests, then the asset database
+    and the shot index when they're configured, then the config's search paths
+    globbed on disk."""
+
+    def __init__(
+        self, config: AutoloaderConfig, backends: list[ResolverBackend] | None = None
+    ):
+        self.config = config
+        self.backends = backends if backends is not None else create_backends(config)
+        self._batching = False
+
+    @property
+    def prefetches(self) -> bool:
+        return any(backend.prefetches for backend in self.backends)
+
+    @contextmanager
+    def batch(self, source_paths: Iterable[Path] = ()):
+        """Shares work between every lookup made inside the block.
+
+        Directory listings are shared, and backends that can look up many sources
+        at once get source_paths up front."""
+        if self._batching:
+            yield
+            return
+
+        self._batching = True
+        try:
+            with ExitStack() as stack:
+                source_paths = list(source_paths)
+                for backend in self.backends:
+                    stack.enter_context(backend.batch(source_paths))
+                yield
+        finally:
+            self._batching = False
+
+    def find_file(
+        self, source_path: Path, search_path: str, key: str | None = None
+    ) -> Path | None:
+        for backend in self.backends:
+            file_path = backend.find_file(source_path, search_path, key)
+            if not isinstance(file_path, NotHandled):
+                return file_path
+        return None
+
+    def close(self):
+        for backend in self.backends:
+            backend.close()
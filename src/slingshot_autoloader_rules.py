@@ -0,0 +1,333 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# The autoload rules: which media representations and OCIO nodes a source gets.
+# Nothing in here talks to RV, so the same rules drive both the RV mode and the
+# session generator (slingshot_autoloader_session.py).
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Protocol
+
+import PyOpenColorIO as OCIO
+
+from slingshot_autoloader_bake import bake_look
+from slingshot_autoloader_cdl import COLLECTION_EXTENSIONS, color_corrections
+from slingshot_autoloader_config import AutoloaderConfig
+from slingshot_autoloader_frames import find_frame_range
+from slingshot_autoloader_looks import combined_look_name
+from slingshot_autoloader_resolver import expand_search_path
+
+if TYPE_CHECKING:
+    from rv.schemas.ocio import OCIOProperties
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+
+class FindFile(Protocol):
+    # key is the config option the search path came from, e.g. "plate_mov_path"
+    def __call__(
+        self, source_path: Path, search_path: str, key: str | None = None
+    ) -> Path | None: ...
+
+
+PLATE_MEDIA_REPS = {
+    "plate_mov_path": "Plate",
+    "plate_frames_path": "Plate Frames",
+}
+MOV_EXTENSIONS = {".mov"}
+FRAMES_EXTENSIONS = {".dpx", ".exr"}
+
+
+@dataclass
+class PendingMediaRep:
+    sourceNode: str
+    mediaRepName: str
+    mediaRepPath: Path
+    tag: str | None = None
+
+
+@dataclass
+class OCIONodeSetup:
+    properties: "OCIOProperties"
+    context: dict[str, str] = field(default_factory=dict)
+
+
+def other_media_rep_name(name: str) -> str:
+    return name.replace("_", " ")
+
+
+def find_media_reps(
+    config: AutoloaderConfig,
+    source_path: Path,
+    existing_reps: list[str],
+    find_file: FindFile,
+    load_plates: bool = True,
+    load_other: bool = True,
+    find_sequence: Callable[[Path], Path] | None = None,
+) -> list[tuple[str, Path]]:
+    """Returns the (media rep name, path) pairs to add to a source.
+
+    find_sequence turns a frame into its sequence, sequence_path by default."""
+    find_sequence = find_sequence or sequence_path
+    media_reps: list[tuple[str, Path]] = []
+
+    if load_plates:
+        for _plate, media_rep_name in PLATE_MEDIA_REPS.items():
+            if media_rep_name in existing_reps:
+                continue
+
+            new_source_relative_path: str = getattr(config.plates, _plate)
+            if not new_source_relative_path:
+                logger.debug(f"{_plate} not configured")
+                continue
+
+            new_source_file = find_file(source_path, new_source_relative_path, _plate)
+            if not new_source_file:
+                logger.warning(f"Can't autoload: {_plate}")
+                continue
+
+            media_reps.append((media_rep_name, find_sequence(new_source_file)))
+
+    if load_other:
+        for name, path in config.other.items():
+            media_rep_name = other_media_rep_name(name)
+            if media_rep_name in existing_reps:
+                continue
+
+            new_source_file = find_file(source_path, path, name)
+            if not new_source_file:
+                logger.warning(f"Can't autoload: {name}")
+                continue
+
+            media_reps.append((media_rep_name, find_sequence(new_source_file)))
+
+    return media_reps
+
+
+def sequence_path(media_path: Path) -> Path:
+    """Returns the frame range of an image sequence in RV's notation, so RV doesn't
+    have to list the directory to find it, or the path as is for other media."""
+    if color_kind(media_path) != "frames":
+        return media_path
+    sequence = find_frame_range(media_path)
+    return sequence.rv_path() if sequence else media_path
+
+
+def plate_frame_settings(
+    config: AutoloaderConfig, media_rep_name: str
+) -> tuple[int | None, int | None]:
+    """Returns the (cut.in, group.rangeStart) values for a media rep."""
+    if not media_rep_name.startswith("Plate"):
+        return None, None
+    return config.plates.plate_cut_in_frame, config.plates.plate_first_frame_in_file
+
+
+def color_kind(source_path: Path) -> str | None:
+    """Returns "mov" or "frames" for sources we set up color for, else None."""
+    suffix = source_path.suffix.lower()
+    if suffix in MOV_EXTENSIONS:
+        return "mov"
+    if suffix in FRAMES_EXTENSIONS:
+        return "frames"
+    return None
+
+
+def mov_linearize_flags(config: AutoloaderConfig) -> dict[str, int]:
+    """Returns the RVLinearize color.* properties for MOV sources."""
+    sRGB = 0
+    logT = 0
+    r709 = 0
+
+    transfer_function = config.color.mov_colorspace
+
+    if transfer_function == "sRGB":
+        sRGB = 1
+    elif transfer_function == "Rec709":
+        r709 = 1
+    elif transfer_function != "Linear":
+        raise ValueError(f"Unknown transfer function: {transfer_function}")
+
+    return {"sRGB2linear": sRGB, "logtype": logT, "Rec709ToLinear": r709}
+
+
+def exr_linearize_setup(config: AutoloaderConfig) -> OCIONodeSetup:
+    return OCIONodeSetup(
+        {
+            "ocio.function": "color",
+            "ocio.inColorSpace": config.color.exr_colorspace,
+            "ocio_color.outColorSpace": "scene_linear",
+        }
+    )
+
+
+def find_look_cdl(
+    config: AutoloaderConfig, source_path: Path, find_file: FindFile
+) -> Path | None:
+    if not config.color.look_cdl:
+        return None
+
+    if not (cdl_path := find_file(source_path, config.color.look_cdl, "look_cdl")):
+        logger.warning("Can't load look CDL")
+        return None
+
+    if config.color.look_cdl_id and cdl_path.suffix.lower() in COLLECTION_EXTENSIONS:
+        # pass OCIO just this shot's correction instead of the whole collection
+        cc_id = expand_search_path(
+            source_path, config.color.look_cdl_id, config.main.version_regex
+        )
+        if not (cdl_path := color_corrections.extract(cdl_path, cc_id)):
+            logger.warning("Can't load look CDL")
+            return None
+
+    return cdl_path
+
+
+def find_look_lut(
+    config: AutoloaderConfig, source_path: Path, find_file: FindFile
+) -> Path | None:
+    if not config.color.look_lut:
+        return None
+
+    if not (lut_path := find_file(source_path, config.color.look_lut, "look_lut")):
+        logger.warning("Can't load look LUT")
+        return None
+
+    return lut_path
+
+
+def look_cdl_setup(
+    config: AutoloaderConfig, source_path: Path, find_file: FindFile
+) -> OCIONodeSetup | None:
+    if not (cdl_path := find_look_cdl(config, source_path, find_file)):
+        return None
+    return _cdl_node_setup(cdl_path)
+
+
+def _cdl_node_setup(cdl_path: Path) -> OCIONodeSetup:
+    logger.info(f"Loading look CDL {cdl_path}")
+    return OCIONodeSetup(
+        {
+            "ocio.function": "look",
+            "ocio_look.look": "slingshot_cdl",
+            "ocio.inColorSpace": "scene_linear",
+        },
+        context={"CDL_PATH": str(cdl_path)},
+    )
+
+
+def look_lut_setup(
+    config: AutoloaderConfig, source_path: Path, find_file: FindFile
+) -> OCIONodeSetup | None:
+    if not (lut_path := find_look_lut(config, source_path, find_file)):
+        return None
+    return _lut_node_setup(lut_path)
+
+
+def _lut_node_setup(lut_path: Path) -> OCIONodeSetup:
+    logger.info(f"Loading look LUT: {lut_path}")
+    return OCIONodeSetup(
+        {
+            "ocio.function": "look",
+            "ocio_look.look": "slingshot_lut",
+            "ocio.inColorSpace": "scene_linear",
+        },
+        context={"LUT_PATH": str(lut_path)},
+    )
+
+
+def baked_look_setup(
+    config: AutoloaderConfig, cdl_path: Path | None, lut_path: Path | None
+) -> OCIONodeSetup | None:
+    """One node that applies the whole look pipeline from a baked LUT, or None if
+    it can't be baked."""
+    try:
+        baked_path = bake_look(
+            OCIO.GetCurrentConfig(), config.color, cdl_path, lut_path
+        )
+    except Exception as e:
+        logger.warning(f"Can't bake look, using separate look nodes: {e}")
+        return None
+
+    logger.info(f"Loading baked look: {baked_path}")
+    return OCIONodeSetup(
+        {
+            "ocio.function": "look",
+            "ocio_look.look": "slingshot_lut",
+            "ocio.inColorSpace": "scene_linear",
+        },
+        context={"LUT_PATH": str(baked_path)},
+    )
+
+
+def combined_look_setup(
+    config: AutoloaderConfig, cdl_path: Path | None, lut_path: Path | None
+) -> OCIONodeSetup:
+    """One node that applies the whole look pipeline with a session config look."""
+    context = {}
+    if cdl_path:
+        logger.info(f"Loading look CDL {cdl_path}")
+        context["CDL_PATH"] = str(cdl_path)
+    if lut_path:
+        logger.info(f"Loading look LUT: {lut_path}")
+        context["LUT_PATH"] = str(lut_path)
+
+    return OCIONodeSetup(
+        {
+            "ocio.function": "look",
+            "ocio_look.look": combined_look_name(
+                config.color, bool(cdl_path), bool(lut_path)
+            ),
+            "ocio.inColorSpace": "scene_linear",
+        },
+        context=context,
+    )
+
+
+def look_setups(
+    config: AutoloaderConfig, source_path: Path, find_file: FindFile
+) -> list[OCIONodeSetup | None]:
+    """Returns one entry per OCIOLook node in the look pipeline, in order.
+
+    Entries are None where a configured CDL/LUT couldn't be found; that node is
+    left at its defaults."""
+    cdl_path = find_look_cdl(config, source_path, find_file)
+    lut_path = find_look_lut(config, source_path, find_file)
+
+    if config.color.look_mode == "combined":
+        return [combined_look_setup(config, cdl_path, lut_path)]
+
+    if config.color.look_mode == "baked":
+        if baked := baked_look_setup(config, cdl_path, lut_path):
+            return [baked]
+
+    setups: list[OCIONodeSetup | None] = [
+        OCIONodeSetup(  # lin to working space
+            {
+                "ocio.function": "color",
+                "ocio.inColorSpace": "scene_linear",
+                "ocio_color.outColorSpace": config.color.working_space,
+            }
+        )
+    ]
+
+    if config.color.look_cdl:
+        setups.append(_cdl_node_setup(cdl_path) if cdl_path else None)
+
+    if config.color.look_lut:
+        setups.append(_lut_node_setup(lut_path) if lut_path else None)
+
+    setups.append(
+        OCIONodeSetup(  # lut output space to linear
+            {
+                "ocio.function": "color",
+                "ocio.inColorSpace": config.color.look_lut_out_colorspace
+                if config.color.look_lut
+                else config.color.working_space,
+                "ocio_color.outColorSpace": "scene_linear",
+            }
+        )
+    )
+
+    return setups
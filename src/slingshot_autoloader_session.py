@@ -0,0 +1,274 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# Writes .rv session files with the autoloader's work already done: media reps,
+# plate cut-ins and OCIO nodes are baked into the session, and every source group
+# is flagged so SlingshotAutoLoaderMode leaves it alone when the session is opened.
+#
+# usage: python slingshot_autoloader_session.py -o shots.rv [-c config.cfg] media...
+
+import argparse
+import logging
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Iterable
+
+import PyOpenColorIO as OCIO
+
+from slingshot_autoloader_config import (
+    AutoloaderConfig,
+    get_ocio_config,
+    load_or_create_config,
+    read_config,
+)
+from slingshot_autoloader_resolver import Resolver
+from slingshot_autoloader_rules import (
+    OCIONodeSetup,
+    color_kind,
+    exr_linearize_setup,
+    find_media_reps,
+    look_setups,
+    mov_linearize_flags,
+    plate_frame_settings,
+)
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+# set on every RVSourceGroup we write, checked in on_source_group_complete
+PREBAKED_PROPERTY = "slingshot_autoloader.prebaked"
+
+GTOValue = int | str | list[int] | list[str]
+
+
+@dataclass
+class GTOObject:
+    name: str
+    protocol: str
+    version: int = 1
+    components: dict[str, dict[str, GTOValue]] = field(default_factory=dict)
+
+    def set(self, prop: str, value: GTOValue):
+        """Sets a "component.property" value, creating the component as needed."""
+        component, name = prop.split(".", 1)
+        self.components.setdefault(component, {})[name] = value
+
+    def apply_ocio_setup(self, setup: OCIONodeSetup | None):
+        if not setup:
+            return
+        for key, value in setup.context.items():
+            self.set(f"ocio_context.{key}", value)
+        for prop, value in setup.properties.items():
+            self.set(prop, value)  # type: ignore
+
+    def format(self) -> str:
+        lines = [f"{self.name} : {self.protocol} ({self.version})", "{"]
+        for component, properties in self.components.items():
+            lines += [f"    {component}", "    {"]
+            lines += [
+                f"        {_gto_type(value)} {name} = {_gto_value(value)}"
+                for name, value in properties.items()
+            ]
+            lines += ["    }", ""]
+        if lines[-1] == "":
+            lines.pop()
+        lines.append("}")
+        return "\n".join(lines)
+
+
+def _gto_type(value: GTOValue) -> str:
+    sample = value[0] if isinstance(value, list) and value else value
+    return "int" if isinstance(sample, int) else "string"
+
+
+def _gto_value(value: GTOValue) -> str:
+    if isinstance(value, list):
+        return f"[ {' '.join(_gto_value(v) for v in value)} ]"
+    if isinstance(value, int):
+        return str(value)
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+@dataclass
+class SessionGraph:
+    objects: list[GTOObject] = field(default_factory=list)
+    connections: list[tuple[str, str]] = field(default_factory=list)
+    top_nodes: list[str] = field(default_factory=list)
+
+    def format(self) -> str:
+        session = GTOObject("rv", "RVSession", 4)
+        session.set("session.viewNode", "defaultSequence")
+        sequence = GTOObject("defaultSequence", "RVSequenceGroup")
+        sequence.set("ui.name", "Default Sequence")
+
+        connections = GTOObject("connections", "connection", 2)
+        connections.set("evaluation.lhs", [lhs for lhs, _ in self.connections])
+        connections.set("evaluation.rhs", [rhs for _, rhs in self.connections])
+        connections.set("top.nodes", self.top_nodes + [sequence.name])
+
+        objects = [session, *self.objects, sequence, connections]
+        return "GTOa (4)\n\n" + "\n\n".join(o.format() for o in objects) + "\n"
+
+
+class SessionWriter:
+    """Applies the autoload rules to a list of media and builds an RV session graph.
+
+    Mirrors what SlingshotAutoLoaderMode does when the same media is loaded in RV:
+    each media file gets a "Source" media rep plus any plates/other media found
+    next to it, and each rep gets the linearize and look pipelines from [color]."""
+
+    def __init__(
+        self,
+        config: AutoloaderConfig,
+        load_plates: bool = True,
+        load_other: bool = True,
+        load_luts: bool = True,
+    ):
+        if config.color.look_mode == "combined":
+            # the combined looks only exist in the session OCIO config RV writes to
+            # its temp directory on startup, a saved session can't rely on them
+            logger.warning(
+                "look_mode = combined can't be saved in a session, "
+                "writing the looks as nodes instead"
+            )
+            config = replace(config, color=replace(config.color, look_mode="nodes"))
+        self.config = config
+        self.load_plates = load_plates
+        self.load_other = load_other
+        self.load_luts = load_luts
+        self.graph = SessionGraph()
+        self._source_count = 0
+        self.resolver = Resolver(config)
+        self._find_file = self.resolver.find_file
+
+    def add_media(self, source_path: Path):
+        switch_group = f"switchGroup{len(self.graph.top_nodes):06d}"
+
+        media_reps = [("Source", source_path)] + find_media_reps(
+            self.config,
+            source_path,
+            ["Source"],
+            self._find_file,
+            load_plates=self.load_plates,
+            load_other=self.load_other,
+        )
+        rep_groups = [
+            self._add_source_group(switch_group, name, path)
+            for name, path in media_reps
+        ]
+
+        group = GTOObject(switch_group, "RVSwitchGroup")
+        group.set("ui.name", source_path.name)
+        switch = GTOObject(f"{switch_group}_switch", "RVSwitch")
+        switch.set("output.input", rep_groups[0])
+        self.graph.objects += [group, switch]
+        self.graph.connections.append((switch_group, "defaultSequence"))
+        self.graph.top_nodes.append(switch_group)
+
+    def _add_source_group(
+        self, switch_group: str, media_rep_name: str, path: Path
+    ) -> str:
+        group_name = f"sourceGroup{self._source_count:06d}"
+        self._source_count += 1
+
+        group = GTOObject(group_name, "RVSourceGroup")
+        group.set(PREBAKED_PROPERTY, 1)
+        if media_rep_name != "Source":
+            group.set("ui.name", f"{path.name} ({media_rep_name})")
+
+        source = GTOObject(f"{group_name}_source", "RVFileSource")
+        source.set("media.movie", str(path))
+        source.set("media.repName", media_rep_name)
+        cut_in, range_start = plate_frame_settings(self.config, media_rep_name)
+        if cut_in:
+            source.set("cut.in", cut_in)
+        if range_start:
+            source.set("group.rangeStart", range_start)
+
+        self.graph.objects += [group, source]
+        if self.load_luts:
+            self.graph.objects += self._color_nodes(group_name, path)
+        self.graph.connections.append((group_name, switch_group))
+        return group_name
+
+    def _color_nodes(self, group_name: str, path: Path) -> list[GTOObject]:
+        lin_pipe = GTOObject(f"{group_name}_tolinPipeline", "RVLinearizePipelineGroup")
+
+        if (kind := color_kind(path)) == "mov":
+            lin_pipe.set("pipeline.nodes", ["RVLinearize"])
+            lin_node = GTOObject(f"{lin_pipe.name}_0", "RVLinearize")
+            for prop, value in mov_linearize_flags(self.config).items():
+                lin_node.set(f"color.{prop}", value)
+            return [lin_pipe, lin_node]
+
+        if kind != "frames":
+            return []
+
+        lin_pipe.set("pipeline.nodes", ["OCIOFile"])
+        lin_node = GTOObject(f"{lin_pipe.name}_0", "OCIOFile")
+        lin_node.apply_ocio_setup(exr_linearize_setup(self.config))
+
+        setups = look_setups(self.config, path, self._find_file)
+        look_pipe = GTOObject(f"{group_name}_lookPipeline", "RVLookPipelineGroup")
+        look_pipe.set("pipeline.nodes", ["OCIOLook"] * len(setups))
+        look_nodes = []
+        for i, setup in enumerate(setups):
+            look_node = GTOObject(f"{look_pipe.name}_{i}", "OCIOLook")
+            look_node.apply_ocio_setup(setup)
+            look_nodes.append(look_node)
+
+        return [lin_pipe, lin_node, look_pipe, *look_nodes]
+
+    def write(self, output_path: Path):
+        output_path.write_text(self.graph.format())
+
+
+def write_session(
+    media: Iterable[Path],
+    output_path: Path,
+    config: AutoloaderConfig,
+    load_plates: bool = True,
+    load_other: bool = True,
+    load_luts: bool = True,
+):
+    writer = SessionWriter(config, load_plates, load_other, load_luts)
+    media = [source_path.absolute() for source_path in media]
+    with writer.resolver.batch(media):
+        for source_path in media:
+            writer.add_media(source_path)
+    writer.resolver.close()
+    writer.write(output_path)
+    logger.info(f"Wrote {len(writer.graph.top_nodes)} sources to {output_path}")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Write an RV session with plates, v000s and LUTs/CDLs pre-loaded"
+    )
+    parser.add_argument("media", nargs="+", type=Path)
+    parser.add_argument("-o", "--output", type=Path, required=True)
+    parser.add_argument(
+        "-c", "--config", type=Path, help="defaults to ~/.slingshot_rv_autoloader.cfg"
+    )
+    parser.add_argument("--no-plates", action="store_true")
+    parser.add_argument("--no-other", action="store_true")
+    parser.add_argument("--no-luts", action="store_true")
+    args = parser.parse_args(argv)
+
+    config = read_config(args.config) if args.config else load_or_create_config()
+    if not args.no_luts:
+        # validates and normalizes the configured colorspace names
+        OCIO.SetCurrentConfig(get_ocio_config(config))
+
+    write_session(
+        args.media,
+        args.output,
+        config,
+        load_plates=not args.no_plates,
+        load_other=not args.no_other,
+        load_luts=not args.no_luts,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
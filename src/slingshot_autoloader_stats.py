@@ -0,0 +1,126 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# Running counters for the session, shown in the Performance Stats menu, so artists
+# can send us numbers when a show is slow to load.
+
+import functools
+import json
+import logging
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, TypeVar, cast
+
+from slingshot_autoloader_recorder import recorder
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+F = TypeVar("F", bound=Callable[..., Any])
+M = TypeVar("M")
+
+# (counter, label) in the order they're shown in the menu
+COUNTERS = [
+    ("sources_processed", "Sources processed"),
+    ("media_reps_added", "Media reps added"),
+    ("directories_listed", "Directories listed"),
+    ("listing_cache_hits", "Directory listing cache hits"),
+    ("index_lookups", "Shot index lookups"),
+    ("frame_probes", "Frame existence checks"),
+    ("manifests_read", "Manifests read"),
+    ("manifest_cache_hits", "Manifest cache hits"),
+    ("asset_db_requests", "Asset database requests"),
+    ("asset_db_connections", "Asset database connections"),
+    ("cdl_files_parsed", "CDL files parsed"),
+    ("cdl_cache_hits", "CDL cache hits"),
+    ("readahead_bytes", "Plate bytes read ahead"),
+    ("rv_commands", "RV commands"),
+]
+
+
+class Stats:
+    def __init__(self):
+        self.counters: Counter[str] = Counter()
+        # handler name -> [calls, seconds]
+        self.handlers: dict[str, list[float]] = {}
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def reset(self):
+        self.counters.clear()
+        self.handlers.clear()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "handlers": {
+                name: {"calls": int(calls), "seconds": seconds}
+                for name, (calls, seconds) in sorted(self.handlers.items())
+            },
+        }
+
+    def write(self, path: Path):
+        logger.info(f"Writing performance stats to {path}")
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+
+    def summary(self) -> list[str]:
+        lines = [f"{label}: {self.counters[name]}" for name, label in COUNTERS]
+        lines += [
+            f"{name}: {int(calls)} calls, {seconds * 1000:.0f} ms"
+            for name, (calls, seconds) in sorted(self.handlers.items())
+        ]
+        return lines
+
+
+stats = Stats()
+
+
+def timed(func: F) -> F:
+    """Adds up the calls and time spent in a function, e.g. an event handler."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def _timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            handler = stats.handlers.setdefault(name, [0, 0.0])
+            handler[0] += 1
+            handler[1] += time.perf_counter() - start
+
+    return _timed  # type: ignore[return-value]
+
+
+class CountingCommands:
+    """Wraps an RV commands module and counts the commands called through it.
+
+    While a session load is being recorded, the calls and their results are
+    recorded too."""
+
+    def __init__(self, module: Any):
+        self._module = module
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._module, name)
+        if not callable(attr) or isinstance(attr, type):
+            return attr
+
+        @functools.wraps(attr)
+        def _counted(*args, **kwargs):
+            stats.counters["rv_commands"] += 1
+            stats.counters[f"rv_commands.{name}"] += 1
+            result = attr(*args, **kwargs)
+            if recorder.enabled:
+                recorder.command(name, args, result)
+            return result
+
+        # looked up once, __getattr__ isn't called for attributes that exist
+        setattr(self, name, _counted)
+        return _counted
+
+
+def counting_commands(module: M) -> M:
+    """CountingCommands typed as the module it wraps, so the RV stubs still apply."""
+    return cast(M, CountingCommands(module))
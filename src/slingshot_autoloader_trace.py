@@ -0,0 +1,88 @@
+# Copyright (C) 2025 Slingshot Systems Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# Nested timing spans for a session load, saved in the Chrome trace event format
+# (open them in chrome://tracing or https://ui.perfetto.dev). When tracing is off,
+# a span is one attribute check and a shared no-op context manager.
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger("SlingshotAutoLoader")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_NO_SPAN = nullcontext()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, args: dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        self.tracer.events.append(
+            {
+                "name": self.name,
+                "cat": "autoload",
+                "ph": "X",  # a complete event, nesting is worked out from the times
+                "ts": self.start / 1000,
+                "dur": (end - self.start) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {key: str(value) for key, value in self.args.items()},
+            }
+        )
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.events: list[dict[str, Any]] = []
+
+    def span(self, name: str, **args: Any):
+        """with tracer.span("autoload_media", group=source_group): ..."""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name, args)
+
+    def clear(self):
+        self.events = []
+
+    def write(self, path: Path):
+        logger.info(f"Writing {len(self.events)} trace events to {path}")
+        path.write_text(
+            json.dumps({"traceEvents": self.events, "displayTimeUnit": "ms"})
+        )
+
+
+tracer = Tracer()
+
+
+def traced(func: F) -> F:
+    """Wraps each call to a function in a span named after it."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def _traced(*args, **kwargs):
+        if not tracer.enabled:
+            return func(*args, **kwargs)
+        with _Span(tracer, name, {}):
+            return func(*args, **kwargs)
+
+    return _traced  # type: ignore[return-value]
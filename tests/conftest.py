@@ -6,6 +6,8 @@ from unittest.mock import MagicMock
 import pytest
 
 import slingshot_autoloader_config
+from fake_rv import FakeRV
+from slow_fs import SlowFS
 
 
 def setup_rv_mocks():
@@ -62,3 +64,29 @@ def monkeypatch_ocio_config_path(monkeypatch: pytest.MonkeyPatch):
         "SUPPORT_FILES_PATH",
         mock_support_files_path,
     )
+
+
+@pytest.fixture
+def fake_rv(monkeypatch: pytest.MonkeyPatch) -> FakeRV:
+    """Swaps the plugin's rv.commands and rv.extra_commands for a FakeRV."""
+    import slingshot_autoloader
+
+    fake = FakeRV()
+    monkeypatch.setattr(slingshot_autoloader, "commands", fake.commands)
+    # the settings are shared by every mode, start from the defaults, not whatever
+    # the mocked rv.commands.readSettings left in them
+    monkeypatch.setattr(
+        slingshot_autoloader.SlingshotAutoLoaderMode,
+        "_settings",
+        slingshot_autoloader.Settings(),
+    )
+    monkeypatch.setattr(slingshot_autoloader, "extra_commands", fake.extra_commands)
+    return fake
+
+
+@pytest.fixture
+def slow_fs(monkeypatch: pytest.MonkeyPatch) -> SlowFS:
+    """Counts filesystem calls, with no delays until the test sets them."""
+    fs = SlowFS()
+    fs.install(monkeypatch.setattr)
+    return fs
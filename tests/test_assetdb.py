@@ -0,0 +1,207 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from slingshot_autoloader_assetdb import AssetDatabaseBackend
+from slingshot_autoloader_config import AutoloaderConfig, AutoloadMainConfig
+from slingshot_autoloader_resolver import Resolver
+
+
+class AssetDatabase(ThreadingHTTPServer):
+    """A stand-in asset database, answering from a {version: entry} dict."""
+
+    def __init__(self, entries: dict[str, dict[str, str]]):
+        super().__init__(("127.0.0.1", 0), AssetDatabaseHandler)
+        self.entries = entries
+        self.requests: list[list[dict]] = []
+        self.connections = 0
+        self.fail = False
+        self.failed_requests = 0
+        # sent instead of the results, when set
+        self.response: object = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/autoload"
+
+
+class AssetDatabaseHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    server: AssetDatabase
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.server.fail:
+            self.server.failed_requests += 1
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        assert self.path == "/autoload/resolve"
+        sources = json.loads(body)["sources"]
+        self.server.requests.append(sources)
+        results = [self.server.entries.get(source["version"]) for source in sources]
+        response = self.server.response or {"results": results}
+        data = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def asset_db():
+    server = AssetDatabase(
+        {
+            f"sh0{shot}0_comp_v001": {"plate_mov_path": f"/show/sh0{shot}0_plt.mov"}
+            for shot in range(1, 5)
+        }
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def resolver(asset_db: AssetDatabase):
+    resolver = Resolver(
+        AutoloaderConfig(main=AutoloadMainConfig(asset_db_url=asset_db.url))
+    )
+    yield resolver
+    resolver.close()
+
+
+def test_batch_is_one_request(
+    asset_db: AssetDatabase, resolver: Resolver, tmp_path: Path
+):
+    sources = [tmp_path / f"sh0{shot}0_comp_v001.1001.exr" for shot in range(1, 5)]
+
+    with resolver.batch(sources):
+        results = [
+            resolver.find_file(s, "../plate/*.mov", "plate_mov_path") for s in sources
+        ]
+
+    assert results == [Path(f"/show/sh0{shot}0_plt.mov") for shot in range(1, 5)]
+    assert len(asset_db.requests) == 1
+    assert asset_db.requests[0][0] == {
+        "path": str(sources[0]),
+        "version": "sh010_comp_v001",
+    }
+
+
+def test_connections_are_kept_alive(
+    asset_db: AssetDatabase, resolver: Resolver, tmp_path: Path
+):
+    for shot in range(1, 5):
+        source = tmp_path / f"sh0{shot}0_comp_v001.1001.exr"
+        resolver.find_file(source, "../plate/*.mov", "plate_mov_path")
+
+    assert len(asset_db.requests) == 4
+    assert asset_db.connections == 1
+
+
+def test_unknown_sources_are_searched_on_disk(
+    asset_db: AssetDatabase, resolver: Resolver, tmp_path: Path
+):
+    source = tmp_path / "sh090_comp_v001.1001.exr"
+    (tmp_path / "sh090_plt.mov").touch()
+
+    assert resolver.find_file(source, "*.mov", "plate_mov_path") == (
+        tmp_path / "sh090_plt.mov"
+    )
+    # known sources without the file don't fall back to the disk
+    known = tmp_path / "sh010_comp_v001.1001.exr"
+    assert resolver.find_file(known, "*.mov", "v000") is None
+
+
+def test_database_errors_fall_back_to_disk(
+    asset_db: AssetDatabase, resolver: Resolver, tmp_path: Path
+):
+    asset_db.fail = True
+    source = tmp_path / "sh010_comp_v001.1001.exr"
+    (tmp_path / "sh010_plt.mov").touch()
+
+    assert resolver.find_file(source, "*.mov", "plate_mov_path") == (
+        tmp_path / "sh010_plt.mov"
+    )
+    assert any(isinstance(b, AssetDatabaseBackend) for b in resolver.backends)
+
+
+def test_database_errors_back_off(
+    asset_db: AssetDatabase, resolver: Resolver, tmp_path: Path
+):
+    asset_db.fail = True
+    sources = [tmp_path / f"sh0{shot}0_comp_v001.1001.exr" for shot in range(1, 5)]
+
+    for source in sources:
+        resolver.find_file(source, "*.mov", "plate_mov_path")
+
+    # one failed request, then straight to the disk instead of waiting on each source
+    assert asset_db.failed_requests == 1
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        ["not", "an", "object"],
+        {"results": []},
+        {"results": ["/show/sh010_plt.mov"]},
+        {"results": [{"plate_mov_path": ["/show/sh010_plt.mov"]}]},
+    ],
+)
+def test_malformed_responses_fall_back_to_disk(
+    asset_db: AssetDatabase, resolver: Resolver, tmp_path: Path, response
+):
+    asset_db.response = response
+    source = tmp_path / "sh010_comp_v001.1001.exr"
+    (tmp_path / "sh010_plt.mov").touch()
+
+    assert resolver.find_file(source, "*.mov", "plate_mov_path") == (
+        tmp_path / "sh010_plt.mov"
+    )
+
+
+def test_sources_are_asked_for_again_each_batch(
+    asset_db: AssetDatabase, resolver: Resolver, tmp_path: Path
+):
+    source = tmp_path / "sh050_comp_v001.1001.exr"
+    (tmp_path / "sh050_disk.mov").touch()
+
+    with resolver.batch([source]):
+        assert resolver.find_file(source, "*.mov", "plate_mov_path") == (
+            tmp_path / "sh050_disk.mov"
+        )
+
+    # published to the database after the first load
+    asset_db.entries["sh050_comp_v001"] = {"plate_mov_path": "/show/sh050_plt.mov"}
+    with resolver.batch([source]):
+        assert resolver.find_file(source, "*.mov", "plate_mov_path") == (
+            Path("/show/sh050_plt.mov")
+        )
+    assert len(asset_db.requests) == 2
+
+
+def test_timeout_is_configurable(asset_db: AssetDatabase):
+    resolver = Resolver(
+        AutoloaderConfig(
+            main=AutoloadMainConfig(asset_db_url=asset_db.url, asset_db_timeout=0.5)
+        )
+    )
+    backend = next(b for b in resolver.backends if isinstance(b, AssetDatabaseBackend))
+
+    assert backend.pool.timeout == 0.5
+    resolver.close()
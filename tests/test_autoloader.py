@@ -1,9 +1,14 @@
 from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 
+import slingshot_autoloader
 from slingshot_autoloader import SlingshotAutoLoaderMode
 from slingshot_autoloader_config import AutoloaderConfig, AutoloadMainConfig
+from slingshot_autoloader_rules import PendingMediaRep
+from slingshot_autoloader_session import PREBAKED_PROPERTY
+from slingshot_autoloader_trace import tracer
 
 pytestmark = pytest.mark.usefixtures("monkeypatch_ocio_config_path")
 
@@ -78,3 +83,167 @@ def test_find_file_happy_path(
 
     # Assert
     assert result == (tmp_path / expected_path if expected_path else None)
+
+
+def test_on_source_group_complete_skips_prebaked_groups(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    autoloader = SlingshotAutoLoaderMode()
+    event = MagicMock()
+    event.contents.return_value = "sourceGroup000000;;new"
+    property_exists = MagicMock(return_value=True)
+    monkeypatch.setattr(
+        slingshot_autoloader.commands, "propertyExists", property_exists
+    )
+    monkeypatch.setattr(autoloader, "autoload_media", MagicMock())
+    monkeypatch.setattr(autoloader, "autoload_color", MagicMock())
+
+    autoloader.on_source_group_complete(event)
+
+    property_exists.assert_called_once_with(f"sourceGroup000000.{PREBAKED_PROPERTY}")
+    autoloader.autoload_media.assert_not_called()
+    autoloader.autoload_color.assert_not_called()
+    event.reject.assert_called_once()
+
+
+def test_on_source_group_complete_is_traced(monkeypatch: pytest.MonkeyPatch):
+    autoloader = SlingshotAutoLoaderMode()
+    monkeypatch.setattr(autoloader._settings, "batch_source_groups", False)
+    monkeypatch.setattr(tracer, "enabled", True)
+    monkeypatch.setattr(tracer, "events", [])
+    monkeypatch.setattr(
+        slingshot_autoloader.commands, "propertyExists", MagicMock(return_value=False)
+    )
+    monkeypatch.setattr(autoloader, "autoload_media", MagicMock())
+    monkeypatch.setattr(autoloader, "autoload_color", MagicMock())
+    event = MagicMock()
+    event.contents.return_value = "sourceGroup000001;;new"
+
+    autoloader.on_source_group_complete(event)
+
+    assert [(e["name"], e["args"]) for e in tracer.events] == [
+        ("autoload_group", {"group": "sourceGroup000001"}),
+        ("SlingshotAutoLoaderMode.on_source_group_complete", {}),
+    ]
+
+
+def test_autoload_sources(monkeypatch: pytest.MonkeyPatch):
+    autoloader = SlingshotAutoLoaderMode()
+    commands = MagicMock()
+    commands.nodes.return_value = ["sourceGroup000000", "sourceGroup000001"]
+    commands.addSourceVerbose.side_effect = lambda paths: f"{paths[0]}_source"
+    commands.nodeGroup.side_effect = lambda node: f"group:{node}"
+    monkeypatch.setattr(slingshot_autoloader, "commands", commands)
+    monkeypatch.setattr(autoloader, "autoload_media", MagicMock(return_value=None))
+    monkeypatch.setattr(autoloader, "autoload_color", MagicMock())
+    monkeypatch.setattr(autoloader, "_flush_pending_media_reps", MagicMock())
+
+    autoloader.autoload_sources(
+        ["sourceGroup000001", "/shots/sh010_comp_v003.mov", "sourceGroup000000"]
+    )
+
+    processed = ["sourceGroup000001", "group:/shots/sh010_comp_v003.mov_source"]
+    processed.append("sourceGroup000000")
+    assert [c.args[0] for c in autoloader.autoload_color.call_args_list] == processed
+    commands.addSourceBegin.assert_called_once()
+    commands.addSourceEnd.assert_called_once()
+    assert autoloader._scripted_groups == {"group:/shots/sh010_comp_v003.mov_source"}
+    # the new media is still loading, pending reps are added after progressive loading
+    autoloader._flush_pending_media_reps.assert_not_called()
+
+    autoloader.autoload_sources(["sourceGroup000000"])
+    autoloader._flush_pending_media_reps.assert_called_once()
+
+
+def test_batch_source_groups(monkeypatch: pytest.MonkeyPatch):
+    autoloader = SlingshotAutoLoaderMode()
+    monkeypatch.setattr(autoloader._settings, "batch_source_groups", True)
+    monkeypatch.setattr(
+        slingshot_autoloader.commands, "propertyExists", MagicMock(return_value=False)
+    )
+    monkeypatch.setattr(autoloader, "autoload_media", MagicMock(return_value=None))
+    monkeypatch.setattr(autoloader, "autoload_color", MagicMock())
+    monkeypatch.setattr(autoloader, "_flush_pending_media_reps", MagicMock())
+
+    for group in ["sourceGroup000002", "sourceGroup000000", "sourceGroup000002"]:
+        event = MagicMock()
+        event.contents.return_value = f"{group};;new"
+        autoloader.on_source_group_complete(event)
+
+    autoloader.autoload_media.assert_not_called()
+
+    autoloader.after_progressive_loading(MagicMock())
+
+    assert [c.args[0] for c in autoloader.autoload_media.call_args_list] == [
+        "sourceGroup000002",
+        "sourceGroup000000",
+    ]
+    autoloader._flush_pending_media_reps.assert_called_once()
+    assert autoloader._pending_groups == {}
+
+
+def test_pending_work_is_tracked_per_group(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    source_path = tmp_path / "comp" / "sh010_comp_v001.mov"
+    source_path.parent.mkdir()
+    source_path.touch()
+    (tmp_path / "comp" / "sh010_comp_v000.mov").touch()
+
+    autoloader = SlingshotAutoLoaderMode()
+    autoloader.config = AutoloaderConfig(other={"v000": "*v000.mov"})
+    monkeypatch.setattr(autoloader._settings, "defer_media_reps", False)
+    commands = MagicMock()
+    commands.sourceMediaRepSwitchNode.return_value = ""
+    commands.sourceMediaReps.return_value = ["Source"]
+    monkeypatch.setattr(slingshot_autoloader, "commands", commands)
+
+    # two placeholder groups that get a "Source" media rep and are then deleted
+    autoloader._add_default_media_rep("sourceGroup000000", "source0", source_path)
+    autoloader._add_default_media_rep("sourceGroup000001", "source1", source_path)
+    # the same source completing twice only queues its v000 once
+    for _ in range(2):
+        autoloader._enqueue_plate_autoloads(
+            "sourceGroup000002", "source2", source_path, ["Source"]
+        )
+
+    assert list(autoloader._pending_work["sourceGroup000002"].media_reps) == [
+        ("source2", "v000")
+    ]
+
+    autoloader._flush_pending_media_reps()
+
+    # "Source" x2 in _add_default_media_rep, then the v000 in the flush
+    assert commands.addSourceMediaRep.call_count == 3
+    assert [c.args for c in commands.deleteNode.call_args_list] == [
+        ("sourceGroup000000",),
+        ("sourceGroup000001",),
+    ]
+    assert autoloader._pending_work == {}
+
+
+def test_flush_skips_existing_media_reps(monkeypatch: pytest.MonkeyPatch):
+    autoloader = SlingshotAutoLoaderMode()
+    monkeypatch.setattr(autoloader._settings, "defer_media_reps", False)
+    commands = MagicMock()
+    commands.sourceMediaRepSwitchNode.return_value = "switchGroup000000_switch"
+    commands.sourceMediaReps.return_value = ["Source", "Plate"]
+    monkeypatch.setattr(slingshot_autoloader, "commands", commands)
+
+    # two reps of the same switch both queued a Plate Frames and a Plate
+    for group, node in [
+        ("sourceGroup000000", "source0"),
+        ("sourceGroup000001", "source1"),
+    ]:
+        for name in ["Plate", "Plate Frames"]:
+            autoloader._pending(group).media_reps[(node, name)] = PendingMediaRep(
+                node, name, Path(f"/plates/{name}.exr")
+            )
+
+    autoloader._flush_pending_media_reps()
+
+    assert [c.args[:2] for c in commands.addSourceMediaRep.call_args_list] == [
+        ("source0", "Plate Frames")
+    ]
+    # the index is built once per switch node
+    commands.sourceMediaReps.assert_called_once_with("source0")
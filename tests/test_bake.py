@@ -0,0 +1,122 @@
+import os
+from pathlib import Path
+
+import PyOpenColorIO as OCIO
+import pytest
+
+import slingshot_autoloader_bake
+from slingshot_autoloader_bake import bake_look, look_transform
+from slingshot_autoloader_config import (
+    AutoloadColorConfig,
+    AutoloaderConfig,
+    get_ocio_config,
+)
+from slingshot_autoloader_rules import look_setups
+
+pytestmark = pytest.mark.usefixtures("monkeypatch_ocio_config_path")
+
+# a 2x2x2 cube that swaps red and blue
+LUT = """LUT_3D_SIZE 2
+0 0 0
+0 0 1
+0 1 0
+0 1 1
+1 0 0
+1 0 1
+1 1 0
+1 1 1
+"""
+
+
+@pytest.fixture
+def color(tmp_path: Path) -> tuple[OCIO.Config, AutoloadColorConfig, Path]:
+    lut_path = tmp_path / "sh010.cube"
+    lut_path.write_text(LUT)
+    config = AutoloaderConfig(
+        color=AutoloadColorConfig(look_lut="*.cube", look_mode="baked")
+    )
+    return get_ocio_config(config), config.color, lut_path
+
+
+def test_baked_look_matches_look_pipeline(color, tmp_path: Path):
+    ocio_config, color_config, lut_path = color
+
+    baked_path = bake_look(ocio_config, color_config, None, lut_path, tmp_path)
+
+    pipeline = ocio_config.getProcessor(look_transform(color_config, None, lut_path))
+    baked = ocio_config.getProcessor(
+        OCIO.FileTransform(src=str(baked_path), interpolation=OCIO.INTERP_LINEAR)
+    )
+    for value in [0.01, 0.18, 1.0, 4.0]:
+        pixel = [value, value * 0.5, value * 0.2]
+        expected = pipeline.getDefaultCPUProcessor().applyRGB(pixel)
+        assert baked.getDefaultCPUProcessor().applyRGB(pixel) == pytest.approx(
+            expected, rel=0.02, abs=1e-3
+        )
+
+
+def test_bakes_are_cached(color, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    ocio_config, color_config, lut_path = color
+    bakes = []
+    bake_config = slingshot_autoloader_bake._bake_config
+    monkeypatch.setattr(
+        slingshot_autoloader_bake,
+        "_bake_config",
+        lambda *args: bakes.append(args) or bake_config(*args),
+    )
+
+    first = bake_look(ocio_config, color_config, None, lut_path, tmp_path)
+    second = bake_look(ocio_config, color_config, None, lut_path, tmp_path)
+
+    assert first == second
+    assert len(bakes) == 1
+
+    # a republished LUT gets a new bake
+    stat = lut_path.stat()
+    os.utime(lut_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert bake_look(ocio_config, color_config, None, lut_path, tmp_path) != first
+    assert len(bakes) == 2
+
+
+def test_look_setups_baked_mode_uses_one_node(
+    color, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    ocio_config, color_config, lut_path = color
+    OCIO.SetCurrentConfig(ocio_config)
+    monkeypatch.setattr(slingshot_autoloader_bake, "BAKE_CACHE_PATH", tmp_path)
+    config = AutoloaderConfig(color=color_config)
+
+    setups = look_setups(
+        config, tmp_path / "sh010_comp_v001.exr", lambda *_args: lut_path
+    )
+
+    assert len(setups) == 1 and setups[0]
+    assert setups[0].properties["ocio_look.look"] == "slingshot_lut"
+    assert Path(setups[0].context["LUT_PATH"]).suffix == ".csp"
+
+
+def test_look_setups_falls_back_to_nodes_when_baking_fails(
+    color, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    _ocio_config, color_config, lut_path = color
+    config = AutoloaderConfig(color=color_config)
+    lookups = []
+
+    def bake_look(*args):
+        raise OCIO.Exception("can't bake")
+
+    def find_file(_source, _search, key=None):
+        lookups.append(key)
+        return lut_path
+
+    monkeypatch.setattr("slingshot_autoloader_rules.bake_look", bake_look)
+
+    setups = look_setups(config, tmp_path / "sh010_comp_v001.exr", find_file)
+
+    assert [s and s.context.get("LUT_PATH") for s in setups] == [
+        None,
+        str(lut_path),
+        None,
+    ]
+    # the LUT found for the bake is reused, not looked up again
+    assert lookups == ["look_lut"]
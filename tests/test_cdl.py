@@ -0,0 +1,126 @@
+import os
+from pathlib import Path
+
+import PyOpenColorIO as OCIO
+import pytest
+
+from slingshot_autoloader_cdl import (
+    ColorCorrectionCache,
+    color_corrections,
+    parse_color_corrections,
+)
+from slingshot_autoloader_config import (
+    AutoloadColorConfig,
+    AutoloaderConfig,
+    AutoloadMainConfig,
+)
+from slingshot_autoloader_rules import look_cdl_setup
+
+CCC = """<?xml version="1.0" encoding="UTF-8"?>
+<ColorCorrectionCollection xmlns="urn:ASC:CDL:v1.01">
+    <ColorCorrection id="sh010">
+        <SOPNode>
+            <Slope>1.1 1.0 0.9</Slope>
+            <Offset>0.01 0 -0.01</Offset>
+            <Power>1 1 1</Power>
+        </SOPNode>
+        <SATNode>
+            <Saturation>0.8</Saturation>
+        </SATNode>
+    </ColorCorrection>
+    <ColorCorrection id="sh020">
+        <SOPNode>
+            <Slope>2 2 2</Slope>
+        </SOPNode>
+    </ColorCorrection>
+</ColorCorrectionCollection>
+"""
+
+
+@pytest.fixture
+def ccc_path(tmp_path: Path) -> Path:
+    path = tmp_path / "show.ccc"
+    path.write_text(CCC)
+    return path
+
+
+def test_parse_color_corrections(ccc_path: Path):
+    corrections = parse_color_corrections(ccc_path)
+
+    assert list(corrections) == ["sh010", "sh020"]
+    assert corrections["sh010"].slope == "1.1 1.0 0.9"
+    assert corrections["sh010"].saturation == "0.8"
+    # missing values are identity
+    assert corrections["sh020"].offset == "0 0 0"
+
+
+def test_color_correction_cache_rereads_changed_files(
+    ccc_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    cache = ColorCorrectionCache(tmp_path / "cache")
+    parsed = []
+    monkeypatch.setattr(
+        "slingshot_autoloader_cdl.parse_color_corrections",
+        lambda path: parsed.append(path) or parse_color_corrections(path),
+    )
+
+    cache.read(ccc_path)
+    cache.read(ccc_path)
+    assert parsed == [ccc_path]
+
+    stat = ccc_path.stat()
+    os.utime(ccc_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    cache.read(ccc_path)
+    assert parsed == [ccc_path, ccc_path]
+
+
+def test_extracted_cc_loads_in_ocio(ccc_path: Path, tmp_path: Path):
+    cache = ColorCorrectionCache(tmp_path / "cache")
+
+    cc_path = cache.extract(ccc_path, "sh010")
+
+    assert cc_path and cc_path.suffix == ".cc"
+    assert cache.extract(ccc_path, "sh010") == cc_path
+    assert cache.extract(ccc_path, "sh999") is None
+
+    processor = OCIO.Config.CreateRaw().getProcessor(
+        OCIO.FileTransform(src=str(cc_path), cccId="0")
+    )
+    pixel = processor.getDefaultCPUProcessor().applyRGB([0.5, 0.5, 0.5])
+    assert pixel[0] > pixel[2]
+
+
+def test_extract_fails_without_a_writable_cache(
+    ccc_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    cache = ColorCorrectionCache(tmp_path / "cache")
+
+    def replace(src, dst):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, "replace", replace)
+
+    assert cache.extract(ccc_path, "sh010") is None
+    # and nothing is left behind
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+def test_look_cdl_setup_uses_shot_correction(
+    ccc_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(color_corrections, "cache_path", tmp_path / "cache")
+    source_path = ccc_path.parent / "sh010_comp_v003.1001.exr"
+    source_path.touch()
+    config = AutoloaderConfig(
+        main=AutoloadMainConfig(version_regex=r"(?P<shot>sh\d+)_.*_(?P<version>v\d+)"),
+        color=AutoloadColorConfig(look_cdl="*.ccc", look_cdl_id="${shot}"),
+    )
+
+    setup = look_cdl_setup(
+        config, source_path, lambda _source, _search, _key=None: ccc_path
+    )
+
+    assert setup
+    cc_path = Path(setup.context["CDL_PATH"])
+    assert cc_path.suffix == ".cc"
+    assert 'id="sh010"' in cc_path.read_text()
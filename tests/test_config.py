@@ -7,6 +7,7 @@ from unittest.mock import Mock, patch
 import pytest
 
 from slingshot_autoloader_config import (
+    OCIO_CACHE_SUFFIX,
     AutoloadColorConfig,
     AutoloaderConfig,
     AutoloadMainConfig,
@@ -15,6 +16,10 @@ from slingshot_autoloader_config import (
     _read_config,
     get_ocio_config,
     load_or_create_config,
+    prepare_ocio,
+    read_config,
+    read_ocio_cache,
+    write_ocio_cache,
 )
 
 
@@ -397,3 +402,54 @@ def test_get_ocio_config_file_not_found(mock_exists: Mock):
     assert str(exc_info.value) == (
         f"OCIO config file not found at path: {ocio_path.as_posix()}"
     )
+
+
+@pytest.fixture
+def ocio_config_copy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    ocio_config = tmp_path / OCIO_CONFIG_PATH.name
+    ocio_config.write_bytes(OCIO_CONFIG_PATH.read_bytes())
+    monkeypatch.setenv("OCIO", str(ocio_config))
+    return ocio_config
+
+
+def test_prepare_ocio_uses_cache(
+    ocio_config_copy: Path, monkeypatch: pytest.MonkeyPatch
+):
+    write_ocio_cache(
+        ocio_config_copy,
+        ocio_config_copy.with_name(ocio_config_copy.name + OCIO_CACHE_SUFFIX),
+    )
+    autoloader_config = AutoloaderConfig(
+        color=AutoloadColorConfig(look_lut_out_colorspace="g24_rec709")
+    )
+    monkeypatch.setattr(
+        "slingshot_autoloader_config.get_ocio_config", Mock(side_effect=AssertionError)
+    )
+
+    prepare_ocio(autoloader_config)
+
+    # resolved from the cache, the config wasn't parsed
+    assert autoloader_config.color.look_lut_out_colorspace == (
+        "Gamma 2.4 Encoded Rec.709"
+    )
+
+
+def test_stale_ocio_cache_is_ignored(ocio_config_copy: Path):
+    cache = ocio_config_copy.with_name(ocio_config_copy.name + OCIO_CACHE_SUFFIX)
+    write_ocio_cache(ocio_config_copy, cache)
+    assert read_ocio_cache(ocio_config_copy)
+
+    ocio_config_copy.write_text(ocio_config_copy.read_text() + "\n")
+
+    assert read_ocio_cache(ocio_config_copy) is None
+
+
+def test_invalid_look_mode_warns(tmp_path: Path, caplog: pytest.LogCaptureFixture):
+    config_path = tmp_path / "config.cfg"
+    config_path.write_text("[color]\nlook_mode = combind\n")
+
+    config = read_config(config_path)
+
+    assert config.color.look_mode == "nodes"
+    assert "combind" in caplog.text
+    assert "nodes, baked, combined" in caplog.text
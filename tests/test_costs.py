@@ -0,0 +1,65 @@
+import array
+from pathlib import Path
+
+import pytest
+
+from slingshot_autoloader_config import (
+    AutoloadColorConfig,
+    AutoloaderConfig,
+    get_ocio_config,
+)
+from slingshot_autoloader_costs import color_costs
+
+# a 2x2x2 cube that swaps red and blue
+LUT = """LUT_3D_SIZE 2
+0 0 0
+0 0 1
+0 1 0
+0 1 1
+1 0 0
+1 0 1
+1 1 0
+1 1 1
+"""
+
+
+@pytest.fixture
+def config(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, monkeypatch_ocio_config_path
+) -> AutoloaderConfig:
+    monkeypatch.delenv("OCIO", raising=False)
+    (tmp_path / "sh010.cube").write_text(LUT)
+    return AutoloaderConfig(color=AutoloadColorConfig(look_lut="*.cube"))
+
+
+def test_color_costs_compares_nodes_with_combined(
+    config: AutoloaderConfig, tmp_path: Path
+):
+    ocio_config = get_ocio_config(config)
+    sources = [tmp_path / f"sh010_comp_v00{v}.1001.exr" for v in (1, 2)]
+
+    report = color_costs(config, ocio_config, sources, image_size=(4, 4))
+
+    assert len(report.sources) == 2
+    # linearize, lin to working space, LUT, back to lin
+    assert len(report.sources[0].nodes.processors) == 4
+    assert len(report.sources[0].combined.processors) == 1
+    # the second source needs the same processors as the first
+    assert report.repeated_processors("nodes") == (4, 8)
+    assert report.repeated_processors("combined") == (1, 2)
+    assert "combined: 2 processors, 1 repeated" in report.format()
+
+    nodes = array.array("f", [0.1, 0.2, 0.3] * 4)
+    combined = array.array("f", nodes)
+    for processor in report.sources[0].nodes.processors:
+        processor.getDefaultCPUProcessor().applyRGB(nodes)
+    report.sources[0].combined.processors[0].getDefaultCPUProcessor().applyRGB(combined)
+    assert list(combined) == pytest.approx(list(nodes), abs=1e-5)
+
+
+def test_color_costs_skips_movies(config: AutoloaderConfig, tmp_path: Path):
+    report = color_costs(
+        config, get_ocio_config(config), [tmp_path / "sh010_comp_v001.mov"]
+    )
+
+    assert report.sources == []
@@ -0,0 +1,277 @@
+import os
+import time
+from unittest.mock import MagicMock
+from pathlib import Path
+
+import PyOpenColorIO as OCIO
+import pytest
+
+from fake_rv import FakeRV
+from slow_fs import SlowFS
+import slingshot_autoloader_looks
+from slingshot_autoloader import SlingshotAutoLoaderMode
+from slingshot_autoloader_config import (
+    AutoloadColorConfig,
+    AutoloaderConfig,
+    AutoloadPlatesConfig,
+)
+from slingshot_autoloader_looks import combined_look_name
+from slingshot_autoloader_stats import stats
+
+pytestmark = pytest.mark.usefixtures("monkeypatch_ocio_config_path")
+
+
+@pytest.fixture
+def shots(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    monkeypatch.delenv("OCIO", raising=False)
+    sources = []
+    for shot in range(10, 110, 10):
+        comp = tmp_path / f"sh{shot:03d}" / "comp"
+        comp.mkdir(parents=True)
+        (comp / f"sh{shot:03d}_comp_v001.1001.exr").touch()
+        (comp / f"sh{shot:03d}_comp_v000.mov").touch()
+        (comp / "look.cube").write_text("LUT_3D_SIZE 2\n" + "0 0 0\n" * 8)
+        plate = tmp_path / f"sh{shot:03d}" / "plate"
+        plate.mkdir()
+        (plate / f"sh{shot:03d}_plt.mov").touch()
+        sources.append(comp / f"sh{shot:03d}_comp_v001.1001.exr")
+    return sources
+
+
+@pytest.fixture
+def autoloader(fake_rv: FakeRV) -> SlingshotAutoLoaderMode:
+    autoloader = SlingshotAutoLoaderMode()
+    autoloader.config = AutoloaderConfig(
+        plates=AutoloadPlatesConfig(plate_mov_path="../plate/*.mov"),
+        other={"v000": "*v000.mov"},
+        color=AutoloadColorConfig(look_lut="*.cube"),
+    )
+    return autoloader
+
+
+def test_autoload_adds_media_reps_and_color(
+    fake_rv: FakeRV, autoloader: SlingshotAutoLoaderMode, shots: list[Path]
+):
+    group = fake_rv.add_source(str(shots[0]))
+
+    autoloader.autoload_sources([group])
+
+    # the original group was replaced by a switch with all the media reps
+    assert group not in fake_rv.graph
+    (switch_node,) = fake_rv.switches
+    assert list(fake_rv.switches[switch_node]) == ["Source", "Plate", "v000"]
+
+    source_group = fake_rv.commands.nodeGroup(fake_rv.switches[switch_node]["Source"])
+    look_pipe = f"{source_group}_lookPipeline"
+    assert fake_rv.properties[f"{look_pipe}.pipeline.nodes"] == ["OCIOLook"] * 3
+    assert fake_rv.properties[f"{look_pipe}_1.ocio_context.LUT_PATH"] == [
+        str(shots[0].parent / "look.cube")
+    ]
+
+
+def test_rv_commands_per_exr_source(
+    fake_rv: FakeRV, autoloader: SlingshotAutoLoaderMode, shots: list[Path]
+):
+    groups = [fake_rv.add_source(str(shot)) for shot in shots]
+    fake_rv.reset_calls()
+
+    autoloader.autoload_sources(groups)
+
+    # a budget, not an exact count, so unrelated changes don't break this, but
+    # a new round trip per source or per media rep will
+    assert len(fake_rv.calls) / len(shots) <= 70
+    counts = fake_rv.call_counts()
+    assert counts["nodes"] == 1
+    # the loaded group, its new "Source" group, and once per switch in the flush
+    assert counts["sourceMediaReps"] == 3 * len(shots)
+    assert counts["addSourceMediaRep"] == 3 * len(shots)
+
+
+def test_latency_injection(
+    fake_rv: FakeRV, autoloader: SlingshotAutoLoaderMode, shots: list[Path]
+):
+    groups = [fake_rv.add_source(str(shot)) for shot in shots[:2]]
+    fake_rv.reset_calls()
+    fake_rv.latency = 0.001
+
+    start = time.perf_counter()
+    autoloader.autoload_sources(groups)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed >= len(fake_rv.calls) * fake_rv.latency
+
+
+def test_sources_on_screen_are_autoloaded_first(
+    fake_rv: FakeRV, autoloader: SlingshotAutoLoaderMode, shots: list[Path]
+):
+    groups = [fake_rv.add_source(str(shot)) for shot in shots]
+    fake_rv.current_frame = 5
+    fake_rv.reset_calls()
+
+    autoloader.autoload_sources(groups)
+
+    # looked up in that order
+    resolved = [
+        Path(source).parent.parent.name for source in autoloader.registry.records
+    ]
+    assert resolved[:3] == ["sh050", "sh040", "sh060"]
+    # and added in that order
+    added = [
+        Path(args[2][0]).name
+        for name, args in fake_rv.calls
+        if name == "addSourceMediaRep" and args[1] == "Plate"
+    ]
+    assert added[:3] == ["sh050_plt.mov", "sh040_plt.mov", "sh060_plt.mov"]
+    assert len(added) == len(shots)
+
+
+def test_media_reps_are_deferred_until_viewed(
+    fake_rv: FakeRV,
+    autoloader: SlingshotAutoLoaderMode,
+    shots: list[Path],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(autoloader._settings, "defer_media_reps", True)
+    groups = [fake_rv.add_source(str(shot)) for shot in shots]
+    fake_rv.current_frame = 5
+
+    def shots_with_plates() -> list[str]:
+        return sorted(
+            Path(fake_rv.properties[f"{reps['Plate']}.media.movie"][0]).stem[:5]
+            for reps in fake_rv.switches.values()
+            if "Plate" in reps
+        )
+
+    autoloader.autoload_sources(groups)
+
+    # on screen, and either side of it
+    assert shots_with_plates() == ["sh040", "sh050", "sh060"]
+
+    fake_rv.current_frame = 9
+    autoloader.on_frame_changed(MagicMock())
+
+    assert shots_with_plates() == ["sh040", "sh050", "sh060", "sh080", "sh090", "sh100"]
+
+    # the session is saved with every rep
+    autoloader.before_session_write(MagicMock())
+
+    assert len(shots_with_plates()) == len(shots)
+
+
+def test_reloading_sources_uses_the_registry(
+    fake_rv: FakeRV,
+    autoloader: SlingshotAutoLoaderMode,
+    shots: list[Path],
+    slow_fs: SlowFS,
+):
+    autoloader.autoload_sources([fake_rv.add_source(str(shot)) for shot in shots])
+    slow_fs.reset()
+
+    # the same media loaded again
+    autoloader.autoload_sources([fake_rv.add_source(str(shot)) for shot in shots])
+
+    assert slow_fs.counts["scandir"] == slow_fs.counts["open"] == 0
+    assert len(autoloader.registry.records) == len(shots)
+    assert autoloader.registry.with_misses() == []
+
+
+def test_reloading_sources_finds_files_published_since(
+    fake_rv: FakeRV, autoloader: SlingshotAutoLoaderMode, shots: list[Path]
+):
+    v000 = shots[0].parent / "sh010_comp_v000.mov"
+    v000.unlink()
+    autoloader.autoload_sources([fake_rv.add_source(str(shots[0]))])
+    assert autoloader.registry.lookup(shots[0], "v000") is None
+
+    # published after the first load
+    v000.touch()
+    autoloader.autoload_sources([fake_rv.add_source(str(shots[0]))])
+
+    assert autoloader.registry.lookup(shots[0], "v000") == v000
+    assert autoloader.registry.with_misses() == []
+    # added to the reloaded source, and Plate isn't counted twice
+    assert sum("v000" in reps for reps in fake_rv.switches.values()) == 1
+    assert autoloader.registry.summary()[1] == "Media reps: 2"
+
+
+def test_shared_plate_frames_are_probed_once(
+    fake_rv: FakeRV, autoloader: SlingshotAutoLoaderMode, tmp_path: Path
+):
+    comp = tmp_path / "sh010" / "comp"
+    comp.mkdir(parents=True)
+    versions = [comp / f"sh010_comp_v00{v}.mov" for v in (1, 2)]
+    for version in versions:
+        version.touch()
+    plate = tmp_path / "sh010" / "plate"
+    plate.mkdir()
+    for frame in range(985, 1101):
+        (plate / f"sh010_plt.{frame:04d}.exr").touch()
+    autoloader.config = AutoloaderConfig(
+        plates=AutoloadPlatesConfig(plate_frames_path="../plate/*.exr")
+    )
+
+    autoloader.autoload_sources([fake_rv.add_source(str(versions[0]))])
+    probes = stats.counters["frame_probes"]
+    autoloader.autoload_sources([fake_rv.add_source(str(versions[1]))])
+
+    assert probes > 0
+    assert stats.counters["frame_probes"] == probes
+    assert autoloader.registry.records[str(versions[1])].media_reps == (
+        ("Plate Frames", str(plate / "sh010_plt.985-1100#.exr")),
+    )
+
+
+def test_color_is_deferred_until_viewed(
+    fake_rv: FakeRV,
+    autoloader: SlingshotAutoLoaderMode,
+    shots: list[Path],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(autoloader._settings, "defer_color", True)
+    groups = [fake_rv.add_source(str(shot)) for shot in shots]
+    fake_rv.current_frame = 5
+
+    def shots_with_looks() -> list[str]:
+        return sorted(
+            Path(
+                fake_rv.properties[f"{prop.split('_')[0]}_source.media.movie"][0]
+            ).parent.parent.name
+            for prop, nodes in fake_rv.properties.items()
+            if prop.endswith("_lookPipeline.pipeline.nodes") and "OCIOLook" in nodes
+        )
+
+    autoloader.autoload_sources(groups)
+
+    # on screen, and either side of it
+    assert shots_with_looks() == ["sh040", "sh050", "sh060"]
+
+    fake_rv.current_frame = 9
+    event = MagicMock()
+    autoloader.on_frame_changed(event)
+    fake_rv.reset_calls()
+    autoloader.on_frame_changed(event)
+
+    assert shots_with_looks() == ["sh040", "sh050", "sh060", "sh080", "sh090", "sh100"]
+    # still on the same source, nothing to build
+    assert set(fake_rv.call_counts()) == {"frame", "sourcesAtFrame"}
+
+
+def test_loading_a_config_writes_a_new_session_config(
+    fake_rv: FakeRV, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.delenv("OCIO", raising=False)
+    monkeypatch.setattr(slingshot_autoloader_looks, "SESSION_CONFIG_PATH", tmp_path)
+    autoloader = SlingshotAutoLoaderMode()
+    old_color = AutoloadColorConfig(look_mode="combined")
+    autoloader.config = AutoloaderConfig(color=old_color)
+    old_session_path = os.environ["OCIO"]
+
+    # e.g. Load Config... from the menu
+    new_color = AutoloadColorConfig(look_mode="combined", working_space="ACEScct")
+    autoloader.config = AutoloaderConfig(color=new_color)
+
+    assert os.environ["OCIO"] != old_session_path
+    session = OCIO.Config.CreateFromFile(os.environ["OCIO"])
+    assert session.getLook(combined_look_name(new_color, cdl=False, lut=True))
+    # made from RV's config again, not on top of the old session config
+    assert not session.getLook(combined_look_name(old_color, cdl=False, lut=True))
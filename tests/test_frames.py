@@ -0,0 +1,99 @@
+from pathlib import Path
+
+import pytest
+
+from slingshot_autoloader_config import AutoloaderConfig, AutoloadPlatesConfig
+from slingshot_autoloader_frames import FrameSequence, _last_frame, find_frame_range
+from slingshot_autoloader_resolver import Resolver
+from slingshot_autoloader_rules import find_media_reps, sequence_path
+from slow_fs import SlowFS
+
+
+def make_frames(directory: Path, frames, name="sh010_plt.{:04d}.exr") -> list[Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = [directory / name.format(frame) for frame in frames]
+    for path in paths:
+        path.touch()
+    return paths
+
+
+@pytest.mark.parametrize("start", [985, 1001, 1100])
+def test_finds_range_from_any_frame(tmp_path: Path, start: int):
+    make_frames(tmp_path, range(985, 1101))
+
+    sequence = find_frame_range(tmp_path / f"sh010_plt.{start:04d}.exr")
+
+    assert sequence == FrameSequence(tmp_path, "sh010_plt.", ".exr", 4, 985, 1100)
+    assert sequence.rv_path() == tmp_path / "sh010_plt.985-1100#.exr"
+    assert sequence.frame_path(1001) == tmp_path / "sh010_plt.1001.exr"
+
+
+@pytest.mark.parametrize("start", [1001, 5000, 11000])
+def test_probing_is_logarithmic(start: int):
+    frames = range(1001, 11001)
+    probes = []
+
+    def exists(frame: int) -> bool:
+        probes.append(frame)
+        return frame in frames
+
+    assert _last_frame(exists, start, -1) == 1001
+    assert _last_frame(exists, start, 1) == 11000
+    assert len(probes) < 60
+
+
+def test_finding_a_range_only_stats(tmp_path: Path, slow_fs: SlowFS):
+    make_frames(tmp_path, range(1001, 1101))
+    slow_fs.reset()
+
+    sequence = find_frame_range(tmp_path / "sh010_plt.1001.exr")
+
+    assert (sequence.first, sequence.last) == (1001, 1100)
+    assert slow_fs.counts["scandir"] == 0
+    assert slow_fs.counts["stat"] < 30
+
+
+def test_gaps_fall_back_to_listing(tmp_path: Path, slow_fs: SlowFS):
+    # missing 1003 stops the search at 1002
+    frames = [*range(1001, 1003), *range(1004, 1101)]
+    make_frames(tmp_path, frames)
+    slow_fs.reset()
+
+    sequence = find_frame_range(tmp_path / "sh010_plt.1001.exr")
+
+    assert (sequence.first, sequence.last) == (1001, 1100)
+    assert slow_fs.counts["scandir"] == 1
+
+
+def test_padding_comes_from_the_frame(tmp_path: Path):
+    make_frames(tmp_path, range(1, 11), name="plate.{:06d}.dpx")
+
+    sequence = find_frame_range(tmp_path / "plate.000001.dpx")
+
+    assert sequence.padding == 6
+    assert sequence.rv_path() == tmp_path / "plate.1-10@@@@@@.dpx"
+    assert find_frame_range(tmp_path / "plate.dpx") is None
+
+
+def test_plate_frames_media_rep_is_a_sequence(tmp_path: Path):
+    source = tmp_path / "comp" / "sh010_comp_v001.1001.exr"
+    make_frames(source.parent, [1001], name="sh010_comp_v001.{:04d}.exr")
+    make_frames(tmp_path / "plate", range(985, 1101))
+    config = AutoloaderConfig(
+        plates=AutoloadPlatesConfig(plate_frames_path="../plate/*.exr")
+    )
+
+    media_reps = find_media_reps(config, source, [], Resolver(config).find_file)
+
+    assert media_reps == [
+        ("Plate Frames", tmp_path / "plate" / "sh010_plt.985-1100#.exr")
+    ]
+
+
+def test_version_numbers_are_not_frames(tmp_path: Path):
+    versions = make_frames(tmp_path, [2, 3, 4], name="sh010_comp_v{:03d}.exr")
+
+    assert find_frame_range(versions[1]) is None
+    assert sequence_path(versions[1]) == versions[1]
+    # nor is a short number after a separator
+    assert find_frame_range(tmp_path / "sh010_comp_003.exr") is None
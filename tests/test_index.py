@@ -0,0 +1,126 @@
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from slingshot_autoloader_config import AutoloaderConfig, AutoloadMainConfig
+from slingshot_autoloader_index import (
+    INOTIFY,
+    IndexServer,
+    Inotify,
+    ShotIndex,
+)
+from slingshot_autoloader_resolver import Resolver
+from slow_fs import SlowFS
+
+pytestmark = pytest.mark.skipif(not INOTIFY, reason="the shot index needs inotify")
+
+
+@pytest.fixture
+def show(tmp_path: Path) -> Path:
+    for shot in ("sh010", "sh020"):
+        (tmp_path / "show" / shot / "comp").mkdir(parents=True)
+        (tmp_path / "show" / shot / "plate").mkdir()
+        (tmp_path / "show" / shot / "plate" / f"{shot}_plt.mov").touch()
+    return tmp_path / "show"
+
+
+@pytest.fixture
+def index(show: Path):
+    index = ShotIndex([str(show)], Inotify())
+    index.scan()
+    yield index
+    index.inotify.close()
+
+
+@pytest.fixture
+def socket_path(index: ShotIndex, tmp_path: Path):
+    socket_path = str(tmp_path / "index.sock")
+    server = IndexServer(socket_path, index)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
+
+
+def _apply_events(index: ShotIndex):
+    for event in index.inotify.read():
+        index.apply(*event)
+
+
+def test_index_follows_changes(index: ShotIndex, show: Path):
+    plate = show / "sh010" / "plate"
+    assert index.listing(str(show / "sh010" / "comp" / ".." / "plate")) == (
+        str(plate),
+        {"sh010_plt.mov": False},
+    )
+
+    (plate / "sh010_plt.mov").unlink()
+    (plate / "exr").mkdir()
+    _apply_events(index)
+    (plate / "exr" / "sh010_plt.1001.exr").touch()
+    _apply_events(index)
+
+    assert index.listing(str(plate)) == (str(plate), {"exr": True})
+    assert index.listing(str(plate / "exr"))[1] == {"sh010_plt.1001.exr": False}
+    assert index.listing("/elsewhere") == ("/elsewhere", None)
+
+
+def test_lookups_are_answered_during_a_rescan(
+    index: ShotIndex, show: Path, monkeypatch: pytest.MonkeyPatch
+):
+    listing = threading.Event()
+    release = threading.Event()
+    scandir = os.scandir
+
+    def _scandir(path):
+        listing.set()
+        release.wait(1.0)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", _scandir)
+    rescan = threading.Thread(target=index.scan)
+    rescan.start()
+    listing.wait(1.0)
+
+    # from the old listings, while the new ones are built
+    plate = show / "sh010" / "plate"
+    assert index.listing(str(plate)) == (str(plate), {"sh010_plt.mov": False})
+    assert rescan.is_alive()
+
+    release.set()
+    rescan.join()
+    assert index.listing(str(plate)) == (str(plate), {"sh010_plt.mov": False})
+
+
+def test_resolver_uses_the_index(socket_path: str, show: Path, slow_fs: SlowFS):
+    source = show / "sh020" / "comp" / "sh020_comp_v001.1001.exr"
+    resolver = Resolver(
+        AutoloaderConfig(main=AutoloadMainConfig(index_socket=socket_path))
+    )
+
+    with resolver.batch([source]):
+        found = resolver.find_file(source, "../plate/*.mov", "plate_mov_path")
+        # not in the index, so looked for on disk
+        missing = resolver.find_file(source, "*.cube", "look_lut")
+    resolver.close()
+
+    assert found == show / "sh020" / "plate" / "sh020_plt.mov"
+    assert missing is None
+    assert slow_fs.paths["scandir"] == [source.parent]
+
+
+def test_falls_back_to_disk_without_the_daemon(show: Path, tmp_path: Path):
+    source = show / "sh010" / "comp" / "sh010_comp_v001.1001.exr"
+    resolver = Resolver(
+        AutoloaderConfig(
+            main=AutoloadMainConfig(index_socket=str(tmp_path / "missing.sock"))
+        )
+    )
+
+    assert resolver.find_file(source, "../plate/*.mov", "plate_mov_path") == (
+        show / "sh010" / "plate" / "sh010_plt.mov"
+    )
+    resolver.close()
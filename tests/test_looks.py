@@ -0,0 +1,128 @@
+import copy
+import os
+from pathlib import Path
+
+import PyOpenColorIO as OCIO
+import pytest
+
+from slingshot_autoloader_bake import look_transform
+from slingshot_autoloader_config import (
+    AutoloadColorConfig,
+    AutoloaderConfig,
+    get_ocio_config,
+)
+from slingshot_autoloader_looks import (
+    combined_look_name,
+    session_config,
+    use_session_config,
+)
+from slingshot_autoloader_rules import look_setups
+
+# a 2x2x2 cube that swaps red and blue
+LUT = """LUT_3D_SIZE 2
+0 0 0
+0 0 1
+0 1 0
+0 1 1
+1 0 0
+1 0 1
+1 1 0
+1 1 1
+"""
+
+
+@pytest.fixture
+def color(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    monkeypatch_ocio_config_path,
+) -> tuple[OCIO.Config, AutoloadColorConfig, Path]:
+    monkeypatch.delenv("OCIO", raising=False)
+    lut_path = tmp_path / "sh010.cube"
+    lut_path.write_text(LUT)
+    config = AutoloaderConfig(
+        color=AutoloadColorConfig(look_lut="*.cube", look_mode="combined")
+    )
+    return get_ocio_config(config), config.color, lut_path
+
+
+def test_combined_look_matches_look_pipeline(color):
+    ocio_config, color_config, lut_path = color
+
+    session, _ = session_config(ocio_config, color_config)
+
+    context = copy.deepcopy(session.getCurrentContext())
+    context["LUT_PATH"] = str(lut_path)
+    combined = session.getProcessor(
+        context,
+        OCIO.LookTransform(
+            src="scene_linear",
+            dst="scene_linear",
+            looks=combined_look_name(color_config, cdl=False, lut=True),
+        ),
+        OCIO.TRANSFORM_DIR_FORWARD,
+    )
+    pipeline = ocio_config.getProcessor(look_transform(color_config, None, lut_path))
+    for value in [0.01, 0.18, 1.0, 4.0]:
+        pixel = [value, value * 0.5, value * 0.2]
+        assert combined.getDefaultCPUProcessor().applyRGB(pixel) == pytest.approx(
+            pipeline.getDefaultCPUProcessor().applyRGB(pixel), abs=1e-5
+        )
+
+
+def test_session_config_adds_each_look_once(color):
+    ocio_config, color_config, _ = color
+
+    session, serialized = session_config(ocio_config, color_config)
+    again, serialized_again = session_config(session, color_config)
+
+    look_names = [look.getName() for look in again.getLooks()]
+    assert len(look_names) == len(ocio_config.getLooks()) + 4
+    assert len(set(look_names)) == len(look_names)
+    assert serialized_again == serialized
+
+
+def test_use_session_config_points_ocio_at_it(color, tmp_path: Path):
+    ocio_config, color_config, _ = color
+
+    use_session_config(ocio_config, color_config, tmp_path / "ocio")
+
+    session_path = Path(os.environ["OCIO"])
+    assert session_path.parent == tmp_path / "ocio"
+    look_name = combined_look_name(color_config, cdl=False, lut=True)
+    assert OCIO.Config.CreateFromFile(str(session_path)).getLook(look_name)
+    assert OCIO.GetCurrentConfig().getLook(look_name)
+
+
+def test_look_setups_combined_mode_uses_one_node(color, tmp_path: Path):
+    _, color_config, lut_path = color
+    config = AutoloaderConfig(color=color_config)
+
+    setups = look_setups(
+        config, tmp_path / "sh010_comp_v001.exr", lambda *_args: lut_path
+    )
+
+    assert len(setups) == 1 and setups[0]
+    assert setups[0].properties["ocio_look.look"] == combined_look_name(
+        color_config, cdl=False, lut=True
+    )
+    assert setups[0].context == {"LUT_PATH": str(lut_path)}
+
+
+def test_session_config_keeps_search_paths_whole(color):
+    ocio_config, color_config, _ = color
+    ocio_config = copy.deepcopy(ocio_config)
+    ocio_config.setWorkingDir("/show/ocio")
+    # a ":" in an absolute path, like the drive letter of C:\show\luts on Windows
+    absolute = os.path.abspath("/show/grade:v2/luts")
+    ocio_config.clearSearchPaths()
+    for path in [absolute, "luts", "$SHOT_LUTS"]:
+        ocio_config.addSearchPath(path)
+
+    session, _ = session_config(ocio_config, color_config)
+
+    assert list(session.getSearchPaths()) == [
+        absolute,
+        os.path.join("/show/ocio", "luts"),
+        "$SHOT_LUTS",
+    ]
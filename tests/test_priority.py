@@ -0,0 +1,26 @@
+from slingshot_autoloader_priority import NEIGHBOUR, OTHER, VISIBLE, view_priority
+
+
+def test_visible_then_neighbours_then_the_rest():
+    view_inputs = [f"sourceGroup00000{i}" for i in range(6)]
+    priority = view_priority({"sourceGroup000003"}, view_inputs)
+
+    groups = [*view_inputs, "sourceGroup000009"]
+    assert sorted(groups, key=priority) == [
+        "sourceGroup000003",
+        "sourceGroup000002",
+        "sourceGroup000004",
+        "sourceGroup000001",
+        "sourceGroup000005",
+        "sourceGroup000000",
+        "sourceGroup000009",
+    ]
+    assert priority("sourceGroup000003") == (VISIBLE, 0)
+    assert priority("sourceGroup000005") == (NEIGHBOUR, 2)
+    assert priority("sourceGroup000009") == (OTHER, 0)
+
+
+def test_nothing_visible_keeps_load_order():
+    priority = view_priority(set(), ["sourceGroup000000", "sourceGroup000001"])
+
+    assert priority("sourceGroup000000") == priority("sourceGroup000001") == (OTHER, 0)
@@ -0,0 +1,86 @@
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from slingshot_autoloader_readahead import MOV_HEAD_BYTES, MOV_TAIL_BYTES, ReadAhead
+from slingshot_autoloader_stats import stats
+
+
+@pytest.fixture
+def plate(tmp_path: Path) -> Path:
+    for frame in range(1001, 1011):
+        (tmp_path / f"sh010_plt.{frame}.exr").write_bytes(b"x" * 1000)
+    return tmp_path / "sh010_plt.1001-1010#.exr"
+
+
+def test_reads_ahead_the_first_frames(plate: Path):
+    readahead = ReadAhead(frames=3, budget=1_000_000)
+
+    readahead.warm(plate)
+    readahead.warm(plate)  # only once
+    readahead.wait()
+
+    assert readahead.bytes_requested == 3000
+
+
+def test_budget_is_respected(plate: Path):
+    readahead = ReadAhead(frames=10, budget=2500)
+
+    readahead.warm(plate)
+    readahead.wait()
+
+    assert readahead.bytes_requested == 2500
+
+
+def test_mov_head_and_tail(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # the read fallback, as on macOS and Windows
+    monkeypatch.delattr(os, "posix_fadvise", raising=False)
+    mov = tmp_path / "sh010_plt.mov"
+    with open(mov, "wb") as f:
+        f.truncate(MOV_HEAD_BYTES * 2)
+    readahead = ReadAhead(frames=3, budget=MOV_HEAD_BYTES * 4)
+
+    readahead.warm(mov)
+    readahead.wait()
+
+    assert readahead.bytes_requested == MOV_HEAD_BYTES + MOV_TAIL_BYTES
+
+
+def test_cancel_drops_queued_reads(plate: Path, monkeypatch: pytest.MonkeyPatch):
+    readahead = ReadAhead(frames=10, budget=1_000_000, workers=1)
+    reading, release = threading.Event(), threading.Event()
+    read_ahead = readahead._read_ahead
+
+    def _read_ahead(*args):
+        reading.set()
+        release.wait()
+        read_ahead(*args)
+
+    monkeypatch.setattr(readahead, "_read_ahead", _read_ahead)
+    requested = stats.counters["readahead_bytes"]
+    readahead.warm(plate)
+    reading.wait()
+    executor = readahead._executor
+    assert executor
+
+    readahead.cancel()
+    release.set()
+    executor.shutdown(wait=True)
+
+    # the frame being read finished, the other nine never started
+    assert stats.counters["readahead_bytes"] - requested == 1000
+    # and the next session gets the whole budget
+    assert readahead.bytes_requested == 0
+
+
+def test_reads_ahead_again_after_cancel(plate: Path):
+    readahead = ReadAhead(frames=3, budget=1_000_000)
+    readahead.warm(plate)
+    readahead.cancel()  # the session was closed
+
+    readahead.warm(plate)
+    readahead.wait()
+
+    assert readahead.bytes_requested == 3000
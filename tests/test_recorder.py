@@ -0,0 +1,138 @@
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+import slingshot_autoloader
+from fake_rv import FakeRV
+from replay import mirror_path, replay
+from slingshot_autoloader import SlingshotAutoLoaderMode
+from slingshot_autoloader_config import (
+    AutoloadColorConfig,
+    AutoloaderConfig,
+    AutoloadPlatesConfig,
+)
+from slingshot_autoloader_recorder import recorder
+from slingshot_autoloader_stats import CountingCommands, stats
+
+pytestmark = pytest.mark.usefixtures("monkeypatch_ocio_config_path")
+
+
+def _event(contents: str) -> MagicMock:
+    event = MagicMock()
+    event.contents.return_value = contents
+    return event
+
+
+@pytest.fixture
+def show(tmp_path: Path) -> Path:
+    show = tmp_path / "show" / "sh010"
+    (show / "comp").mkdir(parents=True)
+    (show / "plate").mkdir()
+    for frame in range(1001, 1004):
+        (show / "comp" / f"sh010_comp_v001.{frame}.exr").touch()
+    (show / "comp" / "sh010_comp_v000.mov").touch()
+    (show / "comp" / "look.cube").write_text("LUT_3D_SIZE 2\n" + "0 0 0\n" * 8)
+    (show / "plate" / "sh010_plt.mov").touch()
+    return show
+
+
+@pytest.fixture
+def recording_autoloader(
+    fake_rv: FakeRV, monkeypatch: pytest.MonkeyPatch
+) -> SlingshotAutoLoaderMode:
+    monkeypatch.delenv("OCIO", raising=False)
+    # counted, and so recorded, like in RV
+    monkeypatch.setattr(
+        slingshot_autoloader, "commands", CountingCommands(fake_rv.commands)
+    )
+    monkeypatch.setattr(
+        slingshot_autoloader,
+        "extra_commands",
+        CountingCommands(fake_rv.extra_commands),
+    )
+    autoloader = SlingshotAutoLoaderMode()
+    monkeypatch.setattr(autoloader._settings, "batch_source_groups", False)
+    autoloader.config = AutoloaderConfig(
+        plates=AutoloadPlatesConfig(plate_mov_path="../plate/*.mov"),
+        other={"v000": "*v000.mov"},
+        color=AutoloadColorConfig(look_lut="*.cube"),
+    )
+    return autoloader
+
+
+def _record(
+    autoloader: SlingshotAutoLoaderMode, tmp_path: Path, groups: list[str]
+) -> dict:
+    """Records the source groups loading, one after the other."""
+    autoloader.toggle_recording(_event(""))
+    for group in groups:
+        autoloader.on_source_group_complete(_event(f"{group};;new"))
+        autoloader.after_progressive_loading(_event(""))
+    autoloader.toggle_recording(_event(""))
+
+    recorder.write(tmp_path / "recording.json")
+    return json.loads((tmp_path / "recording.json").read_text())
+
+
+@pytest.fixture
+def recording(
+    fake_rv: FakeRV,
+    recording_autoloader: SlingshotAutoLoaderMode,
+    show: Path,
+    tmp_path: Path,
+) -> dict:
+    group = fake_rv.add_source(str(show / "comp" / "sh010_comp_v001.1001.exr"))
+    # RV loads the frames as a new "Source" media rep, with a group of its own
+    return _record(recording_autoloader, tmp_path, [group, "sourceGroup000001"])
+
+
+def test_records_events_commands_and_files(recording: dict, tmp_path: Path):
+    comp = tmp_path / "show" / "sh010" / "comp"
+    assert not recorder.enabled
+    assert [e["name"] for e in recording["events"]] == [
+        "source-group-complete",
+        "after-progressive-loading",
+    ] * 2
+    assert recording["events"][0]["media"] == str(comp / "sh010_comp_v001.1001.exr")
+    assert recording["config"]["plates"]["plate_mov_path"] == "../plate/*.mov"
+    assert [
+        args[1]
+        for name, args, _ in recording["commands"]
+        if name == "addSourceMediaRep"
+    ] == ["Source", "Plate", "v000"]
+    assert recording["listings"][str(comp)]["look.cube"] is False
+    assert recording["listings"][str(comp / ".." / "plate")] == {"sh010_plt.mov": False}
+
+
+def test_replay_does_the_same_work(recording: dict, tmp_path: Path):
+    recorded_reps = [
+        args for name, args, _ in recording["commands"] if name == "addSourceMediaRep"
+    ]
+
+    result = replay(recording, tmp_path / "replay")
+
+    assert result.events == 4
+    assert result.rv_commands == result.recorded_rv_commands
+    assert stats.counters["rv_commands.addSourceMediaRep"] == len(recorded_reps)
+    for args in recorded_reps:
+        assert mirror_path(tmp_path / "replay", args[2][0]).exists()
+
+
+def test_replay_starts_with_the_recorded_media_reps(
+    fake_rv: FakeRV,
+    recording_autoloader: SlingshotAutoLoaderMode,
+    show: Path,
+    tmp_path: Path,
+):
+    # e.g. a session saved with its plates, opened before recording
+    group = fake_rv.add_source(str(show / "comp" / "sh010_comp_v001.1001.exr"))
+    fake_rv.add_media_reps(f"{group}_source", ["Source", "Plate"])
+    recording = _record(recording_autoloader, tmp_path, [group])
+
+    result = replay(recording, tmp_path / "replay")
+
+    # only the v000 was missing, in the recording and the replay
+    assert stats.counters["rv_commands.addSourceMediaRep"] == 1
+    assert result.rv_commands == result.recorded_rv_commands
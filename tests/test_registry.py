@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+
+from slingshot_autoloader_registry import Registry
+from slingshot_autoloader_resolver import NOT_HANDLED
+
+
+def test_lookups_are_recorded():
+    registry = Registry()
+    source = Path("/show/sh010/comp/sh010_comp_v003.1001.exr")
+
+    registry.add_lookup(source, "look_lut", Path("/show/luts/sh010.cube"), 0.25)
+    registry.add_lookup(source, "v000", None, 0.5)
+    registry.add_media_rep(source, "Plate", Path("/show/sh010/plate/sh010_plt.mov"))
+
+    assert registry.lookup(source, "look_lut") == Path("/show/luts/sh010.cube")
+    assert registry.lookup(source, "v000") is None
+    assert registry.lookup(source, "plate_mov_path") is NOT_HANDLED
+    assert registry.lookup(Path("/other.mov"), "v000") is NOT_HANDLED
+
+    record = registry.records[str(source)]
+    assert record.summary() == [
+        "Plate: /show/sh010/plate/sh010_plt.mov",
+        "look_lut: /show/luts/sh010.cube",
+        "v000: not found",
+        "lookups: 750 ms",
+    ]
+    assert registry.summary() == [
+        "Sources: 1",
+        "Media reps: 1",
+        "Sources with missing files: 1",
+    ]
+
+
+def test_records_are_compact():
+    registry = Registry()
+    lut = "/show/luts/sh010.cube"
+    for version in range(1, 4):
+        source = Path(f"/show/sh010/comp/sh010_comp_v00{version}.mov")
+        registry.add_lookup(source, "look_lut", Path(lut), 0.0)
+
+    records = list(registry.records.values())
+    assert not hasattr(records[0], "__dict__")
+    # the shared LUT path is stored once
+    assert records[0].files[0][1] is records[2].files[0][1]
+
+
+def test_write_report(tmp_path: Path):
+    registry = Registry()
+    source = Path("/show/sh010_comp_v003.mov")
+    registry.add_lookup(source, "look_cdl", Path("/show/sh010.cdl"), 0.0)
+    registry.add_lookup(source, "v000", Path("/show/sh010_v000.mov"), 0.0)
+
+    registry.write(tmp_path / "report.json")
+
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report[str(source)]["color_files"] == {"look_cdl": "/show/sh010.cdl"}
+    assert report[str(source)]["files"] == {"v000": "/show/sh010_v000.mov"}
+
+
+def test_sequences_are_recorded():
+    registry = Registry()
+    frame = Path("/show/sh010/plate/sh010_plt.0985.exr")
+
+    assert registry.sequence(frame) is None
+    registry.add_sequence(frame, frame.parent / "sh010_plt.985-1100#.exr")
+
+    assert registry.sequence(frame) == frame.parent / "sh010_plt.985-1100#.exr"
+    registry.clear()
+    assert registry.sequence(frame) is None
+
+
+def test_reloads_replace_media_reps_and_forget_misses():
+    registry = Registry()
+    source = Path("/show/sh010/comp/sh010_comp_v003.1001.exr")
+    plate = Path("/show/sh010/plate/sh010_plt.mov")
+    registry.add_lookup(source, "v000", None, 0.0)
+    registry.add_media_rep(source, "Plate", plate)
+
+    # the source loaded again
+    registry.forget_misses(source)
+    registry.add_media_rep(source, "Plate", plate)
+
+    assert registry.lookup(source, "v000") is NOT_HANDLED
+    assert registry.records[str(source)].media_reps == (("Plate", str(plate)),)
+    assert registry.summary()[1] == "Media reps: 1"
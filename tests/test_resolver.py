@@ -0,0 +1,244 @@
+import json
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from slingshot_autoloader_config import AutoloaderConfig, AutoloadMainConfig
+from slingshot_autoloader_resolver import (
+    MANIFEST_FILENAME,
+    MAX_OPEN_DIRECTORIES,
+    SCAN_BY_FD,
+    DirectoryListings,
+    Resolver,
+    find_file,
+    version_key,
+)
+from slow_fs import SlowFS
+
+
+@pytest.mark.parametrize(
+    "filename, expected",
+    [
+        pytest.param("sh010_comp_v003.mov", "sh010_comp_v003", id="movie"),
+        pytest.param("sh010_comp_v003.1001.exr", "sh010_comp_v003", id="frames"),
+        pytest.param("sh010_comp.mov", "sh010_comp", id="no_version"),
+    ],
+)
+def test_version_key(filename: str, expected: str):
+    assert version_key(Path(filename), r"_(?P<version>v\d+)") == expected
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    source = tmp_path / "comp" / "sh010_comp_v003.1001.exr"
+    source.parent.mkdir()
+    source.touch()
+    (tmp_path / "comp" / "sh010_comp_v000.mov").touch()
+    return source
+
+
+def test_find_file_uses_sidecar_manifest(source: Path, tmp_path: Path):
+    lut = tmp_path / "luts" / "sh010.cube"
+    lut.parent.mkdir()
+    lut.touch()
+    (tmp_path / "plate").mkdir()
+    (tmp_path / "plate" / "sh010_plt.mov").touch()
+    manifest = {
+        "versions": {
+            "sh010_comp_v003": {
+                "plate_mov_path": "../plate/sh010_plt.mov",
+                "look_lut": str(lut),
+            }
+        }
+    }
+    (source.parent / MANIFEST_FILENAME).write_text(json.dumps(manifest))
+    resolver = Resolver(AutoloaderConfig())
+
+    assert resolver.find_file(source, "../plate/*.mov", "plate_mov_path") == (
+        source.parent / "../plate/sh010_plt.mov"
+    )
+    assert resolver.find_file(source, "*.cube", "look_lut") == lut
+    # published without a v000, so we don't go looking for one
+    assert resolver.find_file(source, "*v000.mov", "v000") is None
+
+
+def test_find_file_uses_central_manifest(source: Path, tmp_path: Path):
+    manifest_dir = tmp_path / "index"
+    manifest_dir.mkdir()
+    v000 = tmp_path / "v000.mov"
+    v000.touch()
+    (manifest_dir / "sh010_comp_v003.json").write_text(
+        json.dumps({"versions": {"sh010_comp_v003": {"v000": str(v000)}}})
+    )
+    resolver = Resolver(
+        AutoloaderConfig(main=AutoloadMainConfig(manifest_dir=str(manifest_dir)))
+    )
+
+    assert resolver.find_file(source, "*v000.mov", "v000") == v000
+
+
+def test_find_file_globs_when_manifest_is_stale(source: Path):
+    manifest = {"versions": {"sh010_comp_v003": {"v000": "moved_v000.mov"}}}
+    (source.parent / MANIFEST_FILENAME).write_text(json.dumps(manifest))
+    resolver = Resolver(AutoloaderConfig())
+
+    assert resolver.find_file(source, "*v000.mov", "v000") == (
+        source.parent / "sh010_comp_v000.mov"
+    )
+
+
+def test_missing_manifests_are_checked_again_each_batch(source: Path):
+    resolver = Resolver(AutoloaderConfig())
+    with resolver.batch([source]):
+        resolver.find_file(source, "*v000.mov", "v000")
+
+    # published after the first lookup
+    (source.parent / "sh010_comp_v003_fixed.mov").touch()
+    manifest = {"versions": {"sh010_comp_v003": {"v000": "sh010_comp_v003_fixed.mov"}}}
+    (source.parent / MANIFEST_FILENAME).write_text(json.dumps(manifest))
+
+    with resolver.batch([source]):
+        assert resolver.find_file(source, "*v000.mov", "v000") == (
+            source.parent / "sh010_comp_v003_fixed.mov"
+        )
+
+
+def test_find_file_globs_without_manifest(source: Path):
+    resolver = Resolver(AutoloaderConfig())
+
+    assert resolver.find_file(source, "*v000.mov", "v000") == (
+        source.parent / "sh010_comp_v000.mov"
+    )
+
+
+def test_manifests_are_read_once(source: Path, monkeypatch: pytest.MonkeyPatch):
+    resolver = Resolver(AutoloaderConfig())
+    reads = []
+    read_text = Path.read_text
+
+    def _read_text(self: Path, *args, **kwargs):
+        reads.append(self)
+        return read_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", _read_text)
+
+    for _ in range(3):
+        resolver.find_file(source, "*v000.mov", "v000")
+
+    assert reads == [source.parent / MANIFEST_FILENAME]
+
+
+def test_batch_shares_directory_listings(tmp_path: Path, slow_fs: SlowFS):
+    plate_dir = tmp_path / "plate"
+    plate_dir.mkdir()
+    (plate_dir / "sh010_plt.mov").touch()
+    sources = []
+    for version in range(1, 4):
+        source = tmp_path / "comp" / f"sh010_comp_v00{version}.mov"
+        source.parent.mkdir(exist_ok=True)
+        source.touch()
+        sources.append(source)
+    slow_fs.reset()
+    resolver = Resolver(AutoloaderConfig())
+
+    with resolver.batch():
+        results = [resolver.find_file(s, "../plate/*.mov", "plate") for s in sources]
+
+    assert results == [plate_dir / "sh010_plt.mov"] * 3
+    # the plate directory is listed once for all three versions
+    assert slow_fs.paths["scandir"] == [tmp_path / "comp" / "../plate"]
+
+
+def test_directory_listings_glob(tmp_path: Path):
+    for path in ["plate/a/4448x3096/sh010.1001.exr", "plate/b.mov", "plate/c/x.mov"]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).touch()
+    (tmp_path / "comp").mkdir()
+    listings = DirectoryListings()
+
+    assert list(listings.glob(tmp_path / "comp", "../plate/*/*x*/*.exr")) == [
+        tmp_path / "comp/../plate/a/4448x3096/sh010.1001.exr"
+    ]
+    assert list(listings.glob(tmp_path, "plate/*.mov")) == [tmp_path / "plate/b.mov"]
+    assert list(listings.glob(tmp_path, "plate/missing/*.mov")) == []
+
+
+@pytest.mark.skipif(not SCAN_BY_FD, reason="lists directories by path")
+def test_lookups_are_relative_to_the_source_directory(tmp_path: Path, slow_fs: SlowFS):
+    shot = tmp_path.joinpath(*[f"level{i}" for i in range(20)], "sh010")
+    (shot / "plate").mkdir(parents=True)
+    (shot / "plate" / "sh010_plt.mov").touch()
+    (shot / "comp").mkdir()
+    # the comp directory is a symlink, like a show's "latest" link
+    (tmp_path / "latest").symlink_to(shot / "comp")
+    sources = [tmp_path / "latest" / f"sh010_comp_v00{v}.mov" for v in range(1, 4)]
+    slow_fs.reset()
+    resolver = Resolver(AutoloaderConfig())
+
+    with resolver.batch():
+        results = [resolver.find_file(s, "../plate/*.mov", "plate") for s in sources]
+
+    assert results == [shot / "plate" / "sh010_plt.mov"] * 3
+    # one full path lookup for the source directory, then one per pattern part
+    assert slow_fs.paths["open"] == [
+        tmp_path / "latest",
+        tmp_path / "latest" / "..",
+        tmp_path / "latest" / ".." / "plate",
+    ]
+    assert slow_fs.counts["stat"] == 0
+
+
+@pytest.mark.skipif(not SCAN_BY_FD, reason="lists directories by path")
+def test_open_directories_are_capped(tmp_path: Path):
+    sources = []
+    for shot in range(MAX_OPEN_DIRECTORIES):
+        (tmp_path / f"sh{shot:03d}" / "plate").mkdir(parents=True)
+        (tmp_path / f"sh{shot:03d}" / "plate" / f"sh{shot:03d}_plt.mov").touch()
+        (tmp_path / f"sh{shot:03d}" / "comp").mkdir()
+        sources.append(tmp_path / f"sh{shot:03d}" / "comp" / "v001.mov")
+    listings = DirectoryListings()
+
+    with closing(listings):
+        results = [find_file(s, "../plate/*.mov", "", listings) for s in sources]
+        assert len(listings._fds) == MAX_OPEN_DIRECTORIES
+
+    assert results == [
+        s.parent.parent / "plate" / f"{s.parts[-3]}_plt.mov" for s in sources
+    ]
+    assert listings._fds == {}
+
+
+def test_broken_symlinks_are_not_found(tmp_path: Path):
+    (tmp_path / "plate").mkdir()
+    (tmp_path / "plate" / "sh010_plt.mov").symlink_to(tmp_path / "missing.mov")
+    (tmp_path / "comp").mkdir()
+    resolver = Resolver(AutoloaderConfig())
+
+    with resolver.batch():
+        result = resolver.find_file(
+            tmp_path / "comp" / "sh010_comp_v001.mov", "../plate/*.mov", "plate"
+        )
+
+    assert result is None
+
+
+def test_candidate_patterns_share_listings(tmp_path: Path, slow_fs: SlowFS):
+    (tmp_path / "plate" / "4448x3096").mkdir(parents=True)
+    (tmp_path / "plate" / "4448x3096" / "sh010_plt.mov").touch()
+    (tmp_path / "comp").mkdir()
+    sources = [tmp_path / "comp" / f"sh010_comp_v00{v}.mov" for v in range(1, 4)]
+    config_value = "\n../plate/*plt*.mov\n../plate/*/*plt*.mov"
+    slow_fs.reset()
+    resolver = Resolver(AutoloaderConfig())
+
+    with resolver.batch():
+        results = [resolver.find_file(s, config_value, "plate") for s in sources]
+
+    # the first layout misses, the second is found
+    assert results == [tmp_path / "plate" / "4448x3096" / "sh010_plt.mov"] * 3
+    # and the plate directory is listed once for both
+    assert slow_fs.paths["scandir"] == [
+        tmp_path / "comp" / "../plate",
+        tmp_path / "comp" / "../plate/4448x3096",
+    ]
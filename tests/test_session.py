@@ -0,0 +1,123 @@
+from pathlib import Path
+
+import pytest
+
+from slingshot_autoloader_config import (
+    AutoloadColorConfig,
+    AutoloaderConfig,
+    AutoloadPlatesConfig,
+)
+from slingshot_autoloader_session import (
+    PREBAKED_PROPERTY,
+    GTOObject,
+    SessionWriter,
+    write_session,
+)
+
+
+@pytest.fixture
+def shot(tmp_path: Path) -> Path:
+    comp = tmp_path / "sh010" / "comp" / "sh010_comp_v003.1001.exr"
+    comp.parent.mkdir(parents=True)
+    comp.touch()
+    plate = tmp_path / "sh010" / "plate" / "sh010_plt.0985.exr"
+    plate.parent.mkdir(parents=True)
+    plate.touch()
+    (plate.parent / "sh010.cube").touch()
+    return comp
+
+
+def test_gto_object_format():
+    node = GTOObject("sourceGroup000000_source", "RVFileSource")
+    node.set("media.movie", 'C:\\shots\\"quoted".mov')
+    node.set("cut.in", 1000)
+    node.set("pipeline.nodes", ["OCIOLook", "OCIOLook"])
+
+    assert node.format() == (
+        "sourceGroup000000_source : RVFileSource (1)\n"
+        "{\n"
+        "    media\n"
+        "    {\n"
+        '        string movie = "C:\\\\shots\\\\\\"quoted\\".mov"\n'
+        "    }\n"
+        "\n"
+        "    cut\n"
+        "    {\n"
+        "        int in = 1000\n"
+        "    }\n"
+        "\n"
+        "    pipeline\n"
+        "    {\n"
+        '        string nodes = [ "OCIOLook" "OCIOLook" ]\n'
+        "    }\n"
+        "}"
+    )
+
+
+def test_session_writer_applies_autoload_rules(shot: Path):
+    config = AutoloaderConfig(
+        plates=AutoloadPlatesConfig(
+            plate_frames_path="../plate/*.exr",
+            plate_cut_in_frame=1000,
+            plate_first_frame_in_file=985,
+        ),
+        color=AutoloadColorConfig(look_lut="../plate/*.cube"),
+    )
+
+    writer = SessionWriter(config)
+    writer.add_media(shot)
+    objects = {o.name: o for o in writer.graph.objects}
+
+    # the comp "Source" rep and the "Plate Frames" rep, both flagged as prebaked
+    source = objects["sourceGroup000000_source"].components
+    assert source["media"] == {"movie": str(shot), "repName": "Source"}
+    assert "cut" not in source
+
+    plate = objects["sourceGroup000001_source"].components
+    assert plate["media"]["repName"] == "Plate Frames"
+    assert plate["cut"]["in"] == 1000
+    assert plate["group"]["rangeStart"] == 985
+
+    component, prop = PREBAKED_PROPERTY.split(".")
+    for group in ("sourceGroup000000", "sourceGroup000001"):
+        assert objects[group].components[component][prop] == 1
+
+    # lin -> working space, LUT, LUT out -> lin
+    look_pipe = objects["sourceGroup000000_lookPipeline"].components
+    assert look_pipe["pipeline"]["nodes"] == ["OCIOLook"] * 3
+    lut_node = objects["sourceGroup000000_lookPipeline_1"].components
+    assert lut_node["ocio_look"]["look"] == "slingshot_lut"
+    assert lut_node["ocio_context"]["LUT_PATH"] == str(
+        shot.parent.parent / "plate" / "sh010.cube"
+    )
+
+    assert writer.graph.connections == [
+        ("sourceGroup000000", "switchGroup000000"),
+        ("sourceGroup000001", "switchGroup000000"),
+        ("switchGroup000000", "defaultSequence"),
+    ]
+
+
+def test_write_session_without_luts(shot: Path, tmp_path: Path):
+    output = tmp_path / "session.rv"
+
+    write_session([shot], output, AutoloaderConfig(), load_luts=False)
+
+    session = output.read_text()
+    assert session.startswith("GTOa (4)\n")
+    assert f'string movie = "{shot}"' in session
+    assert "OCIO" not in session
+
+
+def test_session_writer_writes_combined_looks_as_nodes(shot: Path):
+    config = AutoloaderConfig(
+        color=AutoloadColorConfig(look_lut="../plate/*.cube", look_mode="combined")
+    )
+
+    writer = SessionWriter(config)
+    writer.add_media(shot)
+    objects = {o.name: o for o in writer.graph.objects}
+
+    # the slingshot_look_* looks only exist in the runtime session config
+    look_pipe = objects["sourceGroup000000_lookPipeline"].components
+    assert look_pipe["pipeline"]["nodes"] == ["OCIOLook"] * 3
@@ -0,0 +1,56 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from slingshot_autoloader_config import AutoloaderConfig
+from slingshot_autoloader_resolver import Resolver
+from slow_fs import NFS_LATENCY, SlowFS
+
+
+@pytest.fixture
+def shots(tmp_path: Path) -> list[Path]:
+    (tmp_path / "plate").mkdir()
+    (tmp_path / "plate" / "sh010_plt.mov").touch()
+    (tmp_path / "comp").mkdir()
+    sources = []
+    for version in range(1, 6):
+        source = tmp_path / "comp" / f"sh010_comp_v00{version}.mov"
+        source.touch()
+        sources.append(source)
+    return sources
+
+
+def test_slow_fs_counts_and_delays(slow_fs: SlowFS, shots: list[Path]):
+    slow_fs.reset()
+    slow_fs.scandir_delay = slow_fs.stat_delay = NFS_LATENCY
+
+    start = time.perf_counter()
+    list(shots[0].parent.glob("*.mov"))
+    shots[0].is_file()
+    elapsed = time.perf_counter() - start
+
+    assert slow_fs.counts["glob"] == 1
+    assert slow_fs.counts["scandir"] >= 1
+    assert slow_fs.counts["stat"] >= 1
+    calls = slow_fs.counts["scandir"] + slow_fs.counts["stat"]
+    assert elapsed >= calls * NFS_LATENCY
+
+
+def test_batch_resolution_on_slow_share(slow_fs: SlowFS, shots: list[Path]):
+    slow_fs.reset()
+    slow_fs.scandir_delay = slow_fs.stat_delay = NFS_LATENCY
+    resolver = Resolver(AutoloaderConfig())
+
+    for source in shots:
+        resolver.find_file(source, "../plate/*.mov", "plate_mov_path")
+    unbatched = slow_fs.counts["scandir"]
+    slow_fs.reset()
+
+    with resolver.batch():
+        for source in shots:
+            resolver.find_file(source, "../plate/*.mov", "plate_mov_path")
+
+    # every source lists the plate directory without a batch, once with one
+    assert unbatched == len(shots)
+    assert slow_fs.paths["scandir"] == [shots[0].parent / "../plate"]
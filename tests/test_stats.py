@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from slingshot_autoloader_config import AutoloaderConfig
+from slingshot_autoloader_resolver import Resolver
+from slingshot_autoloader_stats import CountingCommands, Stats, stats, timed
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(stats, "counters", Stats().counters)
+    monkeypatch.setattr(stats, "handlers", {})
+
+
+def test_counting_commands():
+    module = SimpleNamespace(
+        StringType=8, nodeGroup=lambda node: f"group:{node}", nodes=lambda: []
+    )
+    commands = CountingCommands(module)
+
+    assert commands.StringType == 8
+    assert commands.nodeGroup("sourceGroup000001_source") == (
+        "group:sourceGroup000001_source"
+    )
+    commands.nodeGroup("sourceGroup000002_source")
+    commands.nodes()
+
+    assert stats.counters["rv_commands"] == 3
+    assert stats.counters["rv_commands.nodeGroup"] == 2
+
+
+def test_timed():
+    @timed
+    def after_progressive_loading():
+        pass
+
+    after_progressive_loading()
+    after_progressive_loading()
+
+    assert stats.handlers["after_progressive_loading"][0] == 2
+    assert "after_progressive_loading: 2 calls" in stats.summary()[-1]
+
+
+def test_resolver_counts_listings(tmp_path: Path):
+    (tmp_path / "plate").mkdir()
+    (tmp_path / "plate" / "sh010_plt.mov").touch()
+    resolver = Resolver(AutoloaderConfig())
+
+    with resolver.batch():
+        for version in range(1, 4):
+            resolver.find_file(tmp_path / f"sh010_comp_v00{version}.mov", "plate/*.mov")
+
+    assert stats.counters["directories_listed"] == 1
+    assert stats.counters["listing_cache_hits"] == 2
+
+
+def test_write_and_reset(tmp_path: Path):
+    stats.count("sources_processed", 3)
+
+    stats.write(tmp_path / "stats.json")
+    stats.reset()
+
+    written = json.loads((tmp_path / "stats.json").read_text())
+    assert written["counters"] == {"sources_processed": 3}
+    assert stats.counters["sources_processed"] == 0
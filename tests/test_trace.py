@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from slingshot_autoloader_trace import Tracer, traced, tracer
+
+
+def test_disabled_tracer_records_nothing():
+    disabled = Tracer()
+
+    with disabled.span("find_file", key="look_lut") as span:
+        pass
+
+    assert span is None
+    assert disabled.events == []
+
+
+def test_spans_nest_and_export_to_chrome_trace(tmp_path: Path):
+    enabled = Tracer()
+    enabled.enabled = True
+
+    with enabled.span("autoload_group", group="sourceGroup000001"):
+        with enabled.span("find_file", key="look_lut"):
+            pass
+
+    inner, outer = enabled.events
+    assert (inner["name"], outer["name"]) == ("find_file", "autoload_group")
+    assert outer["args"] == {"group": "sourceGroup000001"}
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+    trace_path = tmp_path / "trace.json"
+    enabled.write(trace_path)
+    trace = json.loads(trace_path.read_text())
+    assert [event["ph"] for event in trace["traceEvents"]] == ["X", "X"]
+
+
+def test_traced(monkeypatch: pytest.MonkeyPatch):
+    @traced
+    def autoload_color(source_group: str) -> str:
+        return source_group
+
+    monkeypatch.setattr(tracer, "events", [])
+    monkeypatch.setattr(tracer, "enabled", False)
+    assert autoload_color("sourceGroup000001") == "sourceGroup000001"
+    assert tracer.events == []
+
+    monkeypatch.setattr(tracer, "enabled", True)
+    assert autoload_color("sourceGroup000001") == "sourceGroup000001"
+    assert [event["name"] for event in tracer.events] == [
+        "test_traced.<locals>.autoload_color"
+    ]
@@ -587,7 +587,7 @@ def popEventTable(table: str) -> None: ...
 @overload
 def popEventTable() -> None: ...
 def popEventTable(table: str | None = None) -> None: ...
-def viewNode(node: str) -> None: ...
+def viewNode() -> str: ...
 def getCurrentPixelValue(point: list[float]) -> list[float]: ...
 def cacheDir() -> str: ...
 def audioTextureID() -> int: ...